@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Media, Genre, Cast, Crew, Favorite, ContentRequest
+from .models import Media, Genre, Person, Cast, Crew, Favorite, ContentRequest, SyncState, ImportRun, ImportCursor
 
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
@@ -61,18 +61,28 @@ class MediaAdmin(admin.ModelAdmin):
         return "Sem backdrop"
     backdrop_preview.short_description = "Preview do Backdrop"
 
+@admin.register(Person)
+class PersonAdmin(admin.ModelAdmin):
+    list_display = ['name', 'tmdb_id']
+    search_fields = ['name']
+    readonly_fields = ['tmdb_id']
+
 @admin.register(Cast)
 class CastAdmin(admin.ModelAdmin):
-    list_display = ['name', 'character', 'media', 'order']
-    search_fields = ['name', 'character', 'media__title']
+    list_display = ['person', 'character', 'media', 'order']
+    search_fields = ['person__name', 'character', 'media__title']
     list_filter = ['media__media_type']
+    list_select_related = ['person', 'media']
+    raw_id_fields = ['person', 'media']
     ordering = ['media', 'order']
 
 @admin.register(Crew)
 class CrewAdmin(admin.ModelAdmin):
-    list_display = ['name', 'job', 'department', 'media']
-    search_fields = ['name', 'job', 'department', 'media__title']
+    list_display = ['person', 'job', 'department', 'media']
+    search_fields = ['person__name', 'job', 'department', 'media__title']
     list_filter = ['job', 'department', 'media__media_type']
+    list_select_related = ['person', 'media']
+    raw_id_fields = ['person', 'media']
 
 @admin.register(Favorite)
 class FavoriteAdmin(admin.ModelAdmin):
@@ -107,3 +117,20 @@ class ContentRequestAdmin(admin.ModelAdmin):
         updated = queryset.update(status='rejected')
         self.message_user(request, f'{updated} solicitações foram rejeitadas.')
     reject_requests.short_description = "Rejeitar solicitações selecionadas"
+
+@admin.register(SyncState)
+class SyncStateAdmin(admin.ModelAdmin):
+    list_display = ['name', 'watermark', 'updated_at']
+    readonly_fields = ['updated_at']
+
+class ImportCursorInline(admin.TabularInline):
+    model = ImportCursor
+    extra = 0
+    readonly_fields = ['phase', 'page', 'updated_at']
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = ['command', 'status', 'started_at', 'finished_at']
+    list_filter = ['command', 'status']
+    readonly_fields = ['command', 'options', 'started_at', 'finished_at']
+    inlines = [ImportCursorInline]
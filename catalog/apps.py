@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate
 
 
 class CatalogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog'
+
+    def ready(self):
+        from catalog.services.autocomplete import forget_media
+        from catalog.services.search import install_search_index
+        post_migrate.connect(install_search_index, sender=self)
+        post_delete.connect(forget_media, sender=self.get_model('Media'))
@@ -0,0 +1,56 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from catalog.models import Media, Genre
+from catalog.services.text import search_key
+
+
+class Command(BaseCommand):
+    help = 'Preenche as chaves de busca normalizadas (sem acentos, em minúsculas) de títulos e gêneros já gravados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Títulos lidos e gravados por transação (padrão: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        started_at = time.monotonic()
+        self.stdout.write(self.style.SUCCESS('🔤 Preenchendo chaves de busca...'))
+
+        genres = [genre for genre in Genre.objects.all() if genre.name_key != search_key(genre.name)]
+        for genre in genres:
+            genre.name_key = search_key(genre.name)
+        Genre.objects.bulk_update(genres, ['name_key'])
+        self.stdout.write(f'🏷️ Gêneros atualizados: {len(genres)}')
+
+        # Percorre por faixas de pk; só as linhas com chave diferente são
+        # regravadas (rodar de novo não escreve nada)
+        scanned = updated = 0
+        last_pk = 0
+        chunk_size = options['chunk_size']
+        while True:
+            rows = list(
+                Media.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'title', 'original_title', 'title_key', 'original_title_key')[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            scanned += len(rows)
+            changed = []
+            for pk, title, original_title, title_key, original_title_key in rows:
+                keys = (search_key(title)[:200], search_key(original_title)[:200])
+                if keys != (title_key, original_title_key):
+                    changed.append(Media(pk=pk, title_key=keys[0], original_title_key=keys[1]))
+            if changed:
+                with transaction.atomic():
+                    Media.objects.bulk_update(changed, ['title_key', 'original_title_key'], batch_size=500)
+                updated += len(changed)
+            self.stdout.write(f'  📄 {scanned} títulos verificados, {updated} atualizados')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Concluído em {time.monotonic() - started_at:.1f}s: {updated} de {scanned} títulos atualizados'
+        ))
@@ -0,0 +1,78 @@
+from functools import partial
+from django.core.management.base import BaseCommand, CommandError
+from catalog.models import Media, Person
+from catalog.services.images import ImageNotFound, cache_enabled, get_image_cache
+from catalog.services.import_pipeline import FetchPipeline, PhaseStats
+
+
+class Command(BaseCommand):
+    help = 'Baixa posters, backdrops e fotos do catálogo uma vez e gera as variantes redimensionadas (WebP/JPEG)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Número máximo de títulos, por ordem de popularidade'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Número de threads baixando e redimensionando em paralelo (default: 4)'
+        )
+        parser.add_argument(
+            '--skip-people',
+            action='store_true',
+            help='Não gerar as fotos de elenco e equipe'
+        )
+        parser.add_argument(
+            '--clear-old',
+            action='store_true',
+            help='Apagar as variantes de versões anteriores (qualidade/tamanhos antigos)'
+        )
+
+    def handle(self, *args, **options):
+        if not cache_enabled():
+            raise CommandError('Cache de imagens desativado (IMAGE_CACHE_ENABLED) ou Pillow não instalado')
+        self.cache = get_image_cache()
+
+        if options['clear_old']:
+            removed = self.cache.clear_versions()
+            self.stdout.write(f'🧹 {removed} versão(ões) antiga(s) de variantes removida(s)')
+
+        media = Media.objects.order_by('-popularity').values_list('poster_path', 'backdrop_path')
+        if options['limit']:
+            media = media[:options['limit']]
+        jobs = []
+        for poster_path, backdrop_path in media.iterator():
+            jobs.append((poster_path, 'card'))
+            jobs.append((poster_path, 'detail'))
+            jobs.append((backdrop_path, 'hero'))
+        if not options['skip_people']:
+            people = Person.objects.exclude(profile_path__isnull=True).exclude(profile_path='')
+            jobs.extend((path, 'profile') for path in people.values_list('profile_path', flat=True).iterator())
+
+        self.stdout.write(self.style.SUCCESS(f'🖼️ Gerando variantes de {len(jobs)} imagens...'))
+        self.stats = PhaseStats('Imagens')
+        with FetchPipeline(workers=options['workers']) as pipeline:
+            for path, variant in jobs:
+                if path:
+                    pipeline.submit(
+                        self.cache.warm, path, variant,
+                        on_result=self.warmed,
+                        on_error=partial(self.failed, path),
+                    )
+        self.stats.finish()
+        self.stdout.write(f'⏱️ {self.stats.summary()}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Variantes geradas: {self.stats.created}'))
+
+    def warmed(self, created):
+        self.stats.titles += 1
+        self.stats.created += created
+        if self.stats.titles % 100 == 0:
+            self.stdout.write(f'📊 {self.stats.titles} imagens processadas...')
+
+    def failed(self, path, error):
+        self.stats.errors += 1
+        if not isinstance(error, ImageNotFound):
+            self.stdout.write(f'⚠️ Erro ao processar {path}: {error}')
@@ -0,0 +1,445 @@
+import random
+import time
+from math import gcd
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from catalog.models import Media, Genre, Person, Cast, Crew, Favorite, ContentRequest
+from catalog.services.text import search_key
+from reviews.models import Review, ReviewLike
+
+User = get_user_model()
+
+# Gêneros da TMDB (mesmos IDs da API), para que os dados sintéticos convivam
+# com os importados
+GENRES = [
+    (28, 'Ação'), (12, 'Aventura'), (16, 'Animação'), (35, 'Comédia'), (80, 'Crime'),
+    (99, 'Documentário'), (18, 'Drama'), (10751, 'Família'), (14, 'Fantasia'), (36, 'História'),
+    (27, 'Terror'), (10402, 'Música'), (9648, 'Mistério'), (10749, 'Romance'),
+    (878, 'Ficção Científica'), (10770, 'Cinema TV'), (53, 'Thriller'), (10752, 'Guerra'), (37, 'Faroeste'),
+]
+
+TITLE_WORDS = [
+    'ação', 'amor', 'aventura', 'caminho', 'cidade', 'coração', 'destino', 'escuridão', 'estrela',
+    'fogo', 'guerra', 'herói', 'ilha', 'jornada', 'lenda', 'luz', 'mar', 'memória', 'missão',
+    'noite', 'órbita', 'paixão', 'perdição', 'reino', 'segredo', 'sombra', 'tempo', 'terra',
+    'última', 'vingança', 'viagem', 'vida', 'vento', 'silêncio', 'sonho', 'céu', 'espírito',
+]
+CONNECTORS = ['da', 'do', 'de', 'na', 'no', 'e', 'sem', 'além da', 'contra o']
+FIRST_NAMES = ['Ana', 'João', 'Maria', 'José', 'Lúcia', 'Pedro', 'Júlia', 'Tomás', 'Inês', 'Caio', 'Beatriz', 'Rafael']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Conceição', 'Araújo', 'Gonçalves', 'Ribeiro', 'Damásio', 'Peçanha', 'Lima']
+CREW_JOBS = [('Director', 'Directing'), ('Screenplay', 'Writing'), ('Producer', 'Production'),
+             ('Original Music Composer', 'Sound'), ('Director of Photography', 'Camera')]
+LANGUAGES = ['en', 'en', 'en', 'pt', 'es', 'fr', 'ja', 'ko', 'it', 'de']
+REQUEST_STATUSES = ['pending', 'pending', 'pending', 'approved', 'rejected', 'added']
+TEXT_WORDS = TITLE_WORDS + CONNECTORS
+
+# Data-base padrão: um dia de 2024 escolhido pela semente, para que as datas
+# geradas não dependam do dia em que o comando roda
+BASE_DATE_ORIGIN = date(2024, 1, 1)
+
+
+class Command(BaseCommand):
+    help = 'Gera um catálogo sintético grande (títulos, créditos, usuários, avaliações...) para testes de carga e desempenho'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=10000, help='Títulos (default: 10000)')
+        parser.add_argument('--users', type=int, default=1000, help='Usuários (default: 1000)')
+        parser.add_argument('--people', type=int, help='Pessoas de elenco/equipe (default: títulos / 4)')
+        parser.add_argument('--reviews', type=int, help='Avaliações (default: 10 por título)')
+        parser.add_argument('--favorites', type=int, help='Favoritos (default: 20 por usuário)')
+        parser.add_argument('--likes', type=int, help='Likes em avaliações (default: 1 por avaliação)')
+        parser.add_argument('--requests', type=int, help='Solicitações de conteúdo (default: usuários / 10)')
+        parser.add_argument('--cast-per-title', type=int, default=6, help='Atores por título (default: 6)')
+        parser.add_argument('--crew-per-title', type=int, default=2, help='Membros da equipe por título (default: 2)')
+        parser.add_argument('--movie-ratio', type=float, default=0.7, help='Fração de filmes (default: 0.7)')
+        parser.add_argument('--seed', type=int, default=42, help='Semente; a mesma semente no mesmo banco gera os mesmos dados (default: 42)')
+        parser.add_argument('--base-date', help='Data (AAAA-MM-DD) a partir da qual as datas são geradas para trás (default: derivada da semente)')
+        parser.add_argument('--chunk-size', type=int, default=20000, help='Linhas por lote/transação (default: 20000)')
+        parser.add_argument('--skew', type=float, default=2.5, help='Concentração da popularidade (maior = mais desigual, default: 2.5)')
+
+    def handle(self, *args, **options):
+        if options['titles'] < 1 or options['users'] < 1:
+            raise CommandError('--titles e --users devem ser positivos')
+
+        if options['base_date']:
+            try:
+                self.base_date = datetime.strptime(options['base_date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--base-date deve estar no formato AAAA-MM-DD')
+        else:
+            self.base_date = BASE_DATE_ORIGIN + timedelta(days=options['seed'] % 366)
+
+        self.random = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.skew = options['skew']
+        # Todas as datas são relativas à data-base (meio-dia UTC), nunca a hoje
+        self.now = datetime.combine(self.base_date, datetime.min.time(), tzinfo=dt_timezone.utc) + timedelta(hours=12)
+        self.adapt_datetime = connection.ops.adapt_datetimefield_value
+
+        titles = options['titles']
+        users = options['users']
+        people = options['people'] or max(1, titles // 4)
+        reviews = options['reviews'] if options['reviews'] is not None else titles * 10
+        favorites = options['favorites'] if options['favorites'] is not None else users * 20
+        likes = options['likes'] if options['likes'] is not None else reviews
+        requests = options['requests'] if options['requests'] is not None else users // 10
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🧪 Gerando {titles} títulos, {people} pessoas, {users} usuários, {reviews} avaliações, '
+            f'{favorites} favoritos, {likes} likes e {requests} solicitações '
+            f'(semente {options["seed"]}, data-base {self.base_date:%d/%m/%Y})...'
+        ))
+        started_at = time.monotonic()
+
+        if connection.vendor == 'sqlite':
+            # Dados descartáveis: não vale esperar o fsync de cada lote
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+                cursor.execute('PRAGMA cache_size = -200000')
+
+        genre_pks = self.create_genres()
+        media_ids = self.create_media(titles, options['movie_ratio'], genre_pks)
+        person_ids = self.create_people(people)
+        self.create_credits(media_ids, person_ids, options['cast_per_title'], options['crew_per_title'])
+        user_ids = self.create_users(users)
+        review_ids = self.create_reviews(user_ids, media_ids, reviews)
+        self.create_favorites(user_ids, media_ids, favorites)
+        self.create_likes(user_ids, review_ids, likes)
+        self.create_requests(user_ids, requests)
+
+        self.reset_sequences()
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(self.style.SUCCESS(f'✅ Dados sintéticos gerados em {elapsed:.1f}s'))
+
+    # Distribuições
+
+    def skewed_index(self, size):
+        """
+        Índice em [0, size) concentrado nos primeiros (lei de potência)
+        """
+        return min(size - 1, int(size * self.random.random() ** self.skew))
+
+    def skewed_counts(self, size, total, cap):
+        """
+        Reparte ``total`` entre ``size`` itens com pesos de Pareto (poucos
+        itens com muito, a maioria com pouco), limitando cada um a ``cap``.
+        O que passaria do limite é repartido entre os demais, de modo que a
+        soma é ``total`` (ou ``size * cap``, se for menor).
+        """
+        weights = [self.random.paretovariate(1.2) for _ in range(size)]
+        remaining = min(total, size * cap)
+        order = sorted(range(size), key=weights.__getitem__, reverse=True)
+
+        # Os mais pesados ficam no limite; o resto do total é repartido pelos
+        # pesos entre os demais
+        counts = [0] * size
+        rest_weight = sum(weights)
+        capped = 0
+        while capped < size and weights[order[capped]] * remaining >= cap * rest_weight:
+            counts[order[capped]] = cap
+            remaining -= cap
+            rest_weight -= weights[order[capped]]
+            capped += 1
+
+        rest = order[capped:]
+        if rest and remaining > 0:
+            scale = remaining / rest_weight
+            for i in rest:
+                counts[i] = int(weights[i] * scale)
+                remaining -= counts[i]
+            # Sobram só as frações: uma unidade para alguns itens sorteados
+            for i in self.random.sample(rest, max(0, remaining)):
+                counts[i] += 1
+        return counts
+
+    def report_counts(self, label, counts, requested):
+        if sum(counts) < requested:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ {label}: {requested} pedidas, {sum(counts)} possíveis (cada usuário tem no máximo uma por item)'
+            ))
+
+    def pick_distinct(self, items, count, stride=1):
+        """
+        ``count`` itens distintos de ``items``, preferindo os primeiros; os
+        que faltarem depois de algumas tentativas são sorteados por igual
+        (usuários muito ativos esgotariam os itens populares)
+        """
+        size = len(items)
+        picked = set()
+        for _ in range(count * 2):
+            if len(picked) >= count:
+                return picked
+            picked.add(items[self.skewed_index(size) * stride % size])
+        while len(picked) < count:
+            picked.add(items[self.random.randrange(size)])
+        return picked
+
+    def timestamp(self, years):
+        """
+        Instante nos ``years`` anos antes da data-base, mais provável perto
+        dela, já no formato do banco
+        """
+        seconds = int(years * 365 * 86400 * self.random.random() ** 2)
+        return self.adapt_datetime(self.now - timedelta(seconds=seconds))
+
+    def title(self):
+        words = [self.random.choice(TITLE_WORDS).capitalize()]
+        if self.random.random() < 0.7:
+            words += [self.random.choice(CONNECTORS), self.random.choice(TITLE_WORDS).capitalize()]
+        if self.random.random() < 0.15:
+            words.append(str(self.random.randint(2, 5)))
+        return ' '.join(words)
+
+    def sentence(self, words=12):
+        text = ' '.join(self.random.choices(TEXT_WORDS, k=words))
+        return text.capitalize() + '.'
+
+    def comment_pool(self, size=5000):
+        """
+        Comentários sorteados de um conjunto fixo: gerar um texto por
+        avaliação dominaria o tempo com milhões de linhas
+        """
+        return [self.sentence(self.random.randint(5, 40)) for _ in range(size)]
+
+    # Escrita
+
+    def next_id(self, model):
+        return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+    def insert(self, model, fields, rows, label, total):
+        """
+        Grava ``rows`` (tuplas na ordem de ``fields``) com ``executemany`` em
+        lotes de ``--chunk-size``, uma transação por lote. Evita o ORM: criar
+        milhões de instâncias custaria mais que o próprio INSERT.
+        """
+        columns = ', '.join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        sql = f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+
+        started_at = time.monotonic()
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.chunk_size:
+                written += self.write_batch(sql, batch)
+                batch = []
+                if written % (self.chunk_size * 50) == 0:
+                    self.stdout.write(f'   📊 {label}: {written}/{total}...')
+        if batch:
+            written += self.write_batch(sql, batch)
+        elapsed = time.monotonic() - started_at
+        rate = written / elapsed if elapsed > 0 else 0
+        self.stdout.write(f'✅ {label}: {written} linhas em {elapsed:.1f}s ({rate:.0f} linhas/s)')
+        return written
+
+    def write_batch(self, sql, batch):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, batch)
+        return len(batch)
+
+    def reset_sequences(self):
+        """
+        Os IDs foram atribuídos aqui; acerta as sequências (PostgreSQL etc.)
+        """
+        models = [Media, Person, Cast, Crew, User, Review, ReviewLike, Favorite, ContentRequest, Media.genres.through]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    # Tabelas
+
+    def create_genres(self):
+        for tmdb_id, name in GENRES:
+            Genre.objects.get_or_create(tmdb_id=tmdb_id, defaults={'name': name})
+        return list(Genre.objects.exclude(tmdb_id=None).order_by('tmdb_id').values_list('id', flat=True))
+
+    def create_media(self, count, movie_ratio, genre_pks):
+        """
+        Títulos com popularidade em lei de potência; retorna os IDs do mais
+        para o menos popular (base das escolhas enviesadas das outras tabelas)
+        """
+        first_id = self.next_id(Media)
+        by_popularity = list(range(first_id, first_id + count))
+        self.random.shuffle(by_popularity)  # a ordem dos IDs não deve refletir a popularidade
+        popularity = sorted((self.random.paretovariate(1.1) for _ in by_popularity), reverse=True)
+        today = self.base_date
+
+        def rows():
+            for media_id, score in zip(by_popularity, popularity):
+                is_movie = self.random.random() < movie_ratio
+                title = self.title()
+                original_title = title if self.random.random() < 0.6 else self.title()
+                created_at = self.timestamp(years=3)
+                yield (
+                    media_id,
+                    -media_id,  # tmdb_id negativo: nunca colide com um título real da TMDB
+                    title,
+                    original_title,
+                    ' '.join(self.sentence() for _ in range(self.random.randint(1, 4))),
+                    connection.ops.adapt_datefield_value(
+                        today - timedelta(days=int(365 * 80 * self.random.random() ** 2.5))
+                    ),
+                    f'/synthetic{media_id}.jpg',
+                    f'/synthetic-backdrop{media_id}.jpg',
+                    'movie' if is_movie else 'tv',
+                    self.random.randint(80, 180) if is_movie else self.random.randint(20, 60),
+                    round(min(10.0, max(0.0, self.random.gauss(6.5, 1.2))), 1),
+                    int(score * 50 * self.random.uniform(0.5, 1.5)),
+                    round(score * 10, 3),
+                    self.random.choice(LANGUAGES),
+                    None if is_movie else self.random.randint(1, 10),
+                    None if is_movie else self.random.randint(6, 200),
+                    search_key(title)[:200],
+                    search_key(original_title)[:200],
+                    '',
+                    '',
+                    created_at,
+                    created_at,
+                )
+
+        self.insert(Media, [
+            'id', 'tmdb_id', 'title', 'original_title', 'overview', 'release_date', 'poster_path',
+            'backdrop_path', 'media_type', 'runtime', 'vote_average', 'vote_count', 'popularity',
+            'original_language', 'number_of_seasons', 'number_of_episodes', 'title_key', 'original_title_key',
+            'content_hash', 'credits_hash', 'created_at', 'updated_at',
+        ], rows(), 'Títulos', count)
+
+        links = (
+            (media_id, genre_id)
+            for media_id in range(first_id, first_id + count)
+            for genre_id in self.random.sample(genre_pks, self.random.randint(1, min(3, len(genre_pks))))
+        )
+        self.insert(Media.genres.through, ['media', 'genre'], links, 'Gêneros dos títulos', count * 2)
+        return by_popularity
+
+    def create_people(self, count):
+        first_id = self.next_id(Person)
+        ids = range(first_id, first_id + count)
+        rows = (
+            (
+                person_id,
+                -person_id,
+                f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)} {person_id}',
+                f'/synthetic-person{person_id}.jpg' if self.random.random() < 0.7 else None,
+            )
+            for person_id in ids
+        )
+        self.insert(Person, ['id', 'tmdb_id', 'name', 'profile_path'], rows, 'Pessoas', count)
+        return ids
+
+    def create_credits(self, media_ids, person_ids, cast_per_title, crew_per_title):
+        # Algumas pessoas aparecem em muitos títulos, a maioria em poucos
+        def cast_rows():
+            for media_id in media_ids:
+                people = {person_ids[self.skewed_index(len(person_ids))] for _ in range(cast_per_title)}
+                for order, person_id in enumerate(people):
+                    yield media_id, person_id, self.title(), order
+
+        def crew_rows():
+            for media_id in media_ids:
+                people = {person_ids[self.skewed_index(len(person_ids))] for _ in range(crew_per_title)}
+                for person_id in people:
+                    yield (media_id, person_id) + self.random.choice(CREW_JOBS)
+
+        if cast_per_title:
+            self.insert(Cast, ['media', 'person', 'character', 'order'], cast_rows(), 'Elenco',
+                        len(media_ids) * cast_per_title)
+        if crew_per_title:
+            self.insert(Crew, ['media', 'person', 'job', 'department'], crew_rows(), 'Equipe técnica',
+                        len(media_ids) * crew_per_title)
+
+    def create_users(self, count):
+        first_id = self.next_id(User)
+        ids = range(first_id, first_id + count)
+        # Um único hash: calcular um por usuário levaria horas
+        password = make_password('synthetic')
+
+        def rows():
+            for user_id in ids:
+                joined = self.timestamp(years=5)
+                yield (
+                    user_id, password, False, f'synthetic{user_id}', self.random.choice(FIRST_NAMES),
+                    self.random.choice(LAST_NAMES), f'synthetic{user_id}@example.com', False, True,
+                    joined, '', joined, joined,
+                )
+
+        self.insert(User, [
+            'id', 'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+            'is_staff', 'is_active', 'date_joined', 'bio', 'created_at', 'updated_at',
+        ], rows(), 'Usuários', count)
+        return ids
+
+    def create_reviews(self, user_ids, media_ids, total):
+        """
+        Poucos usuários avaliam muito; títulos populares recebem mais
+        avaliações. Retorna o intervalo de IDs das avaliações criadas.
+        """
+        first_id = self.next_id(Review)
+        counts = self.skewed_counts(len(user_ids), total, len(media_ids))
+        self.report_counts('Avaliações', counts, total)
+        comments = self.comment_pool()
+
+        def rows():
+            review_id = first_id
+            for user_id, count in zip(user_ids, counts):
+                for media_id in self.pick_distinct(media_ids, count):
+                    created_at = self.timestamp(years=5)
+                    comment = self.random.choice(comments) if self.random.random() < 0.6 else ''
+                    rating = min(5, max(1, round(self.random.gauss(3.6, 1.1))))
+                    yield review_id, user_id, media_id, rating, comment, created_at, created_at
+                    review_id += 1
+
+        written = self.insert(Review, ['id', 'user', 'media', 'rating', 'comment', 'created_at', 'updated_at'],
+                              rows(), 'Avaliações', sum(counts))
+        return range(first_id, first_id + written)
+
+    def create_favorites(self, user_ids, media_ids, total):
+        counts = self.skewed_counts(len(user_ids), total, len(media_ids))
+        self.report_counts('Favoritos', counts, total)
+
+        def rows():
+            for user_id, count in zip(user_ids, counts):
+                for media_id in self.pick_distinct(media_ids, count):
+                    yield user_id, media_id, self.timestamp(years=5)
+
+        self.insert(Favorite, ['user', 'media', 'created_at'], rows(), 'Favoritos', sum(counts))
+
+    def create_likes(self, user_ids, review_ids, total):
+        if not review_ids:
+            return
+        # Likes muito concentrados em poucas avaliações, espalhadas pelos IDs
+        # por uma permutação (multiplicação por um número coprimo), sem
+        # precisar embaralhar milhões de IDs em memória
+        size = len(review_ids)
+        stride = 2654435761 if gcd(2654435761, size) == 1 else 1
+        counts = self.skewed_counts(len(user_ids), total, size)
+        self.report_counts('Likes', counts, total)
+
+        def rows():
+            for user_id, count in zip(user_ids, counts):
+                for review_id in self.pick_distinct(review_ids, count, stride):
+                    yield user_id, review_id, self.timestamp(years=5)
+
+        self.insert(ReviewLike, ['user', 'review', 'created_at'], rows(), 'Likes', sum(counts))
+
+    def create_requests(self, user_ids, total):
+        def rows():
+            for _ in range(total):
+                created_at = self.timestamp(years=3)
+                yield (
+                    user_ids[self.skewed_index(len(user_ids))], self.title(), self.random.choice(['movie', 'tv']),
+                    self.random.randint(1950, self.now.year), self.sentence(20),
+                    self.random.choice(REQUEST_STATUSES), '', created_at, created_at,
+                )
+
+        self.insert(ContentRequest, [
+            'user', 'title', 'media_type', 'year', 'description', 'status', 'admin_notes', 'created_at', 'updated_at',
+        ], rows(), 'Solicitações', total)
@@ -1,7 +1,19 @@
-import time
-from django.core.management.base import BaseCommand
-from catalog.models import Media, Genre, Cast, Crew
-from services.tmdb_service import tmdb_service
+import multiprocessing
+from functools import partial
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from catalog.models import Media, Genre, Person, Cast, Crew
+from catalog.services import import_tasks
+from catalog.services.import_context import ImportContext
+from catalog.services.import_pipeline import FetchPipeline, PhaseStats
+from catalog.services.import_processes import ProcessFetchPool
+from catalog.services.import_report import add_report_arguments, start_report
+from catalog.services.import_runs import PhaseCursor, finish_run, start_run
+from catalog.services.media_writer import MediaBatchWriter
+from services.rate_limiter import SharedTokenBucket, get_tmdb_rate_limiter, use_tmdb_rate_limiter
+from services.tmdb_planner import FetchPlanner
+from services.tmdb_replay import add_replay_arguments, configure_replay
+from services.tmdb_service import get_tmdb_service
 
 
 class Command(BaseCommand):
@@ -25,42 +37,164 @@ class Command(BaseCommand):
             action='store_true',
             help='Incluir detalhes completos (cast, crew) - mais lento mas completo'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Número de threads buscando dados na API em paralelo, por processo (default: 1)'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Número de processos dividindo as páginas e os detalhes, com um limite de taxa global (default: 1)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Títulos com detalhes gravados por transação (default: 100)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continuar a última importação interrompida a partir das páginas já gravadas'
+        )
+        parser.add_argument(
+            '--max-rps',
+            type=float,
+            help='Limite de requisições por segundo à API compartilhado pelos workers (default: settings.TMDB_RATE_LIMIT)'
+        )
+        cache_group = parser.add_mutually_exclusive_group()
+        cache_group.add_argument(
+            '--cache-only',
+            action='store_true',
+            help='Usar apenas respostas do cache local da TMDB, sem acessar a rede'
+        )
+        cache_group.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Ignorar o cache local e buscar tudo novamente na API (o cache é atualizado)'
+        )
+        add_replay_arguments(parser)
+        add_report_arguments(parser)
     
     def handle(self, *args, **options):
+        if options['processes'] > 1 and options['record']:
+            raise CommandError('--record não pode ser usado com --processes; grave com um único processo')
+        self.tmdb_service = get_tmdb_service()
+        # Detalhes, gêneros e créditos chegam em uma única requisição por título
+        self.planner = FetchPlanner(self.tmdb_service)
+        run = start_run('import_all_tmdb', {
+            'movies_pages': options['movies_pages'],
+            'tv_pages': options['tv_pages'],
+            'include_details': options['include_details'],
+        }, resume=options['resume'])
+        if options['resume'] and run.cursors.exists():
+            # Uma retomada repete exatamente o plano da execução original
+            self.stdout.write(self.style.WARNING(f'↩️ Retomando importação #{run.pk} de {run.started_at:%d/%m/%Y %H:%M}'))
+            options.update(run.options)
+        
         movies_pages = options['movies_pages']
         tv_pages = options['tv_pages']
         include_details = options['include_details']
+        workers = options['workers']
+        self.processes = options['processes']
+        # Com vários processos e um banco que aceita escritores concorrentes,
+        # cada processo grava os próprios lotes; no SQLite só este processo grava
+        self.shard_writes = self.processes > 1 and connection.vendor != 'sqlite'
         
-        self.stdout.write(self.style.SUCCESS('🚀 Iniciando importação massiva da TMDB API...'))
-        
-        # Importar gêneros primeiro
-        self.import_genres()
+        rate_limiter = get_tmdb_rate_limiter()
+        if options['max_rps']:
+            rate_limiter.configure(options['max_rps'])
+        if self.processes > 1:
+            rate_limiter = SharedTokenBucket(
+                rate_limiter.rate, rate_limiter.capacity, context=multiprocessing.get_context('spawn')
+            )
+            use_tmdb_rate_limiter(rate_limiter)
+            self.tmdb_service.rate_limiter = rate_limiter
+        self.phase_stats = []
+        self.page_errors = 0  # páginas não gravadas: o cursor da fase para nelas
+        self.batch_size = options['batch_size']
         
-        # Importar filmes populares
-        self.stdout.write(self.style.SUCCESS(f'🎬 Importando {movies_pages} páginas de filmes...'))
-        self.import_popular_movies(movies_pages, include_details)
+        if options['cache_only']:
+            self.tmdb_service.cache_mode = self.tmdb_service.CACHE_ONLY
+        elif options['refresh']:
+            self.tmdb_service.cache_mode = self.tmdb_service.CACHE_REFRESH
+        replay = configure_replay(self.tmdb_service, options)
+        self.report = start_report('import_all_tmdb', options, run.options)
         
-        # Importar séries populares
-        self.stdout.write(self.style.SUCCESS(f'📺 Importando {tv_pages} páginas de séries...'))
-        self.import_popular_tv_shows(tv_pages, include_details)
-        
-        # Importar filmes em cartaz
-        self.stdout.write(self.style.SUCCESS('🎭 Importando filmes em cartaz...'))
-        self.import_now_playing_movies(5, include_details)
+        self.stdout.write(self.style.SUCCESS('🚀 Iniciando importação massiva da TMDB API...'))
+        if self.processes > 1:
+            writer = 'gravação em cada processo' if self.shard_writes else 'gravação neste processo'
+            self.stdout.write(
+                f'⚙️ {self.processes} processos x {workers} worker(s), {writer}, '
+                f'até {rate_limiter.rate:g} requisições/s no total'
+            )
+        else:
+            self.stdout.write(f'⚙️ {workers} worker(s), até {rate_limiter.rate:g} requisições/s')
         
-        # Importar filmes bem avaliados
-        self.stdout.write(self.style.SUCCESS('⭐ Importando filmes bem avaliados...'))
-        self.import_top_rated_movies(10, include_details)
+        phases = [
+            ('popular_movies', '🎬', f'Importando {movies_pages} páginas de filmes...', 'Filmes populares',
+             'get_popular_movies', movies_pages, 'movie'),
+            ('popular_tv', '📺', f'Importando {tv_pages} páginas de séries...', 'Séries populares',
+             'get_popular_tv', tv_pages, 'tv'),
+            ('now_playing', '🎭', 'Importando filmes em cartaz...', 'Filmes em cartaz',
+             'get_now_playing_movies', 5, 'movie'),
+            ('top_rated', '⭐', 'Importando filmes bem avaliados...', 'Filmes bem avaliados',
+             'get_top_rated_movies', 10, 'movie'),
+        ]
         
-        self.stdout.write(self.style.SUCCESS('✅ Importação concluída!'))
+        try:
+            # Importar gêneros primeiro
+            self.import_genres()
+            # Gêneros e títulos existentes em memória para o laço de gravação
+            self.context = ImportContext()
+            
+            with self.create_pipeline(workers, rate_limiter, options) as pipeline:
+                for key, icon, message, label, method, pages, media_type in phases:
+                    cursor = PhaseCursor(run, key)
+                    if cursor.committed >= pages:
+                        self.stdout.write(f'{icon} {label}: já concluído, pulando')
+                        continue
+                    
+                    self.stdout.write(self.style.SUCCESS(f'{icon} {message}'))
+                    if cursor.committed:
+                        self.stdout.write(f'↩️ Continuando a partir da página {cursor.start_page}')
+                    stats = self.import_phase(pipeline, cursor, label, method, pages, media_type, include_details)
+                    self.stdout.write(f'{icon} Total de {label.lower()} importados: {stats.created}')
+                    self.stdout.write(f'⏱️ {stats.summary()}')
+        except BaseException:
+            finish_run(run, 'failed')
+            self.report.finish('failed')
+            self.stdout.write(self.style.ERROR(
+                f'⛔ Importação #{run.pk} interrompida; use --resume para continuar'
+            ))
+            raise
+        if self.page_errors:
+            finish_run(run, 'partial')
+            self.report.finish('partial')
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ Importação #{run.pk} concluída com {self.page_errors} falha(s) de página; '
+                f'use --resume para buscar de novo as páginas que faltaram'
+            ))
+        else:
+            finish_run(run)
+            self.report.finish()
+            self.stdout.write(self.style.SUCCESS('✅ Importação concluída!'))
+        if replay is not None and self.processes == 1:
+            self.stdout.write(f'🎞️ Replay: {replay.stats}')
+        self.show_throughput()
         self.show_final_stats()
+        if options['report']:
+            self.stdout.write(f'📝 Relatório gravado em {options["report"]}')
     
     def import_genres(self):
         """Importar todos os gêneros"""
         self.stdout.write('🏷️ Importando gêneros...')
         
         # Gêneros de filmes
-        movie_genres = tmdb_service.get_movie_genres()
+        movie_genres = self.tmdb_service.get_movie_genres()
         if movie_genres:
             for genre_data in movie_genres:
                 Genre.objects.get_or_create(
@@ -69,7 +203,7 @@ class Command(BaseCommand):
                 )
         
         # Gêneros de TV
-        tv_genres = tmdb_service.get_tv_genres()
+        tv_genres = self.tmdb_service.get_tv_genres()
         if tv_genres:
             for genre_data in tv_genres:
                 Genre.objects.get_or_create(
@@ -79,213 +213,206 @@ class Command(BaseCommand):
         
         self.stdout.write(f'✅ Gêneros importados: {Genre.objects.count()}')
     
-    def import_popular_movies(self, pages, include_details):
-        """Importar filmes populares"""
-        imported = 0
-        
-        for page in range(1, pages + 1):
-            self.stdout.write(f'📄 Página {page}/{pages} de filmes populares...')
-            
-            response = tmdb_service.get_popular_movies(page=page)
-            if not response or 'results' not in response:
-                continue
-                
-            movies = response['results']
-            for movie_data in movies:
-                try:
-                    movie, created = self.create_or_update_media(movie_data, 'movie', include_details)
-                    if created:
-                        imported += 1
-                        if imported % 50 == 0:
-                            self.stdout.write(f'📊 {imported} filmes importados...')
-                    
-                    # Pequena pausa para não sobrecarregar a API
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    title = movie_data.get('title', 'unknown') if isinstance(movie_data, dict) else 'unknown'
-                    self.stdout.write(f'❌ Erro ao importar filme {title}: {e}')
-        
-        self.stdout.write(f'🎬 Total de filmes populares importados: {imported}')
+    def create_pipeline(self, workers, rate_limiter, options):
+        """Pipeline de busca em threads ou, com --processes, em processos"""
+        if self.processes == 1:
+            return FetchPipeline(workers=workers)
+        # Sem conexões abertas herdadas pelos filhos
+        connection.close()
+        pool = ProcessFetchPool(
+            self.processes, workers, rate_limiter,
+            cache_mode=self.tmdb_service.cache_mode,
+            replay_options={key: options[key] for key in ('replay', 'replay_latency', 'replay_error_rate', 'replay_seed')},
+        )
+        return FetchPipeline(workers=self.processes, executor=pool)
     
-    def import_popular_tv_shows(self, pages, include_details):
-        """Importar séries populares"""
-        imported = 0
-        
-        for page in range(1, pages + 1):
-            self.stdout.write(f'📄 Página {page}/{pages} de séries populares...')
-            
-            response = tmdb_service.get_popular_tv(page=page)
-            if not response or 'results' not in response:
-                continue
-                
-            tv_shows = response['results']
-            for tv_data in tv_shows:
-                try:
-                    tv_show, created = self.create_or_update_media(tv_data, 'tv', include_details)
-                    if created:
-                        imported += 1
-                        if imported % 30 == 0:
-                            self.stdout.write(f'📊 {imported} séries importadas...')
-                    
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    name = tv_data.get('name', 'unknown') if isinstance(tv_data, dict) else 'unknown'
-                    self.stdout.write(f'❌ Erro ao importar série {name}: {e}')
+    def import_phase(self, pipeline, cursor, label, method, pages, media_type, include_details):
+        """
+        Importar uma listagem paginada da TMDB.
         
-        self.stdout.write(f'📺 Total de séries populares importadas: {imported}')
-    
-    def import_now_playing_movies(self, pages, include_details):
-        """Importar filmes em cartaz"""
-        imported = 0
+        As páginas (e os detalhes, se solicitados) são buscadas no pool do
+        pipeline; a gravação no banco acontece nesta thread, em lotes, e o
+        cursor da fase é gravado na mesma transação de cada lote.
+        """
+        stats = PhaseStats(label)
+        self.detail_pages = {}
+        details_writer = MediaBatchWriter(batch_size=None, context=self.context)
         
-        for page in range(1, pages + 1):
-            movies = tmdb_service.get_now_playing_movies(page=page)
-            if not movies:
-                continue
-                
-            for movie_data in movies:
-                try:
-                    movie, created = self.create_or_update_media(movie_data, 'movie', include_details)
-                    if created:
-                        imported += 1
-                    time.sleep(0.1)
-                except Exception as e:
-                    continue
+        for page in range(cursor.start_page, pages + 1):
+            pipeline.submit(
+                import_tasks.fetch_listing, method, page,
+                on_result=partial(self.write_page, pipeline, stats, cursor, details_writer, media_type,
+                                  include_details, page, pages),
+                on_error=partial(self.page_failed, stats, page),
+            )
+        pipeline.join()
+        self.flush_details(stats, cursor, details_writer)
         
-        self.stdout.write(f'🎭 Filmes em cartaz importados: {imported}')
+        stats.finish()
+        self.phase_stats.append(stats)
+        self.report.add_phase(stats)
+        return stats
     
-    def import_top_rated_movies(self, pages, include_details):
-        """Importar filmes bem avaliados"""
-        imported = 0
-        
-        for page in range(1, pages + 1):
-            movies = tmdb_service.get_top_rated_movies(page=page)
-            if not movies:
-                continue
-                
-            for movie_data in movies:
-                try:
-                    movie, created = self.create_or_update_media(movie_data, 'movie', include_details)
-                    if created:
-                        imported += 1
-                    time.sleep(0.1)
-                except Exception as e:
-                    continue
-        
-        self.stdout.write(f'⭐ Filmes bem avaliados importados: {imported}')
+    def page_failed(self, stats, page, error):
+        stats.requests += 1
+        stats.errors += 1
+        self.page_errors += 1
+        self.stdout.write(f'❌ Erro ao buscar página {page}: {error}')
     
-    def create_or_update_media(self, data, media_type, include_details=True):
-        """Criar ou atualizar mídia com dados completos"""
-        tmdb_id = data.get('id')
+    def write_page(self, pipeline, stats, cursor, details_writer, media_type, include_details, page, pages, results):
+        """Gravar os títulos novos de uma página (roda no estágio de escrita)"""
+        stats.requests += 1
+        self.stdout.write(f'📄 Página {page}/{pages} de {stats.name.lower()}...')
         
-        if not tmdb_id:
-            return None, False
+        results = [data for data in results if isinstance(data, dict) and data.get('id')]
+        stats.titles += len(results)
         
-        # Verificar se já existe
-        media, created = Media.objects.get_or_create(
-            tmdb_id=tmdb_id,
-            defaults=self.extract_media_data(data, media_type)
-        )
+        # Títulos já existentes (ou já vistos em outra fase) não são reimportados
+        new_titles = [data for data in results if self.context.claim(data['id'])]
         
-        if created:
-            # Associar gêneros
-            genre_ids = data.get('genre_ids', [])
-            if genre_ids:
-                genres = Genre.objects.filter(tmdb_id__in=genre_ids)
-                media.genres.set(genres)
-            
-            # Importar detalhes completos se solicitado
-            if include_details:
-                self.import_media_details(media, tmdb_id, media_type)
+        if include_details:
+            # Os títulos são gravados junto com os detalhes; a página só conta
+            # como concluída quando todos eles forem gravados
+            cursor.page_written(page, outstanding=len(new_titles))
+            cursor.save()
+            if self.processes > 1:
+                self.submit_details_chunk(pipeline, stats, cursor, details_writer, media_type, page, new_titles)
+                return
+            for data in new_titles:
+                self.detail_pages[data['id']] = page
+                pipeline.submit(
+                    self.fetch_media_details, data['id'], media_type,
+                    on_result=partial(self.write_media_details, stats, cursor, details_writer, media_type, data),
+                    on_error=partial(self.details_failed, stats, cursor, details_writer, media_type, data),
+                )
+            return
         
-        return media, created
+        writer = MediaBatchWriter(batch_size=None, context=self.context)
+        for data in new_titles:
+            writer.add(data, media_type)
+        try:
+            with transaction.atomic():
+                result = writer.flush()
+                cursor.page_written(page)
+                cursor.save()
+        except Exception as e:
+            stats.errors += len(new_titles)
+            self.page_errors += 1
+            self.context.forget(data['id'] for data in new_titles)
+            self.stdout.write(f'❌ Erro ao gravar página {page} de {stats.name.lower()}: {e}')
+            return
+        self.count_created(stats, len(result.created))
     
-    def extract_media_data(self, data, media_type):
-        """Extrair dados básicos da mídia"""
-        if media_type == 'movie':
-            title = data.get('title', '')
-            original_title = data.get('original_title', '')
-            release_date = data.get('release_date', None)
-        else:  # tv
-            title = data.get('name', '')
-            original_title = data.get('original_name', '')
-            release_date = data.get('first_air_date', None)
-        
-        # Converter data
-        if release_date:
-            try:
-                from datetime import datetime
-                release_date = datetime.strptime(release_date, '%Y-%m-%d').date()
-            except:
-                release_date = None
+    def count_created(self, stats, created):
+        before = stats.created
+        stats.created += created
+        if stats.created // 50 > before // 50:
+            self.stdout.write(f'📊 {stats.created} títulos importados...')
+    
+    def fetch_media_details(self, tmdb_id, media_type):
+        """Buscar detalhes e créditos de um título (roda no pool)"""
+        return self.planner.fetch(media_type, tmdb_id)
+    
+    def details_failed(self, stats, cursor, details_writer, media_type, data, error):
+        stats.requests += 1
+        stats.errors += 1
+        title = data.get('title') or data.get('name', 'unknown')
+        self.stdout.write(f'⚠️ Erro ao importar detalhes de {title}: {error}')
+        # Grava ao menos os dados básicos da listagem
+        self.queue_details(stats, cursor, details_writer, media_type, data)
+    
+    def write_media_details(self, stats, cursor, details_writer, media_type, data, details):
+        """Enfileirar detalhes completos (cast, crew, etc) para gravação em lote"""
+        stats.requests += 1
+        if not details:
+            stats.errors += 1
+            title = data.get('title') or data.get('name', 'unknown')
+            self.stdout.write(f'⚠️ Detalhes de {title} indisponíveis após novas tentativas')
+            self.queue_details(stats, cursor, details_writer, media_type, data)
+            return
         
-        return {
-            'title': title,
-            'original_title': original_title,
-            'overview': data.get('overview', ''),
-            'release_date': release_date,
-            'poster_path': data.get('poster_path', ''),
-            'backdrop_path': data.get('backdrop_path', ''),
-            'media_type': media_type,
-            'vote_average': data.get('vote_average', 0),
-            'vote_count': data.get('vote_count', 0),
-            'popularity': data.get('popularity', 0),
-            'original_language': data.get('original_language', ''),
-        }
+        self.queue_details(stats, cursor, details_writer, media_type, details)
+    
+    def queue_details(self, stats, cursor, details_writer, media_type, data):
+        details_writer.add(data, media_type)
+        if len(details_writer) >= self.batch_size:
+            self.flush_details(stats, cursor, details_writer)
     
-    def import_media_details(self, media, tmdb_id, media_type):
-        """Importar detalhes completos (cast, crew, etc)"""
+    def flush_details(self, stats, cursor, details_writer):
+        tmdb_ids = list(details_writer.pending)
         try:
-            if media_type == 'movie':
-                details = tmdb_service.get_movie_details(tmdb_id)
-                credits = tmdb_service.get_movie_credits(tmdb_id)
+            with transaction.atomic():
+                result = details_writer.flush()
+                for tmdb_id in tmdb_ids:
+                    cursor.release(self.detail_pages.pop(tmdb_id, None))
+                cursor.save()
+        except Exception as e:
+            stats.errors += len(tmdb_ids)
+            self.page_errors += 1
+            self.context.forget(tmdb_ids)
+            self.stdout.write(f'⚠️ Erro ao gravar detalhes: {e}')
+            return
+        self.count_created(stats, len(result.created))
+    
+    def submit_details_chunk(self, pipeline, stats, cursor, details_writer, media_type, page, titles):
+        """Enviar os detalhes dos títulos novos de uma página a um processo"""
+        if not titles:
+            return
+        if self.shard_writes:
+            pipeline.submit(
+                import_tasks.import_details, media_type, titles,
+                on_result=partial(self.shard_written, stats, cursor, page, titles),
+                on_error=partial(self.shard_failed, stats, page, titles),
+            )
+            return
+        for data in titles:
+            self.detail_pages[data['id']] = page
+        pipeline.submit(
+            import_tasks.fetch_details, media_type, [data['id'] for data in titles],
+            on_result=partial(self.write_details_chunk, stats, cursor, details_writer, media_type, titles),
+            on_error=partial(self.details_chunk_failed, stats, cursor, details_writer, media_type, titles),
+        )
+    
+    def write_details_chunk(self, stats, cursor, details_writer, media_type, titles, results):
+        listing = {data['id']: data for data in titles}
+        for tmdb_id, details, error in results:
+            if error is not None:
+                self.details_failed(stats, cursor, details_writer, media_type, listing[tmdb_id], error)
             else:
-                details = tmdb_service.get_tv_details(tmdb_id)
-                credits = tmdb_service.get_tv_credits(tmdb_id)
-            
-            if details:
-                # Atualizar informações extras
-                media.runtime = details.get('runtime') or details.get('episode_run_time', [None])[0]
-                if media_type == 'tv':
-                    media.number_of_seasons = details.get('number_of_seasons')
-                    media.number_of_episodes = details.get('number_of_episodes')
-                media.save()
-            
-            if credits:
-                # Importar cast
-                cast_data = credits.get('cast', [])
-                for person in cast_data[:10]:  # Primeiros 10 atores
-                    Cast.objects.get_or_create(
-                        media=media,
-                        tmdb_person_id=person.get('id'),
-                        defaults={
-                            'name': person.get('name', ''),
-                            'character': person.get('character', ''),
-                            'profile_path': person.get('profile_path', ''),
-                            'order': person.get('order', 999)
-                        }
-                    )
-                
-                # Importar crew principais (diretor, roteirista, etc)
-                crew_data = credits.get('crew', [])
-                important_jobs = ['Director', 'Writer', 'Producer', 'Executive Producer']
-                for person in crew_data:
-                    if person.get('job') in important_jobs:
-                        Crew.objects.get_or_create(
-                            media=media,
-                            tmdb_person_id=person.get('id'),
-                            job=person.get('job', ''),
-                            defaults={
-                                'name': person.get('name', ''),
-                                'department': person.get('department', ''),
-                                'profile_path': person.get('profile_path', '')
-                            }
-                        )
+                self.write_media_details(stats, cursor, details_writer, media_type, listing[tmdb_id], details)
+    
+    def details_chunk_failed(self, stats, cursor, details_writer, media_type, titles, error):
+        for data in titles:
+            self.details_failed(stats, cursor, details_writer, media_type, data, error)
+    
+    def shard_written(self, stats, cursor, page, titles, result):
+        """Lote gravado por um processo filho na própria transação"""
+        created, failed = result
+        stats.requests += len(titles)
+        stats.errors += len(failed)
+        for tmdb_id, error in failed:
+            self.stdout.write(f'⚠️ Erro ao importar detalhes de {tmdb_id}: {error}')
+        self.context.mark_existing(data['id'] for data in titles)
+        cursor.release(page, count=len(titles))
+        cursor.save()
+        self.count_created(stats, len(created))
+    
+    def shard_failed(self, stats, page, titles, error):
+        stats.requests += len(titles)
+        stats.errors += len(titles)
+        self.page_errors += 1
+        self.context.forget(data['id'] for data in titles)
+        self.stdout.write(f'⚠️ Erro ao gravar detalhes da página {page}: {error}')
+    
+    def show_throughput(self):
+        """Mostrar throughput de cada fase"""
+        self.stdout.write(self.style.SUCCESS('\n⏱️ THROUGHPUT POR FASE:'))
+        for stats in self.phase_stats:
+            self.stdout.write(f'   {stats.summary()}')
         
-        except Exception as e:
-            self.stdout.write(f'⚠️ Erro ao importar detalhes: {e}')
+        self.stdout.write(self.style.SUCCESS('\n🌐 REQUISIÇÕES POR ENDPOINT:'))
+        for line in self.report.endpoint_lines():
+            self.stdout.write(f'   {line}')
     
     def show_final_stats(self):
         """Mostrar estatísticas finais"""
@@ -294,6 +421,7 @@ class Command(BaseCommand):
         total_genres = Genre.objects.count()
         total_cast = Cast.objects.count()
         total_crew = Crew.objects.count()
+        total_people = Person.objects.count()
         
         self.stdout.write(self.style.SUCCESS('\n📊 ESTATÍSTICAS FINAIS:'))
         self.stdout.write(f'🎬 Filmes: {total_movies}')
@@ -301,4 +429,5 @@ class Command(BaseCommand):
         self.stdout.write(f'🏷️ Gêneros: {total_genres}')
         self.stdout.write(f'🎭 Atores: {total_cast}')
         self.stdout.write(f'🎥 Equipe Técnica: {total_crew}')
+        self.stdout.write(f'👤 Pessoas: {total_people}')
         self.stdout.write(f'🎯 Total de Mídia: {total_movies + total_tv}')
\ No newline at end of file
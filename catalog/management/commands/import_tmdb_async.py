@@ -0,0 +1,195 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import ImproperlyConfigured
+from catalog.models import Genre
+from catalog.services.import_context import ImportContext
+from catalog.services.import_pipeline import PhaseStats
+from catalog.services.import_report import add_report_arguments, start_report
+from catalog.services.media_writer import MediaBatchWriter
+from services.rate_limiter import get_tmdb_rate_limiter
+from services.tmdb_async import AsyncTMDBService
+from services.tmdb_planner import FetchPlanner
+
+
+class Command(BaseCommand):
+    help = 'Importa filmes e séries da TMDB API com um cliente assíncrono (requer aiohttp)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--movies-pages',
+            type=int,
+            default=50,
+            help='Número de páginas de filmes populares (default: 50)'
+        )
+        parser.add_argument(
+            '--tv-pages',
+            type=int,
+            default=30,
+            help='Número de páginas de séries populares (default: 30)'
+        )
+        parser.add_argument(
+            '--include-details',
+            action='store_true',
+            help='Buscar detalhes completos (cast, crew) de cada título novo'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Requisições simultâneas (default: settings.TMDB_ASYNC_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Títulos gravados no banco por transação (default: 100)'
+        )
+        parser.add_argument(
+            '--max-rps',
+            type=float,
+            help='Limite de requisições por segundo à API (default: settings.TMDB_RATE_LIMIT)'
+        )
+        cache_group = parser.add_mutually_exclusive_group()
+        cache_group.add_argument(
+            '--cache-only',
+            action='store_true',
+            help='Usar apenas respostas do cache local da TMDB, sem acessar a rede'
+        )
+        cache_group.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Ignorar o cache local e buscar tudo novamente na API (o cache é atualizado)'
+        )
+        add_report_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['max_rps']:
+            get_tmdb_rate_limiter().configure(options['max_rps'])
+
+        try:
+            client = AsyncTMDBService(concurrency=options['concurrency'])
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        if options['cache_only']:
+            client.cache_mode = client.CACHE_ONLY
+        elif options['refresh']:
+            client.cache_mode = client.CACHE_REFRESH
+
+        self.batch_size = options['batch_size']
+        self.include_details = options['include_details']
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Iniciando importação assíncrona ({client.concurrency} requisições simultâneas)...'
+        ))
+        report = start_report('import_tmdb_async', options, {
+            'movies_pages': options['movies_pages'],
+            'tv_pages': options['tv_pages'],
+            'include_details': options['include_details'],
+            'concurrency': client.concurrency,
+        })
+        stats = PhaseStats('Importação assíncrona')
+        report.add_phase(stats)
+        try:
+            stats.titles = stats.created = asyncio.run(self.run(client, options['movies_pages'], options['tv_pages']))
+        except BaseException:
+            stats.finish()
+            report.finish('failed')
+            raise
+        stats.finish()
+        report.finish()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Importação concluída: {stats.titles} títulos em {stats.elapsed:.1f}s '
+            f'({stats.titles_per_second:.1f} títulos/s, {stats.db_seconds:.1f}s gravando no banco)'
+        ))
+        for line in report.endpoint_lines():
+            self.stdout.write(f'🌐 {line}')
+
+    async def run(self, client, movies_pages, tv_pages):
+        async with client:
+            movie_genres, tv_genres = await asyncio.gather(client.get_movie_genres(), client.get_tv_genres())
+            await sync_to_async(self.import_genres)(movie_genres + tv_genres)
+
+            self.context = await sync_to_async(ImportContext)()
+            queue = asyncio.Queue(maxsize=self.batch_size * 2)
+            writer = asyncio.create_task(self.consume(queue))
+
+            phases = [
+                (client.get_popular_movies, movies_pages, 'movie'),
+                (client.get_popular_tv, tv_pages, 'tv'),
+                (client.get_now_playing_movies, 5, 'movie'),
+                (client.get_top_rated_movies, 10, 'movie'),
+            ]
+            try:
+                for fetch_page, pages, media_type in phases:
+                    await asyncio.gather(*(
+                        self.produce_page(client, queue, fetch_page, page, media_type)
+                        for page in range(1, pages + 1)
+                    ))
+                await queue.put(None)
+                return await writer
+            finally:
+                # Um produtor que falhou não pode deixar o escritor esperando
+                # na fila para sempre
+                if not writer.done():
+                    writer.cancel()
+                    try:
+                        await writer
+                    except asyncio.CancelledError:
+                        pass
+
+    async def produce_page(self, client, queue, fetch_page, page, media_type):
+        """Buscar uma página e, se solicitado, os detalhes dos títulos novos"""
+        response = await fetch_page(page=page)
+        results = response.get('results', []) if isinstance(response, dict) else (response or [])
+
+        new_titles = []
+        for data in results:
+            if not isinstance(data, dict):
+                continue
+            # Marca já aqui para que fases sobrepostas não busquem o mesmo título
+            if self.context.claim(data.get('id')):
+                new_titles.append(data)
+
+        if self.include_details:
+            planner = FetchPlanner(client)
+            details = await asyncio.gather(*(planner.fetch(media_type, data['id']) for data in new_titles))
+            new_titles = [full or data for data, full in zip(new_titles, details)]
+
+        for data in new_titles:
+            await queue.put((data, media_type))
+
+    async def consume(self, queue):
+        """Estágio de escrita: agrupa os títulos e grava em lotes"""
+        write_batch = sync_to_async(self.write_batch)
+        imported = 0
+        batch = []
+        while True:
+            item = await queue.get()
+            if item is not None:
+                batch.append(item)
+            if batch and (item is None or len(batch) >= self.batch_size):
+                imported += await write_batch(batch)
+                self.stdout.write(f'📊 {imported} títulos importados...')
+                batch = []
+            if item is None:
+                return imported
+
+    def import_genres(self, genres):
+        for genre_data in genres:
+            Genre.objects.get_or_create(
+                tmdb_id=genre_data['id'],
+                defaults={'name': genre_data['name']}
+            )
+
+    def write_batch(self, batch):
+        writer = MediaBatchWriter(batch_size=None, context=self.context)
+        for data, media_type in batch:
+            writer.add(data, media_type)
+        try:
+            return len(writer.flush())
+        except Exception as e:
+            self.context.forget(data.get('id') for data, _ in batch)
+            self.stdout.write(f'❌ Erro ao gravar lote de {len(batch)} títulos: {e}')
+            return 0
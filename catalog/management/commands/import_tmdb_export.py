@@ -0,0 +1,186 @@
+import gzip
+import json
+import os
+from functools import partial
+from django.core.management.base import BaseCommand, CommandError
+from catalog.models import Media
+from catalog.services.import_context import ImportContext
+from catalog.services.import_pipeline import FetchPipeline, PhaseStats
+from catalog.services.import_report import add_report_arguments, start_report
+from catalog.services.media_writer import MediaBatchWriter
+from services.rate_limiter import get_tmdb_rate_limiter
+from services.tmdb_replay import add_replay_arguments, configure_replay
+from services.tmdb_planner import FetchPlanner
+from services.tmdb_service import get_tmdb_service
+
+
+class Command(BaseCommand):
+    help = 'Importa títulos a partir dos arquivos diários de IDs exportados pela TMDB (movie_ids_*.json.gz / tv_series_ids_*.json.gz)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Arquivo de exportação (.json.gz ou .json, um objeto JSON por linha)'
+        )
+        parser.add_argument(
+            '--type',
+            choices=['movie', 'tv'],
+            help='Tipo de mídia do arquivo (default: deduzido do nome do arquivo)'
+        )
+        parser.add_argument(
+            '--min-popularity',
+            type=float,
+            default=0,
+            help='Ignorar títulos com popularidade abaixo deste valor (default: 0)'
+        )
+        parser.add_argument(
+            '--include-adult',
+            action='store_true',
+            help='Incluir títulos marcados como adultos'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Número máximo de títulos a importar'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Número de threads buscando detalhes em paralelo (default: 4)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Títulos gravados por transação (default: 200)'
+        )
+        parser.add_argument(
+            '--max-rps',
+            type=float,
+            help='Limite de requisições por segundo à API (default: settings.TMDB_RATE_LIMIT)'
+        )
+        add_replay_arguments(parser)
+        add_report_arguments(parser)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'Arquivo não encontrado: {path}')
+
+        media_type = options['type'] or self.guess_media_type(path)
+        if media_type is None:
+            raise CommandError('Não foi possível deduzir o tipo de mídia pelo nome do arquivo; use --type')
+
+        if options['max_rps']:
+            get_tmdb_rate_limiter().configure(options['max_rps'])
+        self.tmdb_service = get_tmdb_service()
+        configure_replay(self.tmdb_service, options)
+
+        label = 'filmes' if media_type == 'movie' else 'séries'
+        self.stdout.write(self.style.SUCCESS(f'🚀 Importando {label} de {os.path.basename(path)}...'))
+
+        # O arquivo é lido aos poucos e os IDs já no catálogo são conferidos
+        # por bloco (select_ids), sem carregar todos os tmdb_ids de Media; o
+        # que passa por ali não está gravado, então ``existing`` começa vazio
+        self.context = ImportContext(held_ids=())
+
+        self.report = start_report('import_tmdb_export', options, {
+            'path': path, 'type': media_type, 'min_popularity': options['min_popularity'], 'limit': options['limit'],
+        })
+        self.stats = PhaseStats(f'Exportação de {label}')
+        self.report.add_phase(self.stats)
+        self.scanned = 0
+        self.skipped = 0
+        writer = MediaBatchWriter(batch_size=options['batch_size'], context=self.context)
+        get_details = FetchPlanner(self.tmdb_service).fetcher(media_type)
+
+        selected = self.select_ids(path, options['min_popularity'], options['include_adult'], options['limit'])
+        try:
+            with FetchPipeline(workers=options['workers']) as pipeline:
+                for tmdb_id in selected:
+                    pipeline.submit(
+                        get_details, tmdb_id,
+                        on_result=partial(self.write_details, writer, media_type),
+                        on_error=partial(self.details_failed, tmdb_id),
+                    )
+            self.stats.created += len(writer.flush().created)
+        except BaseException:
+            self.stats.finish()
+            self.report.finish('failed')
+            raise
+
+        self.stats.finish()
+        self.report.finish()
+        self.stdout.write(f'📄 {self.scanned} linhas lidas, {self.skipped} títulos já no catálogo ignorados')
+        self.stdout.write(f'⏱️ {self.stats.summary()}')
+        for line in self.report.endpoint_lines():
+            self.stdout.write(f'🌐 {line}')
+        self.stdout.write(self.style.SUCCESS('✅ Importação concluída!'))
+
+    def guess_media_type(self, path):
+        name = os.path.basename(path)
+        if name.startswith('movie_ids'):
+            return 'movie'
+        if name.startswith('tv_series_ids'):
+            return 'tv'
+        return None
+
+    def select_ids(self, path, min_popularity, include_adult, limit, chunk_size=500):
+        """Ler o arquivo linha a linha e gerar os IDs que passam nos filtros"""
+        selected = 0
+        for chunk in self.candidate_chunks(path, min_popularity, include_adult, chunk_size):
+            stored = set(Media.objects.filter(tmdb_id__in=chunk).values_list('tmdb_id', flat=True))
+            self.skipped += len(stored)
+            for tmdb_id in chunk:
+                if tmdb_id in stored or not self.context.claim(tmdb_id):
+                    continue
+                selected += 1
+                yield tmdb_id
+                if limit and selected >= limit:
+                    return
+
+    def candidate_chunks(self, path, min_popularity, include_adult, chunk_size):
+        """Blocos de IDs do arquivo que passam nos filtros, ainda sem olhar o banco"""
+        opener = gzip.open if path.endswith('.gz') else open
+        chunk = []
+        with opener(path, 'rt', encoding='utf-8') as export:
+            for line in export:
+                self.scanned += 1
+                if self.scanned % 100000 == 0:
+                    self.stdout.write(f'📄 {self.scanned} linhas lidas, {self.skipped} já no catálogo...')
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+
+                tmdb_id = item.get('id')
+                if not tmdb_id or self.context.is_known(tmdb_id):
+                    continue
+                if item.get('adult') and not include_adult:
+                    continue
+                if (item.get('popularity') or 0) < min_popularity:
+                    continue
+
+                chunk.append(tmdb_id)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def write_details(self, writer, media_type, details):
+        self.stats.requests += 1
+        if not details:
+            self.stats.errors += 1
+            return
+        self.stats.titles += 1
+        result = writer.add(details, media_type)
+        if result is not None:
+            self.stats.created += len(result.created)
+            self.stdout.write(f'📊 {self.stats.created} títulos importados...')
+
+    def details_failed(self, tmdb_id, error):
+        self.stats.requests += 1
+        self.stats.errors += 1
+        self.stdout.write(f'⚠️ Erro ao buscar detalhes de {tmdb_id}: {error}')
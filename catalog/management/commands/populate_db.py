@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from services.tmdb_service import TMDBService
+from services.tmdb_replay import add_replay_arguments, configure_replay
+from services.tmdb_service import TMDBService, get_tmdb_service
 from catalog.models import Media
-import time
+from catalog.services.import_context import ImportContext
 
 class Command(BaseCommand):
     help = 'Popula o banco de dados com filmes e séries populares do TMDB'
@@ -26,14 +27,34 @@ class Command(BaseCommand):
             default=1,
             help='Número de páginas para carregar de cada tipo (padrão: 1)',
         )
+        cache_group = parser.add_mutually_exclusive_group()
+        cache_group.add_argument(
+            '--cache-only',
+            action='store_true',
+            help='Usar apenas respostas do cache local da TMDB, sem acessar a rede'
+        )
+        cache_group.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Ignorar o cache local e buscar tudo novamente na API (o cache é atualizado)'
+        )
+        add_replay_arguments(parser)
 
     def handle(self, *args, **options):
-        tmdb_service = TMDBService()
+        tmdb_service = get_tmdb_service()
+        if options['cache_only']:
+            tmdb_service.cache_mode = TMDBService.CACHE_ONLY
+        elif options['refresh']:
+            tmdb_service.cache_mode = TMDBService.CACHE_REFRESH
+        configure_replay(tmdb_service, options)
         
         movies_count = options['movies']
         tv_shows_count = options['tv_shows']
         pages = options['pages']
         
+        # Gêneros e títulos já existentes carregados uma única vez
+        context = ImportContext()
+        
         self.stdout.write('🎬 Iniciando população do banco de dados...')
         self.stdout.write(f'📊 Meta: {movies_count} filmes e {tv_shows_count} séries')
         
@@ -49,7 +70,7 @@ class Command(BaseCommand):
                         break
                     
                     # Verificar se já existe
-                    if Media.objects.filter(tmdb_id=movie_data['id'], media_type='movie').exists():
+                    if not context.claim(movie_data['id']):
                         self.stdout.write(f'   ⚠️  Filme já existe: {movie_data["title"]}')
                         continue
                     
@@ -58,14 +79,11 @@ class Command(BaseCommand):
                         movie_details = tmdb_service.get_movie_details(movie_data['id'])
                         
                         # Criar/atualizar filme
-                        media = tmdb_service.create_or_update_media(movie_details, 'movie')
+                        media = tmdb_service.create_or_update_media(movie_details, 'movie', context)
                         
                         if media:
                             movies_loaded += 1
                             self.stdout.write(f'   ✅ Carregado: {media.title} ({media.release_date.year if media.release_date else "N/A"})')
-                            
-                            # Pausa para não sobrecarregar a API
-                            time.sleep(0.1)
                         
                     except Exception as e:
                         self.stdout.write(f'   ❌ Erro ao carregar filme {movie_data["title"]}: {str(e)}')
@@ -88,7 +106,7 @@ class Command(BaseCommand):
                         break
                     
                     # Verificar se já existe
-                    if Media.objects.filter(tmdb_id=tv_data['id'], media_type='tv').exists():
+                    if not context.claim(tv_data['id']):
                         self.stdout.write(f'   ⚠️  Série já existe: {tv_data["name"]}')
                         continue
                     
@@ -97,14 +115,11 @@ class Command(BaseCommand):
                         tv_details = tmdb_service.get_tv_details(tv_data['id'])
                         
                         # Criar/atualizar série
-                        media = tmdb_service.create_or_update_media(tv_details, 'tv')
+                        media = tmdb_service.create_or_update_media(tv_details, 'tv', context)
                         
                         if media:
                             tv_shows_loaded += 1
                             self.stdout.write(f'   ✅ Carregada: {media.title} ({media.release_date.year if media.release_date else "N/A"})')
-                            
-                            # Pausa para não sobrecarregar a API
-                            time.sleep(0.1)
                         
                     except Exception as e:
                         self.stdout.write(f'   ❌ Erro ao carregar série {tv_data["name"]}: {str(e)}')
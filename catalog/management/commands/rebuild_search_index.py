@@ -0,0 +1,15 @@
+import time
+from django.core.management.base import BaseCommand
+from catalog.services.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Recria o índice textual da busca a partir da tabela de títulos (após restaurar um backup, por exemplo)'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(self.style.SUCCESS(f'🔎 Reconstruindo o índice de busca ({backend.name})...'))
+        started_at = time.monotonic()
+        backend.install()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Índice reconstruído em {time.monotonic() - started_at:.1f}s'))
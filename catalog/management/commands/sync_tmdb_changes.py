@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from functools import partial
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from catalog.models import Media, SyncState
+from catalog.services.import_context import ImportContext
+from catalog.services.import_pipeline import FetchPipeline, PhaseStats
+from catalog.services.import_report import add_report_arguments, start_report
+from catalog.services.media_writer import MediaBatchWriter
+from services.rate_limiter import get_tmdb_rate_limiter
+from services.tmdb_planner import FetchPlanner
+from services.tmdb_service import TMDBNotFound, get_tmdb_service
+
+# A TMDB aceita no máximo 14 dias por consulta ao feed de alterações
+CHANGES_WINDOW = timedelta(days=14)
+
+
+class Command(BaseCommand):
+    help = 'Atualiza os títulos já importados que mudaram na TMDB desde a última sincronização'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Data inicial (AAAA-MM-DD); por padrão usa a marca d\'água salva (ou as últimas 24h)'
+        )
+        parser.add_argument(
+            '--type',
+            choices=['movie', 'tv', 'all'],
+            default='all',
+            help='Tipo de mídia a sincronizar (default: all)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Número de threads buscando detalhes em paralelo (default: 4)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Títulos gravados por transação (default: 200)'
+        )
+        parser.add_argument(
+            '--max-rps',
+            type=float,
+            help='Limite de requisições por segundo à API (default: settings.TMDB_RATE_LIMIT)'
+        )
+        add_report_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['max_rps']:
+            get_tmdb_rate_limiter().configure(options['max_rps'])
+        self.tmdb_service = get_tmdb_service()
+
+        since = None
+        if options['since']:
+            try:
+                since = timezone.make_aware(datetime.strptime(options['since'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('--since deve estar no formato AAAA-MM-DD')
+
+        media_types = ['movie', 'tv'] if options['type'] == 'all' else [options['type']]
+        self.report = start_report('sync_tmdb_changes', options, {'since': options['since'], 'type': options['type']})
+        try:
+            for media_type in media_types:
+                self.sync(media_type, since, options['workers'], options['batch_size'])
+        except BaseException:
+            self.report.finish('failed')
+            raise
+        self.report.finish()
+        for line in self.report.endpoint_lines():
+            self.stdout.write(f'🌐 {line}')
+
+    def sync(self, media_type, since, workers, batch_size):
+        label = 'filmes' if media_type == 'movie' else 'séries'
+        run_started = timezone.now()
+        state, _ = SyncState.objects.get_or_create(name=f'tmdb_changes_{media_type}')
+        since = since or state.watermark or run_started - timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🔄 Sincronizando alterações de {label} desde {timezone.localtime(since):%d/%m/%Y %H:%M}...'
+        ))
+        stats = PhaseStats(f'Sincronização de {label}')
+
+        changed_ids = self.fetch_changed_ids(media_type, since, run_started, stats)
+        held_ids = self.held_ids(media_type, changed_ids)
+        context = ImportContext(held_ids=held_ids)
+        self.stdout.write(f'📋 {len(changed_ids)} {label} com alterações na TMDB, {len(held_ids)} no catálogo')
+
+        writer = MediaBatchWriter(batch_size=batch_size, context=context)
+        # 404 vira TMDBNotFound: só um título removido da TMDB é pulado; as
+        # demais falhas seguram a marca d'água
+        get_details = FetchPlanner(self.tmdb_service).fetcher(media_type, raise_not_found=True)
+        with FetchPipeline(workers=workers) as pipeline:
+            for tmdb_id in held_ids:
+                pipeline.submit(
+                    get_details, tmdb_id,
+                    on_result=partial(self.write_details, writer, stats, media_type, tmdb_id),
+                    on_error=partial(self.details_failed, stats, tmdb_id),
+                )
+
+        # O último lote e a nova marca d'água são gravados juntos
+        with transaction.atomic():
+            self.count_unchanged(stats, writer.flush())
+            if not stats.errors:
+                state.watermark = run_started
+                state.save()
+
+        stats.finish()
+        self.report.add_phase(stats)
+        self.stdout.write(f'⏱️ {stats.summary()}')
+        if stats.errors:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ {stats.errors} erros; marca d\'água mantida para a próxima execução repetir o período'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Títulos atualizados: {stats.titles - stats.unchanged} ({stats.unchanged} sem alterações)'
+            ))
+
+    def fetch_changed_ids(self, media_type, since, until, stats):
+        """Ler o feed de alterações em janelas de até 14 dias"""
+        changed_ids = set()
+        window_start = since
+        while window_start < until:
+            window_end = min(window_start + CHANGES_WINDOW, until)
+            page, total_pages = 1, 1
+            while page <= total_pages:
+                response = self.tmdb_service.get_changes(
+                    media_type,
+                    start_date=timezone.localdate(window_start).isoformat(),
+                    end_date=timezone.localdate(window_end).isoformat(),
+                    page=page,
+                )
+                stats.requests += 1
+                if response is None:
+                    stats.errors += 1
+                    break
+                changed_ids.update(
+                    item['id'] for item in response.get('results', [])
+                    if item.get('id') and not item.get('adult')
+                )
+                total_pages = response.get('total_pages') or 1
+                page += 1
+            window_start = window_end
+        return changed_ids
+
+    def held_ids(self, media_type, tmdb_ids, chunk_size=500):
+        """Filtrar os IDs alterados que existem no catálogo"""
+        tmdb_ids = sorted(tmdb_ids)
+        held = []
+        for i in range(0, len(tmdb_ids), chunk_size):
+            held.extend(Media.objects.filter(
+                media_type=media_type, tmdb_id__in=tmdb_ids[i:i + chunk_size]
+            ).values_list('tmdb_id', flat=True))
+        return held
+
+    def write_details(self, writer, stats, media_type, tmdb_id, details):
+        if not details:
+            # Sem resposta depois das novas tentativas (5xx, 429, timeout)
+            self.details_failed(stats, tmdb_id, 'detalhes indisponíveis após novas tentativas')
+            return
+        stats.requests += 1
+        stats.titles += 1
+        self.count_unchanged(stats, writer.add(details, media_type))
+
+    def count_unchanged(self, stats, result):
+        if result is not None:
+            stats.unchanged += len(result.unchanged)
+
+    def details_failed(self, stats, tmdb_id, error):
+        stats.requests += 1
+        if isinstance(error, TMDBNotFound):
+            # Título removido da TMDB: fica como está
+            return
+        stats.errors += 1
+        self.stdout.write(f'⚠️ Erro ao buscar detalhes de {tmdb_id}: {error}')
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-16 20:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_syncstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('running', 'Em andamento'), ('finished', 'Concluída'), ('failed', 'Interrompida')], default='running', max_length=20)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(max_length=50)),
+                ('page', models.IntegerField(default=0, help_text='Todas as páginas até esta já foram gravadas')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cursors', to='catalog.importrun')),
+            ],
+            options={
+                'unique_together': {('run', 'phase')},
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def _person_key(tmdb_person_id, name):
+    # Créditos antigos sem ID da TMDB são agrupados pelo nome
+    return ('id', tmdb_person_id) if tmdb_person_id is not None else ('name', name)
+
+
+def link_people(apps, schema_editor):
+    """
+    Cria uma Person por pessoa distinta dos créditos e aponta Cast/Crew para ela
+    """
+    Person = apps.get_model('catalog', 'Person')
+    credit_models = [apps.get_model('catalog', 'Cast'), apps.get_model('catalog', 'Crew')]
+
+    people = {}
+    for model in credit_models:
+        rows = model.objects.order_by('id').values_list('tmdb_person_id', 'name', 'profile_path')
+        for tmdb_person_id, name, profile_path in rows.iterator(chunk_size=BATCH_SIZE):
+            key = _person_key(tmdb_person_id, name)
+            known = people.get(key)
+            # A linha mais recente vence, mas sem apagar uma foto conhecida
+            people[key] = (name, profile_path or (known[1] if known else None))
+
+    Person.objects.bulk_create(
+        [
+            Person(tmdb_id=key[1] if key[0] == 'id' else None, name=name, profile_path=profile_path)
+            for key, (name, profile_path) in people.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    person_ids = {('id', tmdb_id): pk for tmdb_id, pk in Person.objects.exclude(tmdb_id=None).values_list('tmdb_id', 'id')}
+    person_ids.update({('name', name): pk for name, pk in Person.objects.filter(tmdb_id=None).values_list('name', 'id')})
+
+    for model in credit_models:
+        batch = []
+        for credit in model.objects.only('id', 'tmdb_person_id', 'name').iterator(chunk_size=BATCH_SIZE):
+            credit.person_id = person_ids[_person_key(credit.tmdb_person_id, credit.name)]
+            batch.append(credit)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ['person'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['person'])
+
+
+def unlink_people(apps, schema_editor):
+    """
+    Copia de volta os dados da Person para as colunas de Cast/Crew
+    """
+    for model_name in ['Cast', 'Crew']:
+        model = apps.get_model('catalog', model_name)
+        batch = []
+        for credit in model.objects.select_related('person').iterator(chunk_size=BATCH_SIZE):
+            credit.name = credit.person.name
+            credit.profile_path = credit.person.profile_path
+            credit.tmdb_person_id = credit.person.tmdb_id
+            batch.append(credit)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ['name', 'profile_path', 'tmdb_person_id'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['name', 'profile_path', 'tmdb_person_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_importrun_importcursor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tmdb_id', models.IntegerField(blank=True, null=True, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('profile_path', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='cast',
+            name='person',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cast_credits', to='catalog.person'),
+        ),
+        migrations.AddField(
+            model_name='crew',
+            name='person',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='crew_credits', to='catalog.person'),
+        ),
+        migrations.RunPython(link_people, unlink_people),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_person'),
+    ]
+
+    operations = [
+        # Com default, as colunas podem ser recriadas ao reverter (0005 as preenche)
+        migrations.AlterField(
+            model_name='cast',
+            name='name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='crew',
+            name='name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.RemoveField(
+            model_name='cast',
+            name='name',
+        ),
+        migrations.RemoveField(
+            model_name='cast',
+            name='profile_path',
+        ),
+        migrations.RemoveField(
+            model_name='cast',
+            name='tmdb_person_id',
+        ),
+        migrations.RemoveField(
+            model_name='crew',
+            name='name',
+        ),
+        migrations.RemoveField(
+            model_name='crew',
+            name='profile_path',
+        ),
+        migrations.RemoveField(
+            model_name='crew',
+            name='tmdb_person_id',
+        ),
+        migrations.AlterField(
+            model_name='cast',
+            name='person',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cast_credits', to='catalog.person'),
+        ),
+        migrations.AlterField(
+            model_name='crew',
+            name='person',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crew_credits', to='catalog.person'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_move_credit_people_to_person'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cast',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='cast_credits', to='catalog.person'),
+        ),
+        migrations.AlterField(
+            model_name='crew',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='crew_credits', to='catalog.person'),
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(fields=['person', 'media'], name='catalog_cas_person__df52cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crew',
+            index=models.Index(fields=['person', 'media'], name='catalog_cre_person__42ef5e_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_credit_person_media_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='media',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='media',
+            name='credits_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+    ]
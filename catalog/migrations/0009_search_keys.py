@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_media_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genre',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='media',
+            name='original_title_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='media',
+            name='title_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=200),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_media_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['media_type', 'vote_average', 'id'], name='catalog_med_media_t_2e0098_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['media_type', 'release_date', 'id'], name='catalog_med_media_t_8f169d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['media_type', 'title', 'id'], name='catalog_med_media_t_5d354f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['media_type', 'popularity', 'id'], name='catalog_med_media_t_2b9075_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0011_media_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['poster_path'], name='catalog_med_poster__89cd64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['backdrop_path'], name='catalog_med_backdro_af60b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['profile_path'], name='catalog_per_profile_c1e890_idx'),
+        ),
+    ]
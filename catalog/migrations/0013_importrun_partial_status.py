@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0012_image_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importrun',
+            name='status',
+            field=models.CharField(choices=[('running', 'Em andamento'), ('finished', 'Concluída'), ('partial', 'Concluída com páginas faltando'), ('failed', 'Interrompida')], default='running', max_length=20),
+        ),
+    ]
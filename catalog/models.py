@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from catalog.services.text import search_key
+
 User = get_user_model()
 
 class Genre(models.Model):
@@ -10,10 +12,16 @@ class Genre(models.Model):
     """
     name = models.CharField(max_length=100, unique=True)
     tmdb_id = models.IntegerField(unique=True, null=True, blank=True)
+    # Nome sem acentos e em minúsculas (filtro por nome usando o índice)
+    name_key = models.CharField(max_length=100, blank=True, default='', db_index=True, editable=False)
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        self.name_key = search_key(self.name)
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['name']
 
@@ -45,18 +53,59 @@ class Media(models.Model):
     number_of_seasons = models.IntegerField(null=True, blank=True)
     number_of_episodes = models.IntegerField(null=True, blank=True)
     
+    # Títulos sem acentos e em minúsculas ("Ação" -> "acao"), preenchidos na
+    # importação; as buscas por prefixo usam o índice em vez de LOWER()
+    title_key = models.CharField(max_length=200, blank=True, default='', db_index=True, editable=False)
+    original_title_key = models.CharField(max_length=200, blank=True, default='', db_index=True, editable=False)
+    
+    # Hashes do último conteúdo da TMDB gravado (campos + gêneros e créditos),
+    # para que atualizações sem mudança real não reescrevam a linha
+    content_hash = models.CharField(max_length=40, blank=True, default='', editable=False)
+    credits_hash = models.CharField(max_length=40, blank=True, default='', editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.title} ({self.get_media_type_display()})"
     
+    def save(self, *args, **kwargs):
+        self.title_key = search_key(self.title)[:200]
+        self.original_title_key = search_key(self.original_title)[:200]
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['-popularity', '-release_date']
         indexes = [
             models.Index(fields=['media_type']),
             models.Index(fields=['tmdb_id']),
             models.Index(fields=['-popularity']),
+            models.Index(fields=['updated_at']),
+            # Paginação por cursor das listagens: (tipo, ordenação, id)
+            models.Index(fields=['media_type', 'vote_average', 'id']),
+            models.Index(fields=['media_type', 'release_date', 'id']),
+            models.Index(fields=['media_type', 'title', 'id']),
+            models.Index(fields=['media_type', 'popularity', 'id']),
+            # O cache de imagens só gera variantes de caminhos do catálogo
+            models.Index(fields=['poster_path']),
+            models.Index(fields=['backdrop_path']),
+        ]
+
+class Person(models.Model):
+    """
+    Pessoa (ator ou membro da equipe) da TMDB, compartilhada entre os créditos
+    """
+    tmdb_id = models.IntegerField(unique=True, null=True, blank=True)
+    name = models.CharField(max_length=200)
+    profile_path = models.CharField(max_length=200, blank=True, null=True)
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['profile_path']),
         ]
 
 class Cast(models.Model):
@@ -64,31 +113,63 @@ class Cast(models.Model):
     Elenco dos filmes/séries
     """
     media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='cast_members')
-    name = models.CharField(max_length=200)
+    # Coberto pelo índice (person, media)
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='cast_credits', db_index=False)
     character = models.CharField(max_length=200, blank=True, null=True)
-    profile_path = models.CharField(max_length=200, blank=True, null=True)
-    tmdb_person_id = models.IntegerField(null=True, blank=True)
     order = models.IntegerField(default=0)
     
     def __str__(self):
         return f"{self.name} as {self.character}"
     
+    # Atalhos para os templates
+    @property
+    def name(self):
+        return self.person.name
+    
+    @property
+    def profile_path(self):
+        return self.person.profile_path
+    
+    @property
+    def tmdb_person_id(self):
+        return self.person.tmdb_id
+    
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['person', 'media']),
+        ]
 
 class Crew(models.Model):
     """
     Equipe técnica dos filmes/séries
     """
     media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='crew_members')
-    name = models.CharField(max_length=200)
+    # Coberto pelo índice (person, media)
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='crew_credits', db_index=False)
     job = models.CharField(max_length=100)
     department = models.CharField(max_length=100)
-    profile_path = models.CharField(max_length=200, blank=True, null=True)
-    tmdb_person_id = models.IntegerField(null=True, blank=True)
     
     def __str__(self):
         return f"{self.name} - {self.job}"
+    
+    # Atalhos para os templates
+    @property
+    def name(self):
+        return self.person.name
+    
+    @property
+    def profile_path(self):
+        return self.person.profile_path
+    
+    @property
+    def tmdb_person_id(self):
+        return self.person.tmdb_id
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['person', 'media']),
+        ]
 
 class Favorite(models.Model):
     """
@@ -132,3 +213,52 @@ class ContentRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+
+class SyncState(models.Model):
+    """
+    Marca d'água das sincronizações incrementais com a TMDB
+    """
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True, help_text="Alterações anteriores a este instante já foram aplicadas")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.watermark})"
+
+class ImportRun(models.Model):
+    """
+    Execução de um comando de importação, para retomar de onde parou
+    """
+    STATUS_CHOICES = [
+        ('running', 'Em andamento'),
+        ('finished', 'Concluída'),
+        ('partial', 'Concluída com páginas faltando'),
+        ('failed', 'Interrompida'),
+    ]
+    
+    command = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    options = models.JSONField(default=dict, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.command} #{self.pk} - {self.get_status_display()}"
+    
+    class Meta:
+        ordering = ['-started_at']
+
+class ImportCursor(models.Model):
+    """
+    Última página concluída de cada fase de uma importação
+    """
+    run = models.ForeignKey(ImportRun, on_delete=models.CASCADE, related_name='cursors')
+    phase = models.CharField(max_length=50)
+    page = models.IntegerField(default=0, help_text="Todas as páginas até esta já foram gravadas")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.run} - {self.phase}: página {self.page}"
+    
+    class Meta:
+        unique_together = ['run', 'phase']
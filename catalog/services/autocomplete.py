@@ -0,0 +1,298 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Max
+
+from catalog.models import Media
+from catalog.services.text import prefix_range, search_key
+
+# Palavras das chaves de sugestão (a pontuação do título não conta)
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Prefixos até este tamanho têm a lista de sugestões pronta; os maiores
+# percorrem só o trecho (pequeno) da lista ordenada que começa com eles
+CACHED_PREFIX_LENGTH = 3
+
+# Quantas chaves um prefixo longo examina, no máximo
+SCAN_LIMIT = 5000
+
+# Até quantos títulos alterados o snapshot é corrigido no lugar; acima
+# disso, sai mais barato montá-lo de novo
+PATCH_LIMIT = 500
+
+# Margem ao reler as mudanças: gravações confirmadas depois da leitura
+# anterior, mas com updated_at um pouco mais antigo, não ficam de fora
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+FIELDS = ('id', 'title', 'title_key', 'original_title_key', 'media_type', 'release_date', 'poster_path', 'popularity')
+
+
+def completion_key(text) -> str:
+    """
+    ``'Vingadores: Ultimato'`` -> ``'vingadores ultimato'``
+    """
+    return ' '.join(_WORD_RE.findall(search_key(text)))
+
+
+def completion_keys(*names: str) -> set:
+    """
+    Chaves de um título: uma a partir de cada palavra, para que "ultimato"
+    sugira "Vingadores: Ultimato"
+    """
+    found = set()
+    for name in names:
+        words = name.split()
+        for position in range(len(words)):
+            found.add(' '.join(words[position:]))
+    return found
+
+
+class Suggestion:
+    __slots__ = ('id', 'title', 'media_type', 'year', 'poster_path', 'popularity', 'names', 'keys', 'order')
+
+    def __init__(self, row):
+        pk, title, title_key, original_title_key, media_type, release_date, poster_path, popularity = row
+        self.id = pk
+        self.title = title
+        self.media_type = media_type
+        self.year = release_date.year if release_date else None
+        self.poster_path = poster_path
+        self.popularity = popularity or 0.0
+        # title_key/original_title_key já normalizados, só sem pontuação
+        self.names = tuple(dict.fromkeys(
+            name for name in (' '.join(_WORD_RE.findall(key or '')) for key in (title_key, original_title_key)) if name
+        ))
+        self.keys = completion_keys(*self.names)
+        self.order = (-self.popularity, pk)  # menor primeiro: mais popular
+
+    def same_as(self, other) -> bool:
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+def short_prefixes(suggestion: Suggestion) -> set:
+    return {
+        key[:length]
+        for key in suggestion.keys
+        for length in range(1, min(len(key), CACHED_PREFIX_LENGTH) + 1)
+    }
+
+
+class Snapshot:
+    """
+    Estrutura imutável consultada pelas requisições: as chaves ordenadas (com
+    a ordem de popularidade do título de cada uma) e as listas prontas dos
+    prefixos curtos. Uma atualização monta outro snapshot (``patched``) e
+    troca a referência.
+    """
+
+    def __init__(self, titles: Dict[int, Suggestion], results: int):
+        self.titles = titles
+        self.results = results
+        entries = sorted((key, suggestion.order) for suggestion in titles.values() for key in suggestion.keys)
+        self.keys = [key for key, _ in entries]
+        self.orders = [order for _, order in entries]
+
+        # Percorrendo do mais ao menos popular, cada prefixo curto fica com
+        # os primeiros títulos que o contêm
+        self.top = {}
+        for suggestion in sorted(titles.values(), key=lambda suggestion: suggestion.order):
+            for prefix in short_prefixes(suggestion):
+                top = self.top.setdefault(prefix, [])
+                if len(top) < results:
+                    top.append(suggestion.order)
+
+    def patched(self, changes: Dict[int, Optional[Suggestion]]) -> 'Snapshot':
+        """
+        Cópia com os títulos alterados (None: removido) trocados: só as
+        chaves deles e os prefixos curtos que eles tocam são refeitos
+        """
+        snapshot = Snapshot.__new__(Snapshot)
+        snapshot.results = self.results
+        snapshot.titles = dict(self.titles)
+        snapshot.keys = list(self.keys)
+        snapshot.orders = list(self.orders)
+        snapshot.top = dict(self.top)
+        keys, orders = snapshot.keys, snapshot.orders
+
+        # Listas dos prefixos curtos: quem entra só disputa a lista; quando
+        # sai um título que estava nela, a lista é refeita pelo intervalo
+        top = snapshot.top
+        stale = set()
+        for pk, suggestion in changes.items():
+            previous = snapshot.titles.pop(pk, None)
+            if previous is not None:
+                for key in previous.keys:
+                    position = snapshot._position(key, previous.order)
+                    if position < len(keys) and keys[position] == key and orders[position] == previous.order:
+                        del keys[position]
+                        del orders[position]
+                stale |= {prefix for prefix in short_prefixes(previous) if previous.order in top.get(prefix, ())}
+            if suggestion is not None:
+                snapshot.titles[pk] = suggestion
+                for key in suggestion.keys:
+                    position = snapshot._position(key, suggestion.order)
+                    keys.insert(position, key)
+                    orders.insert(position, suggestion.order)
+                for prefix in short_prefixes(suggestion) - stale:
+                    best = top.get(prefix, [])
+                    if len(best) < self.results or suggestion.order < best[-1]:
+                        best = sorted(best + [suggestion.order])[:self.results]
+                        top[prefix] = best
+
+        for prefix in stale:
+            best = heapq.nsmallest(self.results, set(orders[slice(*snapshot._range(prefix))]))
+            if best:
+                top[prefix] = best
+            else:
+                top.pop(prefix, None)
+        return snapshot
+
+    def _position(self, key: str, order) -> int:
+        """
+        Posição de (key, order) na lista ordenada
+        """
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key and self.orders[position] < order:
+            position += 1
+        return position
+
+    def _range(self, prefix: str):
+        low, high = prefix_range(prefix)
+        start = bisect.bisect_left(self.keys, low)
+        return start, bisect.bisect_left(self.keys, high, start)
+
+    def suggest(self, key: str, limit: int) -> List[Suggestion]:
+        if len(key) <= CACHED_PREFIX_LENGTH:
+            found = self.top.get(key, [])[:limit]
+        else:
+            start, end = self._range(key)
+            found = heapq.nsmallest(limit, set(self.orders[start:min(end, start + SCAN_LIMIT)]))
+        return [self.titles[pk] for _, pk in found]
+
+
+class AutocompleteIndex:
+    """
+    Sugestões de títulos por prefixo servidas da memória do processo, sem
+    consultar o banco a cada tecla.
+
+    Guarda só os ``AUTOCOMPLETE_MAX_TITLES`` títulos mais populares (limite de
+    memória). A cada ``AUTOCOMPLETE_REFRESH_SECONDS`` relê apenas os títulos
+    com ``updated_at`` posterior à última leitura e corrige o snapshot só
+    onde eles aparecem; a reconstrução completa (que também descarta títulos
+    removidos por outros processos) acontece a cada
+    ``AUTOCOMPLETE_REBUILD_SECONDS``.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[Snapshot] = None
+        self.watermark = None
+        self.checked_at = 0.0
+        self.built_at = 0.0
+        self.removed = set()
+        self.lock = threading.Lock()
+
+    def suggest(self, query: str, limit: Optional[int] = None) -> List[Suggestion]:
+        key = completion_key(query)
+        if not key:
+            return []
+        self.ensure_fresh()
+        limit = max(1, min(limit or settings.AUTOCOMPLETE_RESULTS, settings.AUTOCOMPLETE_RESULTS))
+        removed = self.removed
+        suggestions = self.snapshot.suggest(key, limit + len(removed))
+        return [suggestion for suggestion in suggestions if suggestion.id not in removed][:limit]
+
+    def forget(self, pk: int):
+        """
+        Título removido neste processo: some das sugestões imediatamente
+        """
+        self.removed = self.removed | {pk}
+
+    def ensure_fresh(self):
+        if time.monotonic() - self.checked_at < settings.AUTOCOMPLETE_REFRESH_SECONDS:
+            return
+        # Só a primeira montagem espera; depois, quem não pega o lock usa o
+        # snapshot atual enquanto outra thread atualiza
+        if not self.lock.acquire(blocking=self.snapshot is None):
+            return
+        try:
+            if time.monotonic() - self.checked_at < settings.AUTOCOMPLETE_REFRESH_SECONDS:
+                return
+            if self.snapshot is None or time.monotonic() - self.built_at >= settings.AUTOCOMPLETE_REBUILD_SECONDS:
+                self.rebuild()
+            else:
+                self.apply_changes()
+            self.checked_at = time.monotonic()
+        finally:
+            self.lock.release()
+
+    def rebuild(self):
+        watermark = Media.objects.aggregate(latest=Max('updated_at'))['latest']
+        rows = (
+            Media.objects.exclude(title_key='').order_by('-popularity')
+            .values_list(*FIELDS)[:settings.AUTOCOMPLETE_MAX_TITLES]
+        )
+        titles = {suggestion.id: suggestion for suggestion in map(Suggestion, rows)}
+        self.snapshot = Snapshot(titles, settings.AUTOCOMPLETE_RESULTS)
+        self.watermark = watermark
+        self.removed = set()
+        self.built_at = time.monotonic()
+
+    def apply_changes(self):
+        if self.watermark is None:
+            return self.rebuild()
+        changed = list(
+            Media.objects.filter(updated_at__gte=self.watermark - WATERMARK_OVERLAP).order_by()
+            .values_list(*FIELDS, 'updated_at')[:PATCH_LIMIT + 1]
+        )
+        if len(changed) > PATCH_LIMIT:
+            return self.rebuild()
+
+        current = self.snapshot.titles
+        changes = {pk: None for pk in self.removed if pk in current}
+        for row in changed:
+            self.watermark = max(self.watermark, row[-1])
+            suggestion = Suggestion(row[:-1])
+            previous = current.get(suggestion.id)
+            if previous is not None and previous.same_as(suggestion):
+                continue
+            if suggestion.keys:
+                changes[suggestion.id] = suggestion
+            elif previous is not None:
+                changes[suggestion.id] = None
+        if not changes:
+            return
+
+        snapshot = self.snapshot.patched(changes)
+        # Limite de memória: saem os menos populares
+        overflow = len(snapshot.titles) - settings.AUTOCOMPLETE_MAX_TITLES
+        if overflow > 0:
+            least = heapq.nlargest(overflow, snapshot.titles.values(), key=lambda suggestion: suggestion.order)
+            snapshot = snapshot.patched({suggestion.id: None for suggestion in least})
+        self.snapshot = snapshot
+
+
+_autocomplete_index = None
+_autocomplete_index_lock = threading.Lock()
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    global _autocomplete_index
+    if _autocomplete_index is None:
+        with _autocomplete_index_lock:
+            if _autocomplete_index is None:
+                _autocomplete_index = AutocompleteIndex()
+    return _autocomplete_index
+
+
+def forget_media(sender, instance, **kwargs):
+    """
+    post_delete de Media
+    """
+    if _autocomplete_index is not None:
+        _autocomplete_index.forget(instance.pk)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+from typing import Dict, Iterable, Tuple
+
+from catalog.models import Cast, Crew, Person
+
+# Quantidade de atores principais importados por título
+CAST_LIMIT = 10
+
+# Funções da equipe técnica que são importadas, as mesmas em todos os
+# caminhos de gravação: o credits_hash de um título não pode depender do
+# comando que o gravou
+IMPORTANT_JOBS = ('Director', 'Writer', 'Screenplay', 'Producer', 'Executive Producer')
+
+
+def _cast_entries(credits_data: Dict):
+    return [person for person in credits_data.get('cast', [])[:CAST_LIMIT] if person.get('id')]
+
+
+def _crew_entries(credits_data: Dict):
+    return [
+        person for person in credits_data.get('crew', [])
+        if person.get('id') and person.get('job') in IMPORTANT_JOBS
+    ]
+
+
+def credits_digest(credits_data: Dict) -> str:
+    """
+    Hash só das partes dos créditos que são importadas (elenco principal e
+    funções importantes), para detectar se há algo a sincronizar
+    """
+    normalized = [
+        [
+            [p['id'], p.get('name', ''), p.get('profile_path'), p.get('character', ''), p.get('order', 0)]
+            for p in _cast_entries(credits_data)
+        ],
+        [
+            [p['id'], p.get('name', ''), p.get('profile_path'), p.get('job', ''), p.get('department', '')]
+            for p in _crew_entries(credits_data)
+        ],
+    ]
+    return hashlib.sha1(json.dumps(normalized, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def cast_rows(media_id: int, credits_data: Dict, person_ids: Dict[int, int]):
+    """
+    Monta os objetos Cast (não salvos) a partir dos créditos da TMDB;
+    ``person_ids`` mapeia o ID TMDB da pessoa para a pk de Person
+    """
+    return [
+        Cast(
+            media_id=media_id,
+            person_id=person_ids[person['id']],
+            character=person.get('character', ''),
+            order=person.get('order', 0),
+        )
+        for person in _cast_entries(credits_data)
+    ]
+
+
+def crew_rows(media_id: int, credits_data: Dict, person_ids: Dict[int, int]):
+    """
+    Monta os objetos Crew (não salvos) das funções importantes
+    """
+    return [
+        Crew(
+            media_id=media_id,
+            person_id=person_ids[person['id']],
+            job=person.get('job', ''),
+            department=person.get('department', ''),
+        )
+        for person in _crew_entries(credits_data)
+    ]
+
+
+def sync_people(people: Dict[int, Dict]) -> Dict[int, int]:
+    """
+    Garante uma Person para cada pessoa da TMDB (``tmdb_id -> dados``) e
+    retorna o mapa ``tmdb_id -> pk``. Só pessoas novas ou com nome/foto
+    diferentes são gravadas, em um único upsert.
+    """
+    if not people:
+        return {}
+    person_ids = {}
+    changed = []
+    existing = Person.objects.filter(tmdb_id__in=list(people)).values_list('tmdb_id', 'id', 'name', 'profile_path')
+    for tmdb_id, pk, name, profile_path in existing:
+        person_ids[tmdb_id] = pk
+        data = people[tmdb_id]
+        if (data.get('name', ''), data.get('profile_path')) != (name, profile_path):
+            changed.append(tmdb_id)
+    missing = [tmdb_id for tmdb_id in people if tmdb_id not in person_ids]
+
+    to_write = changed + missing
+    if to_write:
+        Person.objects.bulk_create(
+            [
+                Person(
+                    tmdb_id=tmdb_id,
+                    name=people[tmdb_id].get('name', ''),
+                    profile_path=people[tmdb_id].get('profile_path'),
+                )
+                for tmdb_id in to_write
+            ],
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=['name', 'profile_path'],
+            batch_size=500,
+        )
+    if missing:
+        person_ids.update(Person.objects.filter(tmdb_id__in=missing).values_list('tmdb_id', 'id'))
+    return person_ids
+
+
+def _sync_rows(model, media_ids, desired, key, fields):
+    """
+    Aplica em ``model`` só a diferença entre as linhas existentes dos títulos
+    ``media_ids`` e as linhas desejadas (objetos não salvos), casando-as por
+    ``key``. Retorna (inserções, atualizações, remoções).
+    """
+    existing = {}
+    to_delete = []
+    for row in model.objects.filter(media_id__in=media_ids).only('id', 'media_id', *key, *fields):
+        row_key = (row.media_id,) + tuple(getattr(row, name) for name in key)
+        if row_key in existing:
+            to_delete.append(row.pk)  # duplicata
+        else:
+            existing[row_key] = row
+
+    to_create, to_update, seen = [], [], set()
+    for obj in desired:
+        obj_key = (obj.media_id,) + tuple(getattr(obj, name) for name in key)
+        if obj_key in seen:
+            continue
+        seen.add(obj_key)
+        row = existing.pop(obj_key, None)
+        if row is None:
+            to_create.append(obj)
+        elif any(getattr(row, name) != getattr(obj, name) for name in fields):
+            for name in fields:
+                setattr(row, name, getattr(obj, name))
+            to_update.append(row)
+    to_delete.extend(row.pk for row in existing.values())
+
+    if to_delete:
+        model.objects.filter(pk__in=to_delete).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, fields, batch_size=500)
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=500)
+    return len(to_create), len(to_update), len(to_delete)
+
+
+def sync_credits(entries: Iterable[Tuple[int, Dict]]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Sincroniza elenco e equipe de vários títulos de uma vez.
+
+    ``entries`` é uma sequência de (media_id, créditos da TMDB). As pessoas
+    são gravadas primeiro (``sync_people``); as linhas de créditos são
+    casadas por (pessoa, papel) - personagem no elenco, função na equipe - e
+    só as diferenças são gravadas, preservando as chaves primárias.
+    Deve ser chamada dentro de uma transação.
+    """
+    entries = list(entries)
+    if not entries:
+        return {}
+    media_ids = [media_id for media_id, _ in entries]
+
+    people = {}
+    for _, credits_data in entries:
+        for person in _cast_entries(credits_data) + _crew_entries(credits_data):
+            people[person['id']] = person
+    person_ids = sync_people(people)
+
+    cast, crew = [], []
+    for media_id, credits_data in entries:
+        cast.extend(cast_rows(media_id, credits_data, person_ids))
+        crew.extend(crew_rows(media_id, credits_data, person_ids))
+
+    return {
+        'cast': _sync_rows(Cast, media_ids, cast, ('person_id', 'character'), ['order']),
+        'crew': _sync_rows(Crew, media_ids, crew, ('person_id', 'job'), ['department']),
+    }
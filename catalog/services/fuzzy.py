@@ -0,0 +1,190 @@
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from catalog.services.autocomplete import completion_key, get_autocomplete_index
+
+# Entradas das listas de trigramas contadas por busca, no máximo: os
+# trigramas muito comuns ("de", "a ") ficam de fora quando passariam disso
+MAX_COUNTED_POSTINGS = 100000
+
+# Candidatos (por trigramas em comum) que passam pela distância de edição
+RANKED_CANDIDATES = 200
+
+
+def trigrams(text: str) -> set:
+    """
+    Trigramas de cada palavra, com as bordas marcadas como no pg_trgm
+    (``'avatar'`` -> ``'  a'``, ``' av'``, ``'ava'``, ..., ``'ar '``)
+    """
+    found = set()
+    for word in text.split():
+        padded = f'  {word} '
+        found.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return found
+
+
+def bounded_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Distância de Levenshtein entre ``a`` e ``b``, ou None assim que passa de
+    ``limit`` (só a faixa de largura ``2 * limit + 1`` da matriz é calculada)
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    outside = limit + 1
+    previous = [column if column <= limit else outside for column in range(len(b) + 1)]
+    for row in range(1, len(a) + 1):
+        first = max(1, row - limit)
+        last = min(len(b), row + limit)
+        current = [outside] * (len(b) + 1)
+        current[0] = row if row <= limit else outside
+        best = current[0] if first == 1 else outside
+        for column in range(first, last + 1):
+            cost = 0 if a[row - 1] == b[column - 1] else 1
+            value = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            current[column] = value if value <= limit else outside
+            best = min(best, current[column])
+        if best > limit:
+            return None
+        previous = current
+    return previous[len(b)] if previous[len(b)] <= limit else None
+
+
+def name_distance(query: str, name: str, limit: int) -> Optional[int]:
+    """
+    Menor distância entre a busca e o título inteiro ou o começo dele com o
+    mesmo número de palavras ("avatr" x "avatar o caminho da agua")
+    """
+    words = name.split()
+    start = ' '.join(words[:len(query.split())])
+    distances = [
+        distance for distance in (bounded_distance(query, text, limit) for text in {name, start})
+        if distance is not None
+    ]
+    return min(distances) if distances else None
+
+
+class TrigramIndex:
+    """
+    Índice invertido trigrama -> títulos, montado a partir dos títulos que o
+    índice de sugestões já mantém em memória (os mais populares, com as
+    chaves normalizadas)
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.titles = list(snapshot.titles.values())
+        postings = {}
+        for ordinal, suggestion in enumerate(self.titles):
+            for gram in set().union(*(trigrams(name) for name in suggestion.names)):
+                postings.setdefault(gram, []).append(ordinal)
+        self.postings = {gram: array('i', ordinals) for gram, ordinals in postings.items()}
+        self.built_at = time.monotonic()
+
+    def search(self, query: str, media_type: Optional[str], limit: int, deadline: float) -> List[int]:
+        key = completion_key(query)
+        grams = trigrams(key)
+        if len(key) < 3 or not grams:
+            return []
+
+        # Dos trigramas mais raros para os mais comuns, até o limite de
+        # entradas contadas ou o fim do orçamento de tempo
+        counts = Counter()
+        counted = work = 0
+        for gram in sorted(grams, key=lambda gram: len(self.postings.get(gram, ()))):
+            ordinals = self.postings.get(gram)
+            if not ordinals:
+                continue
+            if (counts and work + len(ordinals) > MAX_COUNTED_POSTINGS) or time.perf_counter() > deadline:
+                break
+            counts.update(ordinals)
+            counted += 1
+            work += len(ordinals)
+
+        # Edição tolerada cresce com o tamanho da busca: 1 a cada 4 letras
+        max_distance = max(1, len(key) // 4)
+        minimum_shared = max(1, counted // 3)
+        ranked = []
+        for ordinal, shared in counts.most_common(RANKED_CANDIDATES):
+            if shared < minimum_shared or time.perf_counter() > deadline:
+                break
+            suggestion = self.titles[ordinal]
+            if media_type and suggestion.media_type != media_type:
+                continue
+            distances = [
+                distance for distance in (name_distance(key, name, max_distance) for name in suggestion.names)
+                if distance is not None
+            ]
+            if distances:
+                ranked.append((min(distances), suggestion.order, suggestion.id))
+        ranked.sort()
+        return [pk for _, _, pk in ranked[:limit]]
+
+
+_trigram_index = None
+_trigram_index_lock = threading.Lock()  # fica com a thread que está montando o índice
+
+
+def _build_trigram_index():
+    global _trigram_index
+    try:
+        autocomplete = get_autocomplete_index()
+        autocomplete.ensure_fresh()
+        index = _trigram_index
+        if index is None or (
+            index.snapshot is not autocomplete.snapshot
+            and time.monotonic() - index.built_at >= settings.SEARCH_FUZZY_REBUILD_SECONDS
+        ):
+            _trigram_index = TrigramIndex(autocomplete.snapshot)
+    finally:
+        connection.close()
+        _trigram_index_lock.release()
+
+
+def get_trigram_index() -> Optional[TrigramIndex]:
+    """
+    Índice atual, sem esperar: a montagem (e a atualização das sugestões de
+    que ele depende) roda em uma thread separada, e quem chega antes usa o
+    índice anterior, ou None enquanto o primeiro não fica pronto. É remontado
+    quando as sugestões mudaram e o índice tem mais de
+    ``SEARCH_FUZZY_REBUILD_SECONDS``.
+    """
+    autocomplete = get_autocomplete_index()
+    index = _trigram_index
+    now = time.monotonic()
+    stale = (
+        index is None
+        or now - autocomplete.checked_at >= settings.AUTOCOMPLETE_REFRESH_SECONDS
+        or (
+            index.snapshot is not autocomplete.snapshot
+            and now - index.built_at >= settings.SEARCH_FUZZY_REBUILD_SECONDS
+        )
+    )
+    if stale and _trigram_index_lock.acquire(blocking=False):
+        try:
+            threading.Thread(target=_build_trigram_index, name='trigram-index', daemon=True).start()
+        except RuntimeError:
+            _trigram_index_lock.release()
+    return index
+
+
+def fuzzy_search(query: str, media_type: Optional[str] = None) -> List[int]:
+    """
+    pks de títulos parecidos com a busca (erros de digitação: "Avatr",
+    "Interestelar"), do mais ao menos parecido. Tudo, inclusive obter o
+    índice, cabe em ``SEARCH_FUZZY_BUDGET_MS``: a busca para quando o tempo
+    acaba, devolvendo o que já achou, e não há resultados enquanto o índice
+    ainda está sendo montado.
+    """
+    deadline = time.perf_counter() + settings.SEARCH_FUZZY_BUDGET_MS / 1000
+    index = get_trigram_index()
+    if index is None:
+        return []
+    return index.search(query, media_type, settings.SEARCH_FUZZY_RESULTS, deadline)
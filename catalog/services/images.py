@@ -0,0 +1,331 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+from django.urls import reverse
+
+from catalog.models import Media, Person
+
+try:
+    from PIL import Image, features
+except ImportError:  # sem Pillow os templates continuam apontando para a TMDB
+    Image = None
+    features = None
+
+# Arquivos de imagem da TMDB: /<hash>.jpg (posters, backdrops e perfis)
+SOURCE_NAME_RE = re.compile(r'^[A-Za-z0-9_-]+\.(jpg|jpeg|png)$')
+
+FORMATS = {
+    'jpg': ('JPEG', 'image/jpeg'),
+    'webp': ('WEBP', 'image/webp'),
+}
+
+# Locks por arquivo de origem: [lock, quantos estão usando]; a entrada sai
+# do dicionário quando o último usuário termina
+_source_locks: Dict[str, list] = {}
+_source_locks_guard = threading.Lock()
+
+# Falhas recentes na origem (nome -> instante em que expiram), para que
+# pedidos repetidos de uma imagem inexistente não voltem à TMDB
+_misses: Dict[str, float] = {}
+_misses_lock = threading.Lock()
+MAX_MISSES = 10000
+
+
+class ImageNotFound(Exception):
+    """
+    A imagem não existe na origem (ou o nome/tamanho pedido é inválido)
+    """
+
+
+def spec_version() -> str:
+    """
+    Versão das variantes: muda quando a qualidade ou os tamanhos mudam, o que
+    gera novas URLs e invalida os caches dos navegadores
+    """
+    widths = sorted(all_widths())
+    raw = f'{settings.IMAGE_QUALITY}:{widths}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:8]
+
+
+def all_widths() -> set:
+    return {width for variant in settings.IMAGE_VARIANTS.values() for width in variant['widths']}
+
+
+def available_formats() -> List[str]:
+    """
+    Formatos gerados, do preferido ao de compatibilidade
+    """
+    if features is not None and features.check('webp'):
+        return ['webp', 'jpg']
+    return ['jpg']
+
+
+def cache_enabled() -> bool:
+    return settings.IMAGE_CACHE_ENABLED and Image is not None
+
+
+def source_name(path: Optional[str]) -> Optional[str]:
+    """
+    ``/abc.jpg`` -> ``abc.jpg``, ou None se não for um caminho da TMDB
+    """
+    name = (path or '').lstrip('/')
+    return name if SOURCE_NAME_RE.match(name) else None
+
+
+def tmdb_size(width: int) -> str:
+    """
+    Menor tamanho publicado pela TMDB que cobre ``width`` (fallback sem cache)
+    """
+    for size in (92, 154, 185, 300, 342, 500, 780, 1280):
+        if size >= width:
+            return f'w{size}'
+    return 'original'
+
+
+def variant_url(path: Optional[str], width: int, fmt: str = 'jpg') -> str:
+    """
+    URL de uma variante; sem o cache local, aponta para o tamanho equivalente
+    na TMDB
+    """
+    name = source_name(path)
+    if not name:
+        return ''
+    if not cache_enabled():
+        return f'{settings.TMDB_IMAGE_BASE_URL}{tmdb_size(width)}/{quote(name)}'
+    if fmt not in available_formats():
+        fmt = 'jpg'
+    return reverse('catalog:cached_image', kwargs={
+        'version': spec_version(), 'width': width, 'filename': f'{name}.{fmt}',
+    })
+
+
+def image_url(path: Optional[str], variant: str, fmt: str = 'jpg') -> str:
+    """
+    URL do maior tamanho de uma variante (card, detail, hero ou profile)
+    """
+    widths = settings.IMAGE_VARIANTS[variant]['widths']
+    return variant_url(path, max(widths), fmt)
+
+
+def image_srcset(path: Optional[str], variant: str, fmt: str = 'jpg') -> str:
+    if not source_name(path):
+        return ''
+    return ', '.join(
+        f'{variant_url(path, width, fmt)} {width}w'
+        for width in sorted(settings.IMAGE_VARIANTS[variant]['widths'])
+    )
+
+
+def image_sources(path: Optional[str], variant: str) -> Dict:
+    """
+    Dados de um ``<picture>``: um ``<source>`` por formato moderno e o
+    ``<img>`` de fallback em JPEG
+    """
+    formats = available_formats() if cache_enabled() else ['jpg']
+    return {
+        'sources': [
+            {'type': FORMATS[fmt][1], 'srcset': image_srcset(path, variant, fmt)}
+            for fmt in formats if fmt != 'jpg'
+        ],
+        'src': image_url(path, variant),
+        'srcset': image_srcset(path, variant),
+        'sizes': settings.IMAGE_VARIANTS[variant]['sizes'],
+    }
+
+
+@contextmanager
+def _source_lock(name: str):
+    with _source_locks_guard:
+        entry = _source_locks.setdefault(name, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _source_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _source_locks[name]
+
+
+def _recent_miss(name: str) -> bool:
+    expires = _misses.get(name)
+    return expires is not None and expires > time.monotonic()
+
+
+def _remember_miss(name: str):
+    now = time.monotonic()
+    with _misses_lock:
+        if len(_misses) >= MAX_MISSES:
+            for expired in [key for key, expires in _misses.items() if expires <= now]:
+                del _misses[expired]
+            if len(_misses) >= MAX_MISSES:
+                _misses.clear()
+        _misses[name] = now + settings.IMAGE_MISS_TTL
+
+
+def is_catalog_image(name: str) -> bool:
+    """
+    O arquivo é o poster/backdrop de um título ou a foto de uma pessoa do
+    catálogo (só esses são baixados e redimensionados sob demanda)
+    """
+    path = f'/{name}'
+    return (
+        Media.objects.filter(poster_path=path).exists()
+        or Media.objects.filter(backdrop_path=path).exists()
+        or Person.objects.filter(profile_path=path).exists()
+    )
+
+
+def _atomic_write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ImageCache:
+    """
+    Cache local das imagens da TMDB.
+
+    O original de cada ``poster_path``/``backdrop_path``/``profile_path`` é
+    baixado uma única vez da origem (``settings.IMAGE_ORIGIN``: URL ou
+    diretório local) e guardado em ``source/``; as variantes redimensionadas
+    ficam em ``<versão>/w<largura>/<arquivo>.<formato>``, espelhando a URL,
+    de modo que um servidor web pode servir o diretório diretamente.
+    """
+
+    def __init__(self, root: Optional[str] = None, origin: Optional[str] = None):
+        self.root = str(root or settings.IMAGE_CACHE_ROOT)
+        self.origin = origin or settings.IMAGE_ORIGIN
+        self.timeout = (settings.TMDB_CONNECT_TIMEOUT, settings.TMDB_READ_TIMEOUT)
+
+    def source_path(self, name: str) -> str:
+        return os.path.join(self.root, 'source', name)
+
+    def variant_path(self, name: str, width: int, fmt: str) -> str:
+        return os.path.join(self.root, spec_version(), f'w{width}', f'{name}.{fmt}')
+
+    def _download(self, name: str) -> bytes:
+        if not self.origin.startswith(('http://', 'https://')):
+            local_path = os.path.join(self.origin, name)
+            if not os.path.isfile(local_path):
+                raise ImageNotFound(name)
+            with open(local_path, 'rb') as source:
+                return source.read()
+        try:
+            response = requests.get(f"{self.origin.rstrip('/')}/{name}", timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise ImageNotFound(name) from e
+        if response.status_code != 200:
+            raise ImageNotFound(name)
+        return response.content
+
+    def source(self, name: str) -> bytes:
+        """
+        Original da imagem, baixado da origem só na primeira vez; uma falha
+        fica lembrada por ``IMAGE_MISS_TTL`` segundos
+        """
+        path = self.source_path(name)
+        if not os.path.exists(path):
+            if _recent_miss(name):
+                raise ImageNotFound(name)
+            with _source_lock(name):
+                if not os.path.exists(path):
+                    try:
+                        _atomic_write(path, self._download(name))
+                    except ImageNotFound:
+                        _remember_miss(name)
+                        raise
+        with open(path, 'rb') as source:
+            return source.read()
+
+    def render(self, data: bytes, width: int, fmt: str) -> bytes:
+        with Image.open(BytesIO(data)) as image:
+            image.load()
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.LANCZOS)
+            output = BytesIO()
+            if fmt == 'jpg':
+                image.convert('RGB').save(output, 'JPEG', quality=settings.IMAGE_QUALITY, optimize=True, progressive=True)
+            else:
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+                image.save(output, FORMATS[fmt][0], quality=settings.IMAGE_QUALITY, method=4)
+            return output.getvalue()
+
+    def variant(self, name: str, width: int, fmt: str, catalog_only: bool = False) -> str:
+        """
+        Caminho da variante no disco, gerando-a se ainda não existir; com
+        ``catalog_only``, só gera variantes de imagens do catálogo
+        (``is_catalog_image``), as demais são ImageNotFound
+        """
+        if not SOURCE_NAME_RE.match(name) or width not in all_widths() or fmt not in available_formats():
+            raise ImageNotFound(name)
+        path = self.variant_path(name, width, fmt)
+        if not os.path.exists(path):
+            if _recent_miss(name) or (catalog_only and not is_catalog_image(name)):
+                raise ImageNotFound(name)
+            try:
+                _atomic_write(path, self.render(self.source(name), width, fmt))
+            except (OSError, ValueError) as e:  # arquivo da origem corrompido ou não é imagem
+                raise ImageNotFound(name) from e
+        return path
+
+    def warm(self, path: Optional[str], variant: str) -> int:
+        """
+        Gera todas as variantes de uma imagem; retorna quantas foram criadas
+        """
+        name = source_name(path)
+        if not name:
+            return 0
+        created = 0
+        for width in settings.IMAGE_VARIANTS[variant]['widths']:
+            for fmt in available_formats():
+                if not os.path.exists(self.variant_path(name, width, fmt)):
+                    self.variant(name, width, fmt)
+                    created += 1
+        return created
+
+    def clear_versions(self) -> int:
+        """
+        Remove as variantes de versões antigas; retorna quantos diretórios
+        foram apagados
+        """
+        removed = 0
+        current = spec_version()
+        if not os.path.isdir(self.root):
+            return 0
+        for entry in os.listdir(self.root):
+            if entry not in ('source', current) and os.path.isdir(os.path.join(self.root, entry)):
+                shutil.rmtree(os.path.join(self.root, entry))
+                removed += 1
+        return removed
+
+
+_image_cache = None
+
+
+def get_image_cache() -> ImageCache:
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
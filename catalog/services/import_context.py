@@ -0,0 +1,61 @@
+from typing import Iterable, List, Optional
+
+from catalog.models import Media, Genre
+
+
+class ImportContext:
+    """
+    Mapas carregados uma vez por execução de importação, para que o laço
+    principal não precise consultar o banco a cada título:
+
+    - ``genre_pks``: tmdb_id do gênero -> pk
+    - ``existing``: tmdb_ids de Media já gravados (atualizado a cada lote)
+    - ``seen``: tmdb_ids já encaminhados nesta execução (fases sobrepostas)
+
+    ``held_ids`` restringe ``existing`` aos títulos gravados que a execução
+    vai tocar (ex.: os que a sincronização atualiza) e garante que ninguém
+    mais está gravado; sem ele, todos os tmdb_ids de Media são carregados já
+    no construtor (nenhum outro método consulta o banco, então o contexto
+    pode ser usado de código assíncrono depois de criado).
+    """
+
+    def __init__(self, held_ids: Optional[Iterable[int]] = None):
+        self.reload_genres()
+        if held_ids is not None:
+            self.existing = set(held_ids)
+        else:
+            # tmdb_id é único em Media (filmes e séries), como no upsert do writer
+            self.existing = set(Media.objects.values_list('tmdb_id', flat=True))
+        self.seen = set()
+
+    def reload_genres(self):
+        self.genre_pks = dict(Genre.objects.exclude(tmdb_id=None).values_list('tmdb_id', 'id'))
+
+    def genre_ids(self, tmdb_genre_ids: Iterable[int]) -> List[int]:
+        """
+        Converte IDs TMDB de gêneros em pks (gêneros desconhecidos são ignorados)
+        """
+        return [self.genre_pks[genre_id] for genre_id in set(tmdb_genre_ids) if genre_id in self.genre_pks]
+
+    def is_known(self, tmdb_id: int) -> bool:
+        return tmdb_id in self.existing or tmdb_id in self.seen
+
+    def claim(self, tmdb_id: int) -> bool:
+        """
+        Retorna True (e marca como visto) se o título ainda não existe nem
+        foi encaminhado nesta execução
+        """
+        if not tmdb_id or self.is_known(tmdb_id):
+            return False
+        self.seen.add(tmdb_id)
+        return True
+
+    def mark_existing(self, tmdb_ids: Iterable[int]):
+        self.existing.update(tmdb_ids)
+
+    def forget(self, tmdb_ids: Iterable[int]):
+        """
+        Libera títulos reivindicados cuja gravação falhou, para que uma fase
+        seguinte possa tentar de novo
+        """
+        self.seen.difference_update(tmdb_ids)
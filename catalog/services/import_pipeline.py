@@ -0,0 +1,144 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Optional
+
+from services.metrics import get_import_metrics
+
+
+class PhaseStats:
+    """
+    Contadores de throughput de uma fase da importação
+
+    O tempo de gravação no banco da fase vem do timer ``db_write`` das
+    métricas do processo (as fases de um comando rodam em sequência).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.titles = 0
+        self.created = 0
+        self.unchanged = 0  # existentes cujo conteúdo não mudou (não regravados)
+        self.requests = 0
+        self.errors = 0
+        self._db_started = get_import_metrics().total_seconds('db_write')
+        self._db_seconds = None
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+        self._db_seconds = self.db_seconds
+
+    @property
+    def db_seconds(self) -> float:
+        if self._db_seconds is not None:
+            return self._db_seconds
+        return get_import_metrics().total_seconds('db_write') - self._db_started
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.monotonic()
+        return end - self.started_at
+
+    @property
+    def titles_per_second(self) -> float:
+        return self.titles / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        unchanged = f', {self.unchanged} sem alterações' if self.unchanged else ''
+        return (
+            f'{self.name}: {self.titles} títulos ({self.created} novos{unchanged}) em {self.elapsed:.1f}s '
+            f'- {self.titles_per_second:.1f} títulos/s, {self.requests} requisições, {self.errors} erros, '
+            f'{self.db_seconds:.1f}s gravando no banco'
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'titles': self.titles,
+            'created': self.created,
+            'unchanged': self.unchanged,
+            'requests': self.requests,
+            'errors': self.errors,
+            'elapsed': round(self.elapsed, 3),
+            'titles_per_second': round(self.titles_per_second, 2),
+            'db_seconds': round(self.db_seconds, 3),
+        }
+
+
+class FetchPipeline:
+    """
+    Executa buscas na API em um pool de threads limitado e entrega os
+    resultados para um único estágio de escrita (a thread que chama).
+
+    As funções de busca rodam nas threads do pool e não devem tocar no banco.
+    Os callbacks de escrita rodam sempre na thread chamadora, então todas as
+    escritas no banco passam por uma única conexão. O número de buscas em
+    andamento é limitado por ``max_pending``: ``submit`` bloqueia drenando
+    resultados até haver espaço, o que mantém a memória estável.
+
+    Por padrão as buscas rodam em threads; ``executor`` permite outro pool
+    (ex.: ProcessFetchPool, com funções de busca importáveis pelos filhos).
+    """
+
+    def __init__(self, workers: int = 4, max_pending: Optional[int] = None, executor=None):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = executor or ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tmdb-fetch')
+        self._pending: Dict = {}
+        self._in_callback = False
+
+    def submit(self, fetch: Callable, *args, on_result: Callable, on_error: Optional[Callable] = None):
+        """
+        Agenda ``fetch(*args)`` no pool; ``on_result(resultado)`` é chamado na
+        thread de escrita quando a busca terminar.
+
+        Submissões feitas de dentro de um callback não bloqueiam (o estágio de
+        escrita não pode esperar por si mesmo); o excesso fica limitado ao que
+        um único resultado pode gerar.
+        """
+        if not self._in_callback:
+            while len(self._pending) >= self.max_pending:
+                self._drain(FIRST_COMPLETED)
+        future = self._executor.submit(fetch, *args)
+        self._pending[future] = (on_result, on_error)
+        return future
+
+    def _drain(self, return_when):
+        done, _ = wait(list(self._pending), return_when=return_when)
+        for future in done:
+            on_result, on_error = self._pending.pop(future)
+            self._in_callback = True
+            try:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(e)
+                else:
+                    on_result(result)
+            finally:
+                self._in_callback = False
+
+    def join(self):
+        """
+        Espera todas as buscas pendentes (inclusive as geradas por callbacks)
+        """
+        while self._pending:
+            self._drain(FIRST_COMPLETED)
+
+    def shutdown(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.join()
+        self.shutdown()
+        return False
@@ -0,0 +1,92 @@
+import multiprocessing
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import django
+
+from services.metrics import get_import_metrics
+from services.rate_limiter import TokenBucket, use_tmdb_rate_limiter
+
+# Este módulo é importado pelos processos filhos antes do django.setup(), por
+# isso não importa models no topo; as tarefas ficam em import_tasks.
+
+_worker_threads = None
+
+
+def init_worker(rate_limiter: TokenBucket, cache_mode: str, replay_options: Dict, threads: int):
+    """
+    Prepara um processo filho: Django (com a própria conexão ao banco), o
+    limitador de taxa compartilhado e um cliente TMDB próprio
+    """
+    global _worker_threads
+    django.setup()
+    use_tmdb_rate_limiter(rate_limiter)
+
+    # Só depois do django.setup(): o cliente importa os models
+    from services.tmdb_replay import configure_replay
+    from services.tmdb_service import get_tmdb_service
+
+    service = get_tmdb_service()
+    service.cache_mode = cache_mode
+    configure_replay(service, replay_options)
+    _worker_threads = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix='tmdb-fetch')
+
+
+def worker_threads() -> Optional[ThreadPoolExecutor]:
+    """
+    Threads de busca do processo filho atual
+    """
+    return _worker_threads
+
+
+def _run_task(fn: Callable, args):
+    result = fn(*args)
+    # As métricas do filho seguem junto com o resultado para o relatório
+    return result, get_import_metrics().drain()
+
+
+class ProcessFetchPool:
+    """
+    Pool de processos para o FetchPipeline.
+
+    Cada processo tem sua conexão ao banco, seu cliente TMDB e ``threads``
+    threads de busca; todos consomem o mesmo orçamento de requisições via
+    ``rate_limiter`` (um SharedTokenBucket). As funções submetidas devem ser
+    de módulo (importáveis pelos filhos) e os resultados, serializáveis.
+    """
+
+    def __init__(self, processes: int, threads: int, rate_limiter: TokenBucket,
+                 cache_mode: str, replay_options: Optional[Dict] = None, context=None):
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context or multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(rate_limiter, cache_mode, replay_options or {}, threads),
+        )
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        task = self._executor.submit(_run_task, fn, args)
+
+        def task_done(task):
+            try:
+                result, metrics = task.result()
+            except BaseException as e:
+                result, metrics, error = None, None, e
+            else:
+                error = None
+                get_import_metrics().merge(metrics)
+            try:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            except InvalidStateError:  # cancelado pelo pipeline
+                pass
+
+        task.add_done_callback(task_done)
+        future.add_done_callback(lambda future: future.cancelled() and task.cancel())
+        return future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
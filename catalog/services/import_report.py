@@ -0,0 +1,123 @@
+import json
+import threading
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+
+from services.metrics import get_import_metrics
+
+
+class RunReport:
+    """
+    Relatório de uma execução de importação: as fases (PhaseStats) e as
+    métricas do processo (requisições à TMDB por endpoint, tempo de gravação
+    no banco). Grava um JSON no fim e, opcionalmente, uma linha JSON com o
+    estado parcial a cada ``interval`` segundos.
+    """
+
+    def __init__(self, command: str, options: Optional[Dict] = None, path: Optional[str] = None,
+                 snapshots_path: Optional[str] = None, interval: float = 10.0):
+        self.command = command
+        self.options = options or {}
+        self.path = path
+        self.snapshots_path = snapshots_path
+        self.interval = interval
+        self.metrics = get_import_metrics()
+        self.phases: List = []
+        self.started_at = None
+        self.status = 'running'
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.metrics.reset()
+        self.started_at = timezone.now()
+        if self.snapshots_path and self.interval > 0:
+            self._thread = threading.Thread(target=self._stream, name='import-report', daemon=True)
+            self._thread.start()
+        return self
+
+    def add_phase(self, stats):
+        self.phases.append(stats)
+
+    def snapshot(self) -> Dict:
+        return {
+            'command': self.command,
+            'status': self.status,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'options': self.options,
+            'phases': [stats.to_dict() for stats in list(self.phases)],
+            'tmdb': self.metrics.snapshot(),
+        }
+
+    def _stream(self):
+        while not self._stop.wait(self.interval):
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        with open(self.snapshots_path, 'a', encoding='utf-8') as snapshots:
+            snapshots.write(json.dumps(self.snapshot(), ensure_ascii=False, default=str) + '\n')
+
+    def finish(self, status: str = 'finished') -> Dict:
+        """
+        Encerra os snapshots periódicos e grava o relatório final
+        """
+        self.status = status
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._write_snapshot()
+        report = self.snapshot()
+        if self.path:
+            with open(self.path, 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2, default=str)
+        return report
+
+    def endpoint_lines(self) -> List[str]:
+        """
+        Resumo legível das requisições por endpoint
+        """
+        lines = []
+        for label, stats in self.metrics.snapshot()['endpoints'].items():
+            latency = stats['latency']
+            lines.append(
+                f'{label}: {stats["requests"]} requisições, p50 {latency["p50_ms"]:.0f}ms, '
+                f'p95 {latency["p95_ms"]:.0f}ms, p99 {latency["p99_ms"]:.0f}ms, '
+                f'{stats["bytes"] / 1024:.0f} KiB, {stats["retries"]} novas tentativas, '
+                f'{stats["errors"]} erros, {stats["cache_hits"]} do cache'
+            )
+        return lines
+
+
+def add_report_arguments(parser):
+    """
+    Opções de relatório compartilhadas pelos comandos de importação
+    """
+    parser.add_argument(
+        '--report',
+        metavar='ARQUIVO',
+        help='Gravar um relatório JSON da execução (latência por endpoint, erros, tempo de banco, fases)'
+    )
+    parser.add_argument(
+        '--report-snapshots',
+        metavar='ARQUIVO',
+        help='Acrescentar a este arquivo uma linha JSON com o estado parcial a cada --report-interval segundos'
+    )
+    parser.add_argument(
+        '--report-interval',
+        type=float,
+        default=10.0,
+        help='Intervalo entre snapshots do relatório, em segundos (default: 10)'
+    )
+
+
+def start_report(command: str, options: Dict, run_options: Optional[Dict] = None) -> RunReport:
+    """
+    Cria e inicia o relatório a partir das opções de ``add_report_arguments``
+    """
+    return RunReport(
+        command, run_options,
+        path=options.get('report'),
+        snapshots_path=options.get('report_snapshots'),
+        interval=options.get('report_interval') or 10.0,
+    ).start()
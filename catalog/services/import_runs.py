@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+
+from django.utils import timezone
+
+from catalog.models import ImportRun, ImportCursor
+
+
+def start_run(command: str, options: Dict, resume: bool = False) -> ImportRun:
+    """
+    Retoma a última execução não concluída de ``command`` (se ``resume``)
+    ou registra uma nova
+    """
+    if resume:
+        run = ImportRun.objects.filter(command=command).exclude(status='finished').first()
+        if run is not None:
+            run.status = 'running'
+            run.finished_at = None
+            run.save(update_fields=['status', 'finished_at'])
+            return run
+    return ImportRun.objects.create(command=command, options=options)
+
+
+def finish_run(run: ImportRun, status: str = 'finished'):
+    """
+    ``'partial'`` quando alguma página não foi gravada: o cursor parou nela e
+    a execução continua disponível para ``--resume``
+    """
+    run.status = status
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'finished_at'])
+
+
+class PhaseCursor:
+    """
+    Cursor de uma fase paginada.
+
+    As páginas podem terminar fora de ordem (várias threads buscando); o
+    cursor só avança até a maior página contígua já concluída, então uma
+    retomada nunca pula trabalho. Uma página está concluída quando foi
+    gravada e não tem mais títulos pendentes (por exemplo, detalhes ainda
+    não gravados).
+    """
+
+    def __init__(self, run: ImportRun, phase: str):
+        self.cursor, _ = ImportCursor.objects.get_or_create(run=run, phase=phase)
+        self.committed = self.cursor.page
+        self._outstanding = {}
+
+    @property
+    def start_page(self) -> int:
+        return self.committed + 1
+
+    def page_written(self, page: int, outstanding: int = 0):
+        """
+        Marca a página como gravada, com ``outstanding`` títulos ainda pendentes
+        """
+        self._outstanding[page] = self._outstanding.get(page, 0) + outstanding
+
+    def release(self, page: Optional[int], count: int = 1):
+        """
+        Marca ``count`` títulos pendentes da página como concluídos
+        """
+        if page in self._outstanding:
+            self._outstanding[page] -= count
+
+    def save(self):
+        """
+        Avança e grava o cursor; chame dentro da transação do lote
+        """
+        page = self.committed
+        while self._outstanding.get(page + 1, -1) == 0:
+            page += 1
+            del self._outstanding[page]
+        if page != self.committed:
+            self.committed = page
+            ImportCursor.objects.filter(pk=self.cursor.pk).update(page=page, updated_at=timezone.now())
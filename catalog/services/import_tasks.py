@@ -0,0 +1,66 @@
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from catalog.services.import_processes import worker_threads
+from catalog.services.media_writer import MediaBatchWriter
+from services.tmdb_planner import FetchPlanner
+from services.tmdb_service import get_tmdb_service
+
+# Tarefas de busca da importação. Rodam nas threads do FetchPipeline ou nos
+# processos do ProcessFetchPool, sempre com o cliente TMDB do processo.
+
+
+class PageUnavailable(Exception):
+    """
+    A página da listagem não veio nem depois das novas tentativas
+    """
+
+
+def fetch_listing(method: str, page: int) -> List[Dict]:
+    """
+    Buscar uma página de uma listagem (``method`` do TMDBService); levanta
+    PageUnavailable se não houver resposta, para que a página conte como
+    falha e o cursor da fase não passe dela
+    """
+    response = getattr(get_tmdb_service(), method)(page=page)
+    if response is None:
+        raise PageUnavailable(f'{method} página {page}: sem resposta da TMDB após novas tentativas')
+    if isinstance(response, dict):
+        return response.get('results', [])
+    return response
+
+
+def _fetch_one(planner: FetchPlanner, media_type: str, tmdb_id: int) -> Tuple[Optional[Dict], Optional[str]]:
+    try:
+        return planner.fetch(media_type, tmdb_id), None
+    except Exception as e:
+        return None, str(e)
+
+
+def fetch_details(media_type: str, tmdb_ids: List[int]) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Buscar os detalhes de vários títulos nas threads do processo filho;
+    retorna ``(tmdb_id, detalhes, erro)`` por título
+    """
+    planner = FetchPlanner(get_tmdb_service())
+    results = worker_threads().map(partial(_fetch_one, planner, media_type), tmdb_ids)
+    return [(tmdb_id, details, error) for tmdb_id, (details, error) in zip(tmdb_ids, results)]
+
+
+def import_details(media_type: str, titles: List[Dict]) -> Tuple[List[int], List[Tuple[int, str]]]:
+    """
+    Buscar e gravar, no próprio processo e em uma transação, os detalhes de
+    um lote de títulos (bancos com escritores concorrentes). Títulos sem
+    detalhes são gravados com os dados da listagem.
+
+    Retorna os tmdb_ids criados e os ``(tmdb_id, erro)`` que falharam.
+    """
+    listing = {data['id']: data for data in titles}
+    writer = MediaBatchWriter(batch_size=None)
+    failed = []
+    for tmdb_id, details, error in fetch_details(media_type, list(listing)):
+        if not details:
+            failed.append((tmdb_id, error or 'detalhes indisponíveis após novas tentativas'))
+        writer.add(details or listing[tmdb_id], media_type)
+    result = writer.flush()
+    return sorted(result.created), failed
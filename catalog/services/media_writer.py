@@ -0,0 +1,289 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from django.db import transaction
+from django.utils import timezone
+
+from catalog.models import Media, Genre
+from catalog.services.credits import credits_digest, sync_credits
+from catalog.services.text import search_key
+from services.metrics import get_import_metrics
+
+def parse_date(value: Optional[str]):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def media_fields(data: Dict, media_type: str) -> Dict:
+    """
+    Converte um título da TMDB (listagem ou detalhes) nos campos de Media
+    """
+    if media_type == 'movie':
+        title = data.get('title') or ''
+        original_title = data.get('original_title') or ''
+        release_date = data.get('release_date')
+    else:  # tv
+        title = data.get('name') or data.get('title') or ''
+        original_title = data.get('original_name') or data.get('original_title') or ''
+        release_date = data.get('first_air_date')
+
+    fields = {
+        'title': title[:200],
+        'original_title': original_title[:200],
+        'title_key': search_key(title)[:200],
+        'original_title_key': search_key(original_title)[:200],
+        'overview': data.get('overview') or '',
+        'release_date': parse_date(release_date),
+        'poster_path': data.get('poster_path') or '',
+        'backdrop_path': data.get('backdrop_path') or '',
+        'media_type': media_type,
+        'vote_average': data.get('vote_average') or 0,
+        'vote_count': data.get('vote_count') or 0,
+        'popularity': data.get('popularity') or 0,
+        'original_language': data.get('original_language') or '',
+    }
+
+    if 'runtime' in data or 'episode_run_time' in data:
+        fields['runtime'] = data.get('runtime') or (data.get('episode_run_time') or [None])[0]
+    if media_type == 'tv' and 'number_of_seasons' in data:
+        fields['number_of_seasons'] = data.get('number_of_seasons')
+        fields['number_of_episodes'] = data.get('number_of_episodes')
+    return fields
+
+
+def genre_tmdb_ids(data: Dict) -> Optional[List[int]]:
+    """
+    IDs TMDB dos gêneros do título, ou None se a resposta não traz gêneros
+    """
+    if 'genres' in data:
+        return [g['id'] for g in data['genres']]
+    if 'genre_ids' in data:
+        return list(data['genre_ids'])
+    return None
+
+
+def content_hash(fields: Dict, genre_ids: Optional[List[int]]) -> str:
+    """
+    Hash do conteúdo normalizado de um título (campos de Media e gêneros)
+    """
+    normalized = [sorted(fields.items()), sorted(set(genre_ids)) if genre_ids is not None else None]
+    return hashlib.sha1(json.dumps(normalized, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+def is_complete(fields: Dict) -> bool:
+    """
+    Campos vindos dos detalhes (e não de uma listagem, que não traz a duração)
+    """
+    return 'runtime' in fields
+
+
+class FlushResult:
+    """
+    Resultado da gravação de um lote
+    """
+
+    def __init__(self, ids: Dict[int, int], created: Set[int], unchanged: Set[int] = frozenset()):
+        self.ids = ids  # tmdb_id -> pk
+        self.created = created  # tmdb_ids inseridos (não existiam antes)
+        self.unchanged = unchanged  # tmdb_ids existentes sem nenhuma mudança (não regravados)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class MediaBatchWriter:
+    """
+    Acumula títulos da TMDB e grava em lote: um upsert de Media
+    (``bulk_create`` com ``update_conflicts``), as linhas de ``media_genres``
+    e os créditos, tudo na mesma transação.
+
+    Títulos que já existem são comparados pelo hash do conteúdo normalizado
+    (``content_hash``/``credits_hash``): sem mudança, nada é gravado; com
+    mudança, só as colunas alteradas, e gêneros/créditos apenas se mudaram.
+    Assim o custo de uma atualização acompanha o volume de mudanças reais.
+
+    Com um ImportContext, os gêneros e os títulos existentes vêm dos mapas em
+    memória em vez de consultas a cada lote.
+    """
+
+    def __init__(self, batch_size: Optional[int] = 200, context=None):
+        self.batch_size = batch_size
+        self.context = context
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, data: Dict, media_type: str) -> Optional[FlushResult]:
+        """
+        Enfileira um título; grava o lote (e retorna o resultado) quando ele
+        atinge ``batch_size``. Com ``batch_size=None`` só grava em ``flush``.
+        """
+        tmdb_id = data.get('id')
+        if not tmdb_id:
+            return None
+        self.pending[tmdb_id] = (
+            media_fields(data, media_type),
+            genre_tmdb_ids(data),
+            data.get('credits'),
+        )
+        if self.batch_size and len(self.pending) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> FlushResult:
+        pending, self.pending = self.pending, {}
+        if not pending:
+            return FlushResult({}, set())
+
+        tmdb_ids = list(pending)
+        metrics = get_import_metrics()
+        with metrics.timer('db_write'), transaction.atomic():
+            stored = self._stored_hashes(tmdb_ids)
+            now = timezone.now()
+            new, changed = {}, {}
+            for tmdb_id, (fields, genre_ids, credits_data) in pending.items():
+                hashes = (
+                    content_hash(fields, genre_ids),
+                    credits_digest(credits_data) if credits_data is not None else None,
+                )
+                if tmdb_id not in stored:
+                    new[tmdb_id] = hashes
+                elif hashes[0] != stored[tmdb_id][1] or hashes[1] not in (None, stored[tmdb_id][2]):
+                    changed[tmdb_id] = hashes
+
+            self._create(pending, new, now)
+            ids = {tmdb_id: row[0] for tmdb_id, row in stored.items()}
+            if new:
+                ids.update(Media.objects.filter(tmdb_id__in=list(new)).values_list('tmdb_id', 'id'))
+            touched = self._update(pending, changed, stored, ids, now)
+
+            # Gêneros e créditos só dos títulos novos ou com mudanças neles
+            self._write_genres({tmdb_id: pending[tmdb_id] for tmdb_id in list(new) + touched['genres']}, ids)
+            sync_credits(
+                (ids[tmdb_id], pending[tmdb_id][2])
+                for tmdb_id in list(new) + touched['credits']
+                if pending[tmdb_id][2] is not None and tmdb_id in ids
+            )
+
+        unchanged = set(stored) - set(touched['rows'])
+        metrics.increment('titles_written', len(new) + len(touched['rows']))
+        metrics.increment('titles_unchanged', len(unchanged))
+        if self.context is not None:
+            self.context.mark_existing(ids)
+        return FlushResult(ids, set(new), unchanged)
+
+    def _stored_hashes(self, tmdb_ids):
+        """
+        tmdb_id -> (pk, content_hash, credits_hash) dos títulos já gravados
+        """
+        if self.context is not None:
+            tmdb_ids = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id in self.context.existing]
+            if not tmdb_ids:
+                return {}
+        rows = Media.objects.filter(tmdb_id__in=tmdb_ids).values_list('tmdb_id', 'id', 'content_hash', 'credits_hash')
+        return {tmdb_id: (pk, fields_hash, credits_hash) for tmdb_id, pk, fields_hash, credits_hash in rows}
+
+    def _create(self, pending, new, now):
+        # Um upsert por conjunto de campos, para que dados de listagem não
+        # apaguem campos que só vêm nos detalhes (outro processo pode ter
+        # gravado o título depois da leitura dos hashes)
+        groups = {}
+        for tmdb_id, (fields_hash, credits_hash) in new.items():
+            fields = pending[tmdb_id][0]
+            groups.setdefault(tuple(sorted(fields)), []).append(Media(
+                tmdb_id=tmdb_id, created_at=now, updated_at=now,
+                content_hash=fields_hash, credits_hash=credits_hash or '', **fields
+            ))
+        for field_names, objs in groups.items():
+            Media.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['tmdb_id'],
+                update_fields=list(field_names) + ['content_hash', 'credits_hash', 'updated_at'],
+            )
+
+    def _update(self, pending, changed, stored, ids, now):
+        """
+        Regrava só as colunas que mudaram dos títulos cujo hash mudou; sem
+        mudança real a linha não é tocada (``updated_at`` fica como está)
+        """
+        touched = {'rows': [], 'genres': [], 'credits': []}
+        if not changed:
+            return touched
+        pks = [ids[tmdb_id] for tmdb_id in changed]
+        names = sorted({name for tmdb_id in changed for name in pending[tmdb_id][0]})
+        current = {row['id']: row for row in Media.objects.filter(pk__in=pks).values('id', *names)}
+        genre_pks = self._genre_pks(
+            genre_id for tmdb_id in changed for genre_id in (pending[tmdb_id][1] or [])
+        )
+        current_genres = {}
+        for media_id, genre_pk in Media.genres.through.objects.filter(media_id__in=pks).values_list('media_id', 'genre_id'):
+            current_genres.setdefault(media_id, set()).add(genre_pk)
+
+        groups = {}
+        for tmdb_id, (fields_hash, credits_hash) in changed.items():
+            fields, genre_ids, _ = pending[tmdb_id]
+            pk = ids[tmdb_id]
+            row = current.get(pk)
+            if row is None:  # removido por outro processo no meio do lote
+                continue
+            update = {name: value for name, value in fields.items() if row[name] != value}
+            if genre_ids is not None:
+                wanted = {genre_pks[genre_id] for genre_id in genre_ids if genre_id in genre_pks}
+                if wanted != current_genres.get(pk, set()):
+                    touched['genres'].append(tmdb_id)
+            if credits_hash is not None and credits_hash != stored[tmdb_id][2]:
+                touched['credits'].append(tmdb_id)
+                update['credits_hash'] = credits_hash
+
+            real_change = update or tmdb_id in touched['genres']
+            if real_change:
+                touched['rows'].append(tmdb_id)
+                update['updated_at'] = now
+            if real_change or is_complete(fields):
+                # Sem mudança real, só os detalhes fixam o novo hash (o de uma
+                # listagem substituiria o dos detalhes a cada execução)
+                update['content_hash'] = fields_hash
+            if update:
+                groups.setdefault(tuple(sorted(update)), []).append(Media(pk=pk, **update))
+
+        for field_names, objs in groups.items():
+            Media.objects.bulk_update(objs, list(field_names), batch_size=500)
+        return touched
+
+    def _write_genres(self, pending, ids):
+        with_genres = {
+            ids[tmdb_id]: genre_ids
+            for tmdb_id, (_, genre_ids, _) in pending.items()
+            if genre_ids is not None and tmdb_id in ids
+        }
+        if not with_genres:
+            return
+        genre_pks = self._genre_pks(genre_id for genre_ids in with_genres.values() for genre_id in genre_ids)
+
+        Through = Media.genres.through
+        Through.objects.filter(media_id__in=list(with_genres)).delete()
+        Through.objects.bulk_create(
+            [
+                Through(media_id=media_id, genre_id=genre_pks[genre_id])
+                for media_id, genre_ids in with_genres.items()
+                for genre_id in set(genre_ids)
+                if genre_id in genre_pks
+            ],
+            ignore_conflicts=True,
+        )
+
+    def _genre_pks(self, tmdb_genre_ids) -> Dict[int, int]:
+        """
+        tmdb_id do gênero -> pk (do ImportContext, se houver)
+        """
+        if self.context is not None:
+            return self.context.genre_pks
+        return dict(Genre.objects.filter(tmdb_id__in=set(tmdb_genre_ids)).values_list('tmdb_id', 'id'))
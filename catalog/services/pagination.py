@@ -0,0 +1,224 @@
+from typing import List, Optional, Sequence
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+CURSOR_SALT = 'catalog.pagination'
+
+
+class InvalidCursor(Exception):
+    """
+    Cursor adulterado, de outra ordenação ou de outra listagem
+    """
+
+
+def encode_cursor(data: dict) -> str:
+    """
+    Cursor opaco (assinado: o cliente não consegue montar nem alterar um)
+    """
+    return signing.dumps(data, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token: str) -> dict:
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursor(token)
+    if not isinstance(data, dict):
+        raise InvalidCursor(token)
+    return data
+
+
+class KeysetPage:
+    """
+    Página de uma listagem por cursor, com a interface que os templates usam
+    (``has_next``, ``has_previous``, ``number``...)
+    """
+
+    def __init__(self, object_list: List, number: int, next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.object_list = object_list
+        self.number = number
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginação por (coluna de ordenação, id): cada página continua a partir do
+    último título da anterior (``WHERE (coluna, id) < (valor, id)``) em vez de
+    ``OFFSET``, então a página 500 custa o mesmo que a primeira quando há um
+    índice na ordenação, e não há ``COUNT(*)``.
+
+    NULL conta como o menor valor (o que o SQLite já faz): fica por último em
+    ordem decrescente e primeiro em ordem crescente.
+    """
+
+    def __init__(self, queryset, ordering: str, per_page: int):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.descending = ordering.startswith('-')
+        self.field = ordering.lstrip('-')
+        self.model_field = queryset.model._meta.get_field(self.field)
+
+    def order_by(self, descending: bool):
+        if descending:
+            return [F(self.field).desc(nulls_last=True), F('pk').desc()]
+        return [F(self.field).asc(nulls_first=True), F('pk').asc()]
+
+    def after(self, value, pk, descending: bool) -> List[Q]:
+        """
+        Linhas depois de (value, pk) na ordem dada, em trechos consecutivos
+        (valores e NULLs separados): cada trecho é um intervalo simples do
+        índice, sem um ``OR ... IS NULL`` que obrigaria a percorrê-lo desde o
+        começo
+        """
+        field = self.field
+        if value is None:
+            if descending:
+                return [Q(**{f'{field}__isnull': True, 'pk__lt': pk})]
+            return [Q(**{f'{field}__isnull': True, 'pk__gt': pk}), Q(**{f'{field}__isnull': False})]
+        if descending:
+            segments = [Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(pk__lt=pk))]
+            if self.model_field.null:
+                segments.append(Q(**{f'{field}__isnull': True}))
+            return segments
+        return [Q(**{f'{field}__gte': value}) & (Q(**{f'{field}__gt': value}) | Q(pk__gt=pk))]
+
+    def cursor(self, obj, direction: str, number: int) -> str:
+        value = getattr(obj, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return encode_cursor({'o': self.ordering, 'v': value, 'k': obj.pk, 'd': direction, 'n': number})
+
+    def page(self, token: Optional[str] = None) -> KeysetPage:
+        """
+        Página do cursor (a primeira sem cursor); levanta InvalidCursor
+        """
+        if not token:
+            return self._page(None, 'next', 1)
+        data = decode_cursor(token)
+        if data.get('o') != self.ordering or data.get('d') not in ('next', 'prev'):
+            raise InvalidCursor(token)
+        try:
+            value = None if data['v'] is None else self.model_field.to_python(data['v'])
+            return self._page((value, int(data['k'])), data['d'], max(1, int(data['n'])))
+        except (KeyError, TypeError, ValueError, ValidationError) as error:
+            raise InvalidCursor(token) from error
+
+    def _page(self, position, direction: str, number: int) -> KeysetPage:
+        # Voltar uma página é andar para trás na ordem invertida
+        descending = self.descending if direction == 'next' else not self.descending
+        queryset = self.queryset.order_by(*self.order_by(descending))
+        if position is None:
+            rows = list(queryset[:self.per_page + 1])
+        else:
+            rows = []
+            for segment in self.after(*position, descending):
+                rows += queryset.filter(segment)[:self.per_page + 1 - len(rows)]
+                if len(rows) > self.per_page:
+                    break
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'next':
+            has_next, has_previous = more, position is not None
+        else:
+            rows.reverse()
+            has_next, has_previous = True, more
+        if not rows:
+            return KeysetPage([], number, None, None)
+        return KeysetPage(
+            rows,
+            number,
+            self.cursor(rows[-1], 'next', number + 1) if has_next else None,
+            self.cursor(rows[0], 'prev', number - 1) if has_previous else None,
+        )
+
+
+class RankedPaginator:
+    """
+    Paginação de uma lista de pks já ordenada (a busca por relevância, que
+    tem no máximo algumas centenas de resultados): o cursor guarda a posição
+    na lista, e cada página busca só os seus pks
+    """
+
+    ordering = 'relevance'
+
+    def __init__(self, queryset, ids: Sequence[int], per_page: int):
+        self.queryset = queryset
+        self.ids = list(ids)
+        self.per_page = per_page
+
+    def page(self, token: Optional[str] = None) -> KeysetPage:
+        start = 0
+        if token:
+            data = decode_cursor(token)
+            if data.get('o') != self.ordering:
+                raise InvalidCursor(token)
+            try:
+                start = max(0, int(data['i']))
+            except (KeyError, TypeError, ValueError) as error:
+                raise InvalidCursor(token) from error
+        number = start // self.per_page + 1
+        ids = self.ids[start:start + self.per_page]
+        objects = self.queryset.in_bulk(ids)
+        rows = [objects[pk] for pk in ids if pk in objects]
+        has_next = start + self.per_page < len(self.ids)
+        return KeysetPage(
+            rows,
+            number,
+            encode_cursor({'o': self.ordering, 'i': start + self.per_page}) if has_next else None,
+            encode_cursor({'o': self.ordering, 'i': max(0, start - self.per_page)}) if start > 0 else None,
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    ListView paginada por cursor (``?cursor=``) em vez de ``?page=``; a view
+    define a ordenação em ``self.ordering_key`` (e, para uma lista de pks já
+    ordenada, ``self.ranked_ids``) no ``get_queryset``
+    """
+    cursor_param = 'cursor'
+    ordering_key = '-popularity'
+    ranked_ids = None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        if self.ranked_ids is not None:
+            return RankedPaginator(queryset, self.ranked_ids, per_page)
+        return KeysetPaginator(queryset, self.ordering_key, per_page)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_param))
+        except InvalidCursor:
+            page = paginator.page(None)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def is_first_page(self) -> bool:
+        return not self.request.GET.get(self.cursor_param)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop(self.cursor_param, None)
+        params.pop('page', None)
+        context['pagination_query'] = params.urlencode()
+        return context
@@ -0,0 +1,292 @@
+import math
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+from catalog.models import Media
+from catalog.services.text import prefix_range, search_key
+
+# Palavras da busca (letras/dígitos em qualquer alfabeto)
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Candidato: (pk, relevância - maior é melhor, popularidade)
+Candidate = Tuple[int, float, float]
+
+
+def query_terms(query: str) -> List[str]:
+    return WORD_RE.findall(query or '')[:20]
+
+
+class BasicSearchBackend:
+    """
+    Busca por substring nas chaves normalizadas dos títulos (sem acentos e
+    em minúsculas) e na sinopse; usada quando o banco não tem índice
+    textual. Sem relevância: só a popularidade ordena.
+    """
+    name = 'basic'
+
+    def install(self, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def candidates(self, query: str, media_type: Optional[str] = None, limit: int = 500) -> List[Candidate]:
+        key = search_key(query)
+        queryset = Media.objects.filter(
+            Q(title_key__contains=key) | Q(original_title_key__contains=key) | Q(overview__icontains=query)
+        )
+        if media_type:
+            queryset = queryset.filter(media_type=media_type)
+        rows = queryset.order_by('-popularity').values_list('id', 'popularity')[:limit]
+        return [(pk, 0.0, popularity) for pk, popularity in rows]
+
+
+class SQLiteFTSBackend(BasicSearchBackend):
+    """
+    Índice FTS5 de conteúdo externo sobre catalog_media (título, título
+    original e sinopse), mantido por triggers: inserções, upserts em lote e
+    alterações desses três campos atualizam o índice na mesma transação;
+    mudanças só de popularidade/votos não tocam nele.
+
+    O tokenizador remove acentos (``remove_diacritics 2``); cada palavra da
+    busca vale como prefixo e todas precisam aparecer.
+    """
+    name = 'sqlite_fts5'
+    table = 'catalog_media_fts'
+    weights = (10.0, 5.0, 1.0)  # bm25: título, título original, sinopse
+
+    TRIGGERS = {
+        'catalog_media_fts_ai': (
+            'AFTER INSERT ON catalog_media BEGIN '
+            'INSERT INTO catalog_media_fts(rowid, title, original_title, overview) '
+            'VALUES (new.id, new.title, new.original_title, new.overview); END'
+        ),
+        'catalog_media_fts_ad': (
+            'AFTER DELETE ON catalog_media BEGIN '
+            "INSERT INTO catalog_media_fts(catalog_media_fts, rowid, title, original_title, overview) "
+            "VALUES ('delete', old.id, old.title, old.original_title, old.overview); END"
+        ),
+        'catalog_media_fts_au': (
+            'AFTER UPDATE OF title, original_title, overview ON catalog_media BEGIN '
+            "INSERT INTO catalog_media_fts(catalog_media_fts, rowid, title, original_title, overview) "
+            "VALUES ('delete', old.id, old.title, old.original_title, old.overview); "
+            'INSERT INTO catalog_media_fts(rowid, title, original_title, overview) '
+            'VALUES (new.id, new.title, new.original_title, new.overview); END'
+        ),
+    }
+
+    def install(self, using=DEFAULT_DB_ALIAS):
+        """
+        Cria o índice e os triggers que faltarem. Migrações que recriam
+        catalog_media no SQLite descartam os triggers; nesse caso o índice é
+        reconstruído a partir da tabela.
+        """
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+                "title, original_title, overview, content='catalog_media', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'catalog_media'")
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in self.TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(f'CREATE TRIGGER {name} {self.TRIGGERS[name]}')
+            if missing:
+                cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def match_expression(self, query: str) -> str:
+        return ' '.join(f'"{term}"*' for term in query_terms(query))
+
+    def candidates(self, query: str, media_type: Optional[str] = None, limit: int = 500) -> List[Candidate]:
+        """
+        Primeiro só nos títulos (curtos, o bm25 é barato); a sinopse entra
+        apenas se os títulos não bastarem, para que termos comuns na sinopse
+        não obriguem a pontuar uma fração grande do catálogo
+        """
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        found = self._match(f'{{title original_title}}: ({expression})', media_type, limit)
+        if len(found) < limit:
+            seen = {pk for pk, _, _ in found}
+            extra = self._match(expression, media_type, limit)
+            found += [candidate for candidate in extra if candidate[0] not in seen][:limit - len(found)]
+        return found
+
+    def _match(self, expression: str, media_type: Optional[str], limit: int) -> List[Candidate]:
+        sql = (
+            f'SELECT m.id, bm25({self.table}, %s, %s, %s) AS score, m.popularity '
+            f'FROM {self.table} JOIN catalog_media m ON m.id = {self.table}.rowid '
+            f'WHERE {self.table} MATCH %s'
+        )
+        params = [*self.weights, expression]
+        if media_type:
+            sql += ' AND m.media_type = %s'
+            params.append(media_type)
+        sql += ' ORDER BY score LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25 é negativo: quanto menor, mais relevante
+            return [(pk, -score, popularity) for pk, score, popularity in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """
+    ``tsvector`` em português com pesos (título A, título original B,
+    sinopse D), servido por um índice GIN sobre a mesma expressão usada na
+    consulta: o índice acompanha as gravações sem triggers. Os títulos entram
+    pelas chaves sem acento, e os termos da busca são normalizados do mesmo
+    jeito.
+    """
+    name = 'postgres'
+    index = 'catalog_media_search_v2_idx'
+    vector = (
+        "setweight(to_tsvector('portuguese', coalesce(title_key, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(original_title_key, '')), 'B') || "
+        "setweight(to_tsvector('portuguese', coalesce(overview, '')), 'D')"
+    )
+
+    def install(self, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {self.index} ON catalog_media USING GIN (({self.vector}))')
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'REINDEX INDEX {self.index}')
+
+    def candidates(self, query: str, media_type: Optional[str] = None, limit: int = 500) -> List[Candidate]:
+        terms = query_terms(search_key(query))
+        if not terms:
+            return []
+        sql = (
+            f"SELECT id, ts_rank_cd({self.vector}, q) AS score, popularity "
+            f"FROM catalog_media, to_tsquery('portuguese', %s) q "
+            f"WHERE ({self.vector}) @@ q"
+        )
+        params = [' & '.join(f'{term}:*' for term in terms)]
+        if media_type:
+            sql += ' AND media_type = %s'
+            params.append(media_type)
+        sql += ' ORDER BY score DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+BACKENDS = {
+    backend.name: backend for backend in (BasicSearchBackend, SQLiteFTSBackend, PostgresSearchBackend)
+}
+
+
+def fts5_available(conn) -> bool:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def backend_for(conn):
+    """
+    Backend de ``settings.SEARCH_BACKEND``; ``auto`` escolhe pelo banco
+    """
+    name = settings.SEARCH_BACKEND
+    if name == 'auto':
+        if conn.vendor == 'sqlite' and fts5_available(conn):
+            name = SQLiteFTSBackend.name
+        elif conn.vendor == 'postgresql':
+            name = PostgresSearchBackend.name
+        else:
+            name = BasicSearchBackend.name
+    return BACKENDS[name]()
+
+
+_search_backend = None
+_search_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    global _search_backend
+    if _search_backend is None:
+        with _search_backend_lock:
+            if _search_backend is None:
+                _search_backend = backend_for(connection)
+    return _search_backend
+
+
+def rank(candidates: List[Candidate]) -> List[int]:
+    """
+    Ordena os candidatos misturando relevância e popularidade, ambas
+    normalizadas pelo maior valor entre os candidatos (a escala da relevância
+    muda de um backend para outro); a popularidade entra em log para que
+    títulos muito populares não dominem a busca
+    """
+    if not candidates:
+        return []
+    weight = settings.SEARCH_POPULARITY_WEIGHT
+    best_relevance = max(relevance for _, relevance, _ in candidates) or 1.0
+    best_popularity = max(math.log1p(max(popularity, 0)) for _, _, popularity in candidates) or 1.0
+
+    def score(candidate):
+        _, relevance, popularity = candidate
+        return (
+            (1 - weight) * relevance / best_relevance
+            + weight * math.log1p(max(popularity, 0)) / best_popularity
+        )
+
+    return [pk for pk, _, _ in sorted(candidates, key=score, reverse=True)]
+
+
+def prefix_candidates(query: str, media_type: Optional[str] = None, limit: int = 50) -> List[Candidate]:
+    """
+    Títulos que começam com a busca inteira ("vingadores ult" -> "Vingadores:
+    Ultimato"), por intervalo nas chaves normalizadas: servido pelos índices
+    de ``title_key``/``original_title_key`` em qualquer banco
+    """
+    key = search_key(query)
+    if not key:
+        return []
+    low, high = prefix_range(key)
+    queryset = Media.objects.filter(
+        Q(title_key__gte=low, title_key__lt=high) | Q(original_title_key__gte=low, original_title_key__lt=high)
+    )
+    if media_type:
+        queryset = queryset.filter(media_type=media_type)
+    rows = queryset.order_by().values_list('id', 'popularity')[:limit]
+    return [(pk, 0.0, popularity) for pk, popularity in rows]
+
+
+def search_media(query: str, media_type: Optional[str] = None) -> List[int]:
+    """
+    pks dos títulos que correspondem à busca, do mais ao menos relevante
+    (no máximo ``SEARCH_CANDIDATES``)
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    candidates = {
+        candidate[0]: candidate
+        for candidate in get_search_backend().candidates(query, media_type, settings.SEARCH_CANDIDATES)
+    }
+    # Título que começa com a busca vale tanto quanto o melhor do índice
+    best = max((relevance for _, relevance, _ in candidates.values()), default=0.0) or 1.0
+    for pk, _, popularity in prefix_candidates(query, media_type):
+        candidates[pk] = (pk, best, popularity)
+    return rank(list(candidates.values()))
+
+
+def install_search_index(sender=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate: garante o índice textual do banco migrado
+    """
+    backend_for(connections[using]).install(using)
@@ -0,0 +1,25 @@
+import re
+import unicodedata
+
+_SPACES_RE = re.compile(r'\s+')
+
+
+def search_key(text) -> str:
+    """
+    Forma normalizada para busca: sem acentos, em minúsculas e com espaços
+    simples (``'  Ação   Total'`` -> ``'acao total'``)
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES_RE.sub(' ', stripped.casefold()).strip()
+
+
+def prefix_range(key: str):
+    """
+    Limites (inclusivo, exclusivo) das chaves que começam com ``key``: uma
+    comparação de intervalo usa o índice em qualquer banco, ao contrário de
+    ``LIKE``/``LOWER()``
+    """
+    return key, key + '\U0010ffff'
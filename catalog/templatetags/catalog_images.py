@@ -0,0 +1,29 @@
+from django import template
+
+from catalog.services import images
+
+register = template.Library()
+
+
+@register.inclusion_tag('catalog/includes/picture.html')
+def picture(path, variant, alt='', css_class='', style='', loading='lazy'):
+    """
+    ``<picture>`` com WebP + JPEG e ``srcset`` de uma imagem da TMDB::
+
+        {% picture movie.poster_path 'card' alt=movie.title css_class='card-img-top' %}
+    """
+    return {
+        **images.image_sources(path, variant),
+        'alt': alt,
+        'css_class': css_class,
+        'style': style,
+        'loading': loading,
+    }
+
+
+@register.simple_tag
+def image_url(path, variant, fmt='jpg'):
+    """
+    URL do maior tamanho de uma variante (para CSS, ex.: o backdrop)
+    """
+    return images.image_url(path, variant, fmt)
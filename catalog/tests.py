@@ -1,3 +1,191 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import requests
+from requests.adapters import BaseAdapter
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from catalog.models import ImportRun, Media
+from services.tmdb_cache import TMDBResponseCache
+from services.tmdb_replay import ReplayAdapter, ReplayArchive
+from services.tmdb_service import TMDBService
+
+
+class StubAsyncClient:
+    """
+    Cliente assíncrono falso com a interface usada pelo import_tmdb_async:
+    cada listagem devolve uma página com dois títulos
+    """
+    CACHE_DEFAULT = 'default'
+    CACHE_REFRESH = 'refresh'
+    CACHE_ONLY = 'cache_only'
+
+    def __init__(self, concurrency=None):
+        self.concurrency = concurrency or 4
+        self.cache_mode = self.CACHE_DEFAULT
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    async def get_movie_genres(self):
+        return [{'id': 28, 'name': 'Ação'}]
+
+    async def get_tv_genres(self):
+        return [{'id': 18, 'name': 'Drama'}]
+
+    def listing(self, first_id, page):
+        return {'results': [
+            {'id': first_id + page * 10 + offset, 'title': f'Título {first_id + page * 10 + offset}',
+             'name': f'Título {first_id + page * 10 + offset}', 'genre_ids': [28], 'popularity': 10.0}
+            for offset in range(2)
+        ]}
+
+    async def get_popular_movies(self, page=1):
+        return self.listing(1000, page)
+
+    async def get_popular_tv(self, page=1):
+        return self.listing(2000, page)
+
+    async def get_now_playing_movies(self, page=1):
+        return self.listing(1000, page)
+
+    async def get_top_rated_movies(self, page=1):
+        return self.listing(3000, page)
+
+
+class ImportTmdbAsyncTests(TransactionTestCase):
+    def test_imports_pages_from_stub_client(self):
+        Media.objects.create(tmdb_id=1010, title='Já no catálogo', media_type='movie')
+        with mock.patch('catalog.management.commands.import_tmdb_async.AsyncTMDBService', StubAsyncClient):
+            call_command('import_tmdb_async', movies_pages=2, tv_pages=1, stdout=StringIO())
+
+        # As 10 páginas de mais bem avaliados entram todas; 1010 já existia e não é regravado
+        self.assertTrue(Media.objects.filter(tmdb_id=1011, media_type='movie').exists())
+        self.assertTrue(Media.objects.filter(tmdb_id=2010, media_type='tv').exists())
+        self.assertEqual(Media.objects.get(tmdb_id=1010).title, 'Já no catálogo')
+        self.assertEqual(Media.objects.filter(tmdb_id__gte=3000).count(), 20)
+
+
+class StubTMDBService:
+    """
+    TMDBService falso para o import_all_tmdb: páginas com dois títulos, e as
+    páginas em ``failing`` sem resposta (None), como depois de esgotar as
+    novas tentativas
+    """
+    CACHE_ONLY = 'cache_only'
+    CACHE_REFRESH = 'refresh'
+
+    def __init__(self, failing=()):
+        self.cache_mode = 'default'
+        self.failing = set(failing)
+
+    def get_movie_genres(self):
+        return [{'id': 28, 'name': 'Ação'}]
+
+    def get_tv_genres(self):
+        return [{'id': 18, 'name': 'Drama'}]
+
+    def listing(self, method, first_id, page):
+        if (method, page) in self.failing:
+            return None
+        return {'results': [
+            {'id': first_id + page * 10 + offset, 'title': f'Título {first_id + page * 10 + offset}',
+             'name': f'Título {first_id + page * 10 + offset}', 'genre_ids': [28], 'popularity': 10.0}
+            for offset in range(2)
+        ]}
+
+    def get_popular_movies(self, page=1):
+        return self.listing('get_popular_movies', 1000, page)
+
+    def get_popular_tv(self, page=1):
+        return self.listing('get_popular_tv', 2000, page)
+
+    def get_now_playing_movies(self, page=1):
+        return self.listing('get_now_playing_movies', 3000, page)
+
+    def get_top_rated_movies(self, page=1):
+        return self.listing('get_top_rated_movies', 4000, page)
+
+
+class ImportAllTmdbResumeTests(TestCase):
+    def run_import(self, service, **options):
+        with mock.patch('catalog.management.commands.import_all_tmdb.get_tmdb_service', return_value=service), \
+                mock.patch('catalog.services.import_tasks.get_tmdb_service', return_value=service):
+            call_command('import_all_tmdb', movies_pages=3, tv_pages=1, stdout=StringIO(), **options)
+
+    def test_failed_page_is_retried_on_resume(self):
+        self.run_import(StubTMDBService(failing={('get_popular_movies', 2)}))
+
+        run = ImportRun.objects.get()
+        self.assertEqual(run.status, 'partial')
+        # O cursor para antes da página que falhou, mesmo com a 3 gravada
+        self.assertEqual(run.cursors.get(phase='popular_movies').page, 1)
+        self.assertFalse(Media.objects.filter(tmdb_id=1020).exists())
+        self.assertTrue(Media.objects.filter(tmdb_id=1030).exists())
+
+        self.run_import(StubTMDBService(), resume=True)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, 'finished')
+        self.assertEqual(run.cursors.get(phase='popular_movies').page, 3)
+        self.assertEqual(Media.objects.filter(tmdb_id__in=[1020, 1021]).count(), 2)
+
+
+class FakeNetwork(BaseAdapter):
+    """
+    Transporte que responde 200 a qualquer requisição e conta as chamadas
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = json.dumps({'results': [{'id': self.calls}]}).encode('utf-8')
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordWarmCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = TMDBResponseCache(os.path.join(directory.name, 'cache.sqlite3'))
+        self.archive_path = os.path.join(directory.name, 'archive.jsonl')
+
+    def service(self, adapter):
+        service = TMDBService()
+        service.cache = self.cache
+        service.max_retries = 0
+        service.session.mount(service.base_url, adapter)
+        return service
+
+    def test_recording_from_warm_cache_replays_completely(self):
+        network = FakeNetwork()
+        warm = self.service(network)
+        expected = [warm.get_popular_movies(page=page) for page in (1, 2)]
+
+        recording = self.service(network)
+        recording.recorder = ReplayArchive(self.archive_path)
+        self.assertEqual([recording.get_popular_movies(page=page) for page in (1, 2)], expected)
+        self.assertEqual(network.calls, 2)  # tudo veio do cache
+
+        replay = TMDBService()
+        replay.max_retries = 0
+        replay.use_transport(ReplayAdapter(ReplayArchive(self.archive_path), replay.base_url))
+        self.assertEqual([replay.get_popular_movies(page=page) for page in (1, 2)], expected)
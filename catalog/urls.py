@@ -14,6 +14,7 @@ urlpatterns = [
     
     # Detalhes
     path('media/<int:pk>/', views.MediaDetailView.as_view(), name='media_detail'),
+    path('person/<int:pk>/', views.PersonDetailView.as_view(), name='person_detail'),
     
     # Favoritos
     path('my-list/', views.FavoritesView.as_view(), name='favorites'),
@@ -30,4 +31,9 @@ urlpatterns = [
     # AJAX endpoints
     path('ajax/toggle-favorite/<int:media_id>/', views.ajax_toggle_favorite, name='ajax_toggle_favorite'),
     path('ajax/load-more-media/', views.ajax_load_more_media, name='ajax_load_more_media'),
+    path('ajax/person-credits/<int:person_id>/', views.ajax_person_credits, name='ajax_person_credits'),
+    path('ajax/autocomplete/', views.ajax_autocomplete, name='ajax_autocomplete'),
+    
+    # Imagens da TMDB redimensionadas (cache local)
+    path('images/<str:version>/w<int:width>/<str:filename>', views.cached_image, name='cached_image'),
 ]
\ No newline at end of file
@@ -3,14 +3,22 @@ from django.views.generic import ListView, DetailView, CreateView
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
 from django.db.models import Q, Avg, Count
-from django.core.paginator import Paginator
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import patch_cache_control
 
-from .models import Media, Genre, Favorite, ContentRequest
+from .models import Media, Genre, Person, Cast, Crew, Favorite, ContentRequest
+from .services.autocomplete import get_autocomplete_index
+from .services.fuzzy import fuzzy_search
+from .services.pagination import InvalidCursor, KeysetPaginationMixin, KeysetPaginator
+from .services.images import (
+    FORMATS, ImageNotFound, get_image_cache, image_url, source_name, spec_version, variant_url,
+)
+from .services.search import search_media
+from .services.text import search_key
 from reviews.models import Review
-from services.tmdb_service import tmdb_service
 
 
 class HomeView(ListView):
@@ -51,7 +59,19 @@ class HomeView(ListView):
         return context
 
 
-class MoviesView(ListView):
+def filter_by_genre(queryset, value):
+    """
+    Filtra pelo gênero informado por id ou por nome (sem diferenciar
+    acentos e maiúsculas: "acao" encontra "Ação")
+    """
+    try:
+        return queryset.filter(genres__id=int(value))
+    except (ValueError, TypeError):
+        key = search_key(value)
+        return queryset.filter(genres__name_key=key) if key else queryset
+
+
+class MoviesView(KeysetPaginationMixin, ListView):
     """
     Listagem de filmes
     """
@@ -63,22 +83,15 @@ class MoviesView(ListView):
     def get_queryset(self):
         queryset = Media.objects.filter(media_type='movie')
         
-        # Filtro por busca
+        # Filtro por busca (índice textual e chaves sem acento)
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(original_title__icontains=search)
-            )
-        
-        # Filtro por gênero
-        genre_id = self.request.GET.get('genre')
-        if genre_id:
-            try:
-                genre_id = int(genre_id)
-                queryset = queryset.filter(genres__id=genre_id)
-            except (ValueError, TypeError):
-                pass
+            queryset = queryset.filter(pk__in=search_media(search, 'movie'))
+        
+        # Filtro por gênero (id ou nome)
+        genre = self.request.GET.get('genre')
+        if genre:
+            queryset = filter_by_genre(queryset, genre)
         
         # Filtro por ano
         year = self.request.GET.get('year')
@@ -98,20 +111,18 @@ class MoviesView(ListView):
             except (ValueError, TypeError):
                 pass
         
-        # Ordenação
+        # Ordenação (aplicada pela paginação por cursor, com o id de desempate)
         ordering = self.request.GET.get('ordering', '-vote_average')
         valid_orderings = ['-vote_average', '-release_date', 'release_date', 'title', '-title']
-        if ordering in valid_orderings:
-            queryset = queryset.order_by(ordering)
-        else:
-            queryset = queryset.order_by('-vote_average')
+        self.ordering_key = ordering if ordering in valid_orderings else '-vote_average'
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['genres'] = Genre.objects.all()
-        context['movies_count'] = self.get_queryset().count()
+        # Total só na primeira página (as seguintes não fazem COUNT)
+        context['movies_count'] = self.object_list.count() if self.is_first_page() else None
         
         # Anos disponíveis
         years = Media.objects.filter(
@@ -123,7 +134,7 @@ class MoviesView(ListView):
         return context
 
 
-class TVShowsView(ListView):
+class TVShowsView(KeysetPaginationMixin, ListView):
     """
     Listagem de séries
     """
@@ -135,22 +146,15 @@ class TVShowsView(ListView):
     def get_queryset(self):
         queryset = Media.objects.filter(media_type='tv')
         
-        # Filtro por busca
+        # Filtro por busca (índice textual e chaves sem acento)
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(original_title__icontains=search)
-            )
-        
-        # Filtro por gênero
-        genre_id = self.request.GET.get('genre')
-        if genre_id:
-            try:
-                genre_id = int(genre_id)
-                queryset = queryset.filter(genres__id=genre_id)
-            except (ValueError, TypeError):
-                pass
+            queryset = queryset.filter(pk__in=search_media(search, 'tv'))
+        
+        # Filtro por gênero (id ou nome)
+        genre = self.request.GET.get('genre')
+        if genre:
+            queryset = filter_by_genre(queryset, genre)
         
         # Filtro por ano
         year = self.request.GET.get('year')
@@ -166,20 +170,18 @@ class TVShowsView(ListView):
         if status and hasattr(queryset.model, 'status'):
             queryset = queryset.filter(status=status)
         
-        # Ordenação
+        # Ordenação (aplicada pela paginação por cursor, com o id de desempate)
         ordering = self.request.GET.get('ordering', '-vote_average')
         valid_orderings = ['-vote_average', '-release_date', 'release_date', 'title', '-title']
-        if ordering in valid_orderings:
-            queryset = queryset.order_by(ordering)
-        else:
-            queryset = queryset.order_by('-vote_average')
+        self.ordering_key = ordering if ordering in valid_orderings else '-vote_average'
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['genres'] = Genre.objects.all()
-        context['tv_shows_count'] = self.get_queryset().count()
+        # Total só na primeira página (as seguintes não fazem COUNT)
+        context['tv_shows_count'] = self.object_list.count() if self.is_first_page() else None
         
         # Anos disponíveis
         years = Media.objects.filter(
@@ -191,7 +193,7 @@ class TVShowsView(ListView):
         return context
 
 
-class SearchView(ListView):
+class SearchView(KeysetPaginationMixin, ListView):
     """
     Busca de filmes e séries
     """
@@ -204,17 +206,20 @@ class SearchView(ListView):
         query = self.request.GET.get('q', '')
         if not query:
             return Media.objects.none()
-            
-        queryset = Media.objects.filter(
-            Q(title__icontains=query) | 
-            Q(original_title__icontains=query) |
-            Q(overview__icontains=query)
-        )
         
-        # Filtro por tipo (filme/série)
+        # Índice textual (FTS5/tsvector): pks do mais ao menos relevante
         media_type = self.request.GET.get('type')
-        if media_type in ['movie', 'tv']:
-            queryset = queryset.filter(media_type=media_type)
+        media_type = media_type if media_type in ['movie', 'tv'] else None
+        ids = search_media(query, media_type)
+        
+        # Poucos resultados: completa com títulos parecidos (erros de digitação)
+        self.fuzzy = False
+        if len(ids) < settings.SEARCH_FUZZY_MIN_HITS:
+            found = set(ids)
+            similar = [pk for pk in fuzzy_search(query, media_type) if pk not in found]
+            self.fuzzy = bool(similar)
+            ids += similar
+        queryset = Media.objects.filter(pk__in=ids)
         
         # Filtro por ano
         year = self.request.GET.get('year')
@@ -222,22 +227,28 @@ class SearchView(ListView):
             try:
                 year = int(year)
                 queryset = queryset.filter(release_date__year=year)
+                allowed = set(queryset.values_list('pk', flat=True))
+                ids = [pk for pk in ids if pk in allowed]
             except (ValueError, TypeError):
                 pass
         
-        # Ordenação
-        ordering = self.request.GET.get('ordering', '-popularity')
+        # Ordenação (padrão: relevância misturada com popularidade, paginada
+        # pela posição na lista de pks)
+        ordering = self.request.GET.get('ordering', 'relevance')
         valid_orderings = ['-popularity', '-vote_average', '-release_date', 'title']
         if ordering in valid_orderings:
-            queryset = queryset.order_by(ordering)
+            self.ordering_key = ordering
         else:
-            queryset = queryset.order_by('-popularity')
+            self.ranked_ids = ids
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['query'] = self.request.GET.get('q', '')
+        context['fuzzy'] = getattr(self, 'fuzzy', False)
+        # Os resultados são limitados (SEARCH_CANDIDATES), contar é barato
+        context['results_count'] = self.object_list.count()
         return context
 
 
@@ -279,8 +290,8 @@ class MediaDetailView(DetailView):
                 context['user_review'] = None
         
         # Elenco e equipe
-        context['cast'] = media.cast_members.all()[:10]
-        context['crew'] = media.crew_members.all()[:5]
+        context['cast'] = media.cast_members.select_related('person')[:10]
+        context['crew'] = media.crew_members.select_related('person')[:5]
         
         # Recomendações (filmes/séries similares)
         similar_media = Media.objects.filter(
@@ -292,6 +303,49 @@ class MediaDetailView(DetailView):
         return context
 
 
+# Ordenações aceitas na filmografia (chave de ordenação decrescente)
+FILMOGRAPHY_ORDERINGS = {
+    'popularity': lambda media: media.popularity,
+    'release_date': lambda media: (media.release_date is not None, media.release_date, media.popularity),
+}
+
+
+def person_filmography(person, order='popularity'):
+    """
+    Créditos de uma pessoa agrupados por título, em duas consultas (elenco e
+    equipe) servidas pelo índice (person, media)
+    """
+    credits = {}
+    for credit in Cast.objects.filter(person=person).select_related('media').order_by():
+        entry = credits.setdefault(credit.media_id, {'media': credit.media, 'characters': [], 'jobs': []})
+        if credit.character:
+            entry['characters'].append(credit.character)
+    for credit in Crew.objects.filter(person=person).select_related('media').order_by():
+        entry = credits.setdefault(credit.media_id, {'media': credit.media, 'characters': [], 'jobs': []})
+        entry['jobs'].append(credit.job)
+    
+    sort_key = FILMOGRAPHY_ORDERINGS.get(order, FILMOGRAPHY_ORDERINGS['popularity'])
+    return sorted(credits.values(), key=lambda entry: sort_key(entry['media']), reverse=True)
+
+
+class PersonDetailView(DetailView):
+    """
+    Página de uma pessoa com a filmografia (elenco e equipe)
+    """
+    model = Person
+    template_name = 'catalog/person_detail.html'
+    context_object_name = 'person'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        order = self.request.GET.get('order', 'popularity')
+        if order not in FILMOGRAPHY_ORDERINGS:
+            order = 'popularity'
+        context['order'] = order
+        context['credits'] = person_filmography(self.object, order)
+        return context
+
+
 class FavoritesView(LoginRequiredMixin, ListView):
     """
     Lista pessoal de favoritos do usuário
@@ -469,9 +523,9 @@ def ajax_toggle_favorite(request, media_id):
 
 def ajax_load_more_media(request):
     """
-    Carregar mais conteúdo via AJAX (infinite scroll)
+    Carregar mais conteúdo via AJAX (infinite scroll), paginado por cursor:
+    a resposta traz ``next_cursor``, que o cliente devolve em ``?cursor=``
     """
-    page = request.GET.get('page', 1)
     media_type = request.GET.get('type', 'all')
     
     if media_type == 'all':
@@ -479,31 +533,120 @@ def ajax_load_more_media(request):
     else:
         queryset = Media.objects.filter(media_type=media_type)
     
-    paginator = Paginator(queryset.order_by('-popularity'), 12)
+    paginator = KeysetPaginator(queryset, '-popularity', 12)
     
     try:
-        media_page = paginator.page(page)
-        media_list = []
-        
-        for media in media_page:
-            media_list.append({
-                'id': media.id,
-                'title': media.title,
-                'poster_url': f"https://image.tmdb.org/t/p/w500{media.poster_path}" if media.poster_path else '',
-                'media_type': media.get_media_type_display(),
-                'release_year': media.release_date.year if media.release_date else None,
-                'rating': media.vote_average,
-            })
-        
+        media_page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
         return JsonResponse({
-            'success': True,
-            'media': media_list,
-            'has_next': media_page.has_next(),
-            'next_page': media_page.next_page_number() if media_page.has_next() else None
+            'success': False,
+            'error': 'Cursor inválido'
+        }, status=400)
+    
+    media_list = []
+    for media in media_page:
+        media_list.append({
+            'id': media.id,
+            'title': media.title,
+            'poster_url': image_url(media.poster_path, 'card'),
+            'media_type': media.get_media_type_display(),
+            'release_year': media.release_date.year if media.release_date else None,
+            'rating': media.vote_average,
         })
-        
-    except Exception as e:
+    
+    return JsonResponse({
+        'success': True,
+        'media': media_list,
+        'has_next': media_page.has_next(),
+        'next_cursor': media_page.next_cursor,
+    })
+
+
+def ajax_autocomplete(request):
+    """
+    Sugestões de títulos para a busca do menu (prefixo, sem diferenciar
+    acentos e maiúsculas), servidas do índice em memória
+    """
+    try:
+        limit = int(request.GET.get('limit', settings.AUTOCOMPLETE_RESULTS))
+    except (ValueError, TypeError):
+        limit = settings.AUTOCOMPLETE_RESULTS
+    
+    media_types = dict(Media.MEDIA_TYPES)
+    results = []
+    for suggestion in get_autocomplete_index().suggest(request.GET.get('q', ''), limit):
+        results.append({
+            'id': suggestion.id,
+            'title': suggestion.title,
+            'url': reverse('catalog:media_detail', args=[suggestion.id]),
+            'poster_url': image_url(suggestion.poster_path, 'card'),
+            'media_type': media_types.get(suggestion.media_type, suggestion.media_type),
+            'release_year': suggestion.year,
+        })
+    
+    response = JsonResponse({
+        'success': True,
+        'results': results,
+    })
+    # A mesma sugestão vale até a próxima atualização do índice
+    patch_cache_control(response, public=True, max_age=settings.AUTOCOMPLETE_REFRESH_SECONDS)
+    return response
+
+
+def ajax_person_credits(request, person_id):
+    """
+    Filmografia de uma pessoa em JSON
+    """
+    person = get_object_or_404(Person, pk=person_id)
+    order = request.GET.get('order', 'popularity')
+    if order not in FILMOGRAPHY_ORDERINGS:
         return JsonResponse({
             'success': False,
-            'error': str(e)
+            'error': f'Ordenação inválida: {order}'
+        }, status=400)
+    
+    credits = []
+    for entry in person_filmography(person, order):
+        media = entry['media']
+        credits.append({
+            'id': media.id,
+            'title': media.title,
+            'poster_url': image_url(media.poster_path, 'card'),
+            'media_type': media.get_media_type_display(),
+            'release_year': media.release_date.year if media.release_date else None,
+            'rating': media.vote_average,
+            'characters': entry['characters'],
+            'jobs': entry['jobs'],
         })
+    
+    return JsonResponse({
+        'success': True,
+        'person': {
+            'id': person.id,
+            'name': person.name,
+            'profile_url': image_url(person.profile_path, 'profile'),
+        },
+        'credits': credits,
+    })
+
+
+def cached_image(request, version, width, filename):
+    """
+    Variante redimensionada de uma imagem da TMDB, servida do cache local
+    com cabeçalhos de cache de longa duração (a URL muda com o conteúdo).
+    Só imagens do catálogo são baixadas e geradas sob demanda.
+    """
+    name, _, fmt = filename.rpartition('.')
+    if fmt not in FORMATS or not source_name(name):
+        raise Http404('Imagem inválida')
+    if version != spec_version():
+        # Página antiga apontando para uma versão anterior das variantes
+        return redirect(variant_url(name, width, fmt))
+    try:
+        path = get_image_cache().variant(name, width, fmt, catalog_only=True)
+    except ImageNotFound:
+        raise Http404('Imagem não encontrada')
+    
+    response = FileResponse(open(path, 'rb'), content_type=FORMATS[fmt][1])
+    response['Cache-Control'] = f'public, max-age={settings.IMAGE_CACHE_MAX_AGE}, immutable'
+    return response
@@ -138,6 +138,70 @@ TMDB_API_KEY = config('TMDB_API_KEY', default='your_tmdb_api_key_here')
 TMDB_BASE_URL = 'https://api.themoviedb.org/3'
 TMDB_IMAGE_BASE_URL = 'https://image.tmdb.org/t/p/'
 
+# Limite de requisições compartilhado por todo o processo (token bucket)
+TMDB_RATE_LIMIT = config('TMDB_RATE_LIMIT', default=40, cast=float)  # requisições/s
+TMDB_RATE_BURST = config('TMDB_RATE_BURST', default=20, cast=int)
+TMDB_CONNECT_TIMEOUT = config('TMDB_CONNECT_TIMEOUT', default=3.05, cast=float)  # segundos
+TMDB_READ_TIMEOUT = config('TMDB_READ_TIMEOUT', default=10, cast=float)  # segundos
+TMDB_POOL_MAXSIZE = config('TMDB_POOL_MAXSIZE', default=32, cast=int)  # conexões keep-alive reaproveitadas
+TMDB_MAX_RETRIES = config('TMDB_MAX_RETRIES', default=4, cast=int)
+TMDB_BACKOFF_BASE = 0.5  # segundos, dobra a cada tentativa
+TMDB_BACKOFF_MAX = 30  # segundos
+TMDB_ASYNC_CONCURRENCY = config('TMDB_ASYNC_CONCURRENCY', default=100, cast=int)  # importador assíncrono
+
+# Cache persistente das respostas da API (TTL em segundos, por endpoint)
+TMDB_CACHE_ENABLED = config('TMDB_CACHE_ENABLED', default=True, cast=bool)
+TMDB_CACHE_PATH = config('TMDB_CACHE_PATH', default=str(BASE_DIR / 'tmdb_cache.sqlite3'))
+TMDB_CACHE_TTLS = [
+    (r'^genre/', 7 * 24 * 3600),
+    (r'/changes$', 0),  # nunca cachear feeds de alterações
+    (r'^(movie|tv)/(popular|top_rated|now_playing|on_the_air|airing_today)$', 6 * 3600),
+    (r'^(movie|tv)/\d+', config('TMDB_CACHE_DETAILS_TTL', default=24 * 3600, cast=int)),
+    (r'^search/', 3600),
+]
+TMDB_CACHE_DEFAULT_TTL = 3600
+
+# Cache local de posters/backdrops: os originais são baixados uma vez da
+# origem (URL ou diretório local) e servidos redimensionados em WebP/JPEG
+IMAGE_CACHE_ENABLED = config('IMAGE_CACHE_ENABLED', default=True, cast=bool)
+IMAGE_ORIGIN = config('IMAGE_ORIGIN', default=TMDB_IMAGE_BASE_URL + 'original')
+IMAGE_CACHE_ROOT = config('IMAGE_CACHE_ROOT', default=str(MEDIA_ROOT / 'images'))
+IMAGE_QUALITY = config('IMAGE_QUALITY', default=80, cast=int)
+IMAGE_CACHE_MAX_AGE = 365 * 24 * 3600  # URLs versionadas, nunca mudam de conteúdo
+IMAGE_MISS_TTL = config('IMAGE_MISS_TTL', default=300, cast=int)  # segundos lembrando uma falha na origem
+IMAGE_VARIANTS = {
+    'card': {'widths': [185, 342], 'sizes': '(max-width: 576px) 50vw, (max-width: 992px) 33vw, 17vw'},
+    'detail': {'widths': [342, 500, 780], 'sizes': '(max-width: 768px) 100vw, 25vw'},
+    'hero': {'widths': [780, 1280], 'sizes': '100vw'},
+    'profile': {'widths': [185], 'sizes': '80px'},
+}
+
+# Busca textual: 'auto' usa FTS5 no SQLite e tsvector no PostgreSQL ('basic'
+# mantém o icontains). Os SEARCH_CANDIDATES mais relevantes são reordenados
+# misturando relevância e popularidade (SEARCH_POPULARITY_WEIGHT: fração 0-1
+# da nota que vem da popularidade).
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='auto')
+SEARCH_CANDIDATES = config('SEARCH_CANDIDATES', default=500, cast=int)
+SEARCH_POPULARITY_WEIGHT = config('SEARCH_POPULARITY_WEIGHT', default=0.3, cast=float)
+
+# Sugestões da busca (ajax/autocomplete/), servidas da memória de cada
+# processo: só os AUTOCOMPLETE_MAX_TITLES títulos mais populares entram
+# (cerca de 1 KB por título). Mudanças são relidas a cada
+# AUTOCOMPLETE_REFRESH_SECONDS e o índice é remontado a cada
+# AUTOCOMPLETE_REBUILD_SECONDS.
+AUTOCOMPLETE_MAX_TITLES = config('AUTOCOMPLETE_MAX_TITLES', default=50000, cast=int)
+AUTOCOMPLETE_RESULTS = config('AUTOCOMPLETE_RESULTS', default=8, cast=int)
+AUTOCOMPLETE_REFRESH_SECONDS = config('AUTOCOMPLETE_REFRESH_SECONDS', default=60, cast=int)
+AUTOCOMPLETE_REBUILD_SECONDS = config('AUTOCOMPLETE_REBUILD_SECONDS', default=3600, cast=int)
+
+# Busca aproximada (erros de digitação): só entra quando a busca normal
+# acha menos de SEARCH_FUZZY_MIN_HITS títulos, compara trigramas dos títulos
+# do índice de sugestões e tem no máximo SEARCH_FUZZY_BUDGET_MS para responder.
+SEARCH_FUZZY_MIN_HITS = config('SEARCH_FUZZY_MIN_HITS', default=3, cast=int)
+SEARCH_FUZZY_RESULTS = config('SEARCH_FUZZY_RESULTS', default=20, cast=int)
+SEARCH_FUZZY_BUDGET_MS = config('SEARCH_FUZZY_BUDGET_MS', default=50, cast=int)
+SEARCH_FUZZY_REBUILD_SECONDS = config('SEARCH_FUZZY_REBUILD_SECONDS', default=300, cast=int)
+
 # Login/Logout URLs
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/'
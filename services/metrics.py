@@ -0,0 +1,236 @@
+import bisect
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Limites superiores dos buckets de latência, em ms; o último bucket é aberto
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Agrupa endpoints com IDs (``movie/550/credits`` -> ``movie/{id}/credits``)
+    """
+    return re.sub(r'(^|/)\d+(?=/|$)', r'\1{id}', endpoint)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com buckets fixos; os percentis são estimados
+    pelo limite superior do bucket (nunca acima do máximo observado)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if i < len(self.buckets):
+                    return min(float(self.buckets[i]), self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        labels = [f'<={bound}' for bound in self.buckets] + [f'>{self.buckets[-1]}']
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 1),
+            'mean_ms': round(self.total_ms / self.count, 1) if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 1),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class EndpointMetrics:
+    """
+    Contadores de um endpoint da TMDB
+    """
+
+    def __init__(self):
+        self.requests = 0  # tentativas HTTP, incluindo novas tentativas
+        self.retries = 0
+        self.errors = 0  # chamadas que terminaram sem dados
+        self.cache_hits = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: 'EndpointMetrics'):
+        self.requests += other.requests
+        self.retries += other.retries
+        self.errors += other.errors
+        self.cache_hits += other.cache_hits
+        self.bytes += other.bytes
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'latency': self.latency.to_dict(),
+        }
+
+
+class ImportMetrics:
+    """
+    Métricas do processo: requisições à TMDB por endpoint (contagem, latência,
+    bytes recebidos, novas tentativas, erros e acertos de cache), tempos
+    nomeados (ex.: ``db_write``) e contadores livres. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.monotonic()
+            self.endpoints = {}
+            self.timings = {}
+            self.counters = {}
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        label = endpoint_label(endpoint)
+        if label not in self.endpoints:
+            self.endpoints[label] = EndpointMetrics()
+        return self.endpoints[label]
+
+    def record_request(self, endpoint: str, seconds: float, status: Optional[int] = None, size: int = 0):
+        """
+        Registra uma tentativa HTTP; ``status`` None indica falha de rede
+        """
+        key = str(status) if status is not None else 'network_error'
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.bytes += size
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            stats.latency.observe(seconds)
+
+    def record_retry(self, endpoint: str):
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+
+    def record_error(self, endpoint: str):
+        with self._lock:
+            self._endpoint(endpoint).errors += 1
+
+    def record_cache_hit(self, endpoint: str):
+        with self._lock:
+            self._endpoint(endpoint).cache_hits += 1
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            if name not in self.timings:
+                self.timings[name] = LatencyHistogram()
+            self.timings[name].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Mede o bloco e acumula no histograma ``name``
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - started)
+
+    def total_seconds(self, name: str) -> float:
+        with self._lock:
+            histogram = self.timings.get(name)
+            return histogram.total_ms / 1000 if histogram else 0.0
+
+    def increment(self, name: str, count: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + count
+
+    def drain(self) -> Tuple[Dict, Dict, Dict]:
+        """
+        Retorna e zera os dados acumulados (usado por processos filhos para
+        enviar suas métricas ao processo principal)
+        """
+        with self._lock:
+            state = (self.endpoints, self.timings, self.counters)
+            self.endpoints, self.timings, self.counters = {}, {}, {}
+        return state
+
+    def merge(self, state: Tuple[Dict, Dict, Dict]):
+        """
+        Soma os dados retornados por ``drain`` de outro processo
+        """
+        endpoints, timings, counters = state
+        with self._lock:
+            for label, stats in endpoints.items():
+                self.endpoints.setdefault(label, EndpointMetrics()).merge(stats)
+            for name, histogram in timings.items():
+                self.timings.setdefault(name, LatencyHistogram()).merge(histogram)
+            for name, count in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + count
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            endpoints = {label: stats.to_dict() for label, stats in sorted(self.endpoints.items())}
+            return {
+                'elapsed': round(time.monotonic() - self.started_at, 3),
+                'requests': sum(stats['requests'] for stats in endpoints.values()),
+                'retries': sum(stats['retries'] for stats in endpoints.values()),
+                'errors': sum(stats['errors'] for stats in endpoints.values()),
+                'cache_hits': sum(stats['cache_hits'] for stats in endpoints.values()),
+                'bytes': sum(stats['bytes'] for stats in endpoints.values()),
+                'endpoints': endpoints,
+                'timings': {name: histogram.to_dict() for name, histogram in sorted(self.timings.items())},
+                'counters': dict(self.counters),
+            }
+
+
+_import_metrics = None
+_import_metrics_lock = threading.Lock()
+
+
+def get_import_metrics() -> ImportMetrics:
+    """
+    Retorna as métricas compartilhadas pelo processo
+    """
+    global _import_metrics
+    if _import_metrics is None:
+        with _import_metrics_lock:
+            if _import_metrics is None:
+                _import_metrics = ImportMetrics()
+    return _import_metrics
@@ -0,0 +1,133 @@
+import multiprocessing
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe para limitar requisições por segundo.
+
+    ``rate`` tokens são repostos por segundo até o limite de ``capacity``;
+    cada requisição consome um token. ``pause`` bloqueia todas as threads até
+    um instante futuro (usado quando a API responde 429 com Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.configure(rate, capacity)
+
+    def configure(self, rate: float, capacity: Optional[float] = None):
+        with self._lock:
+            self.rate = float(rate)
+            self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+            self._tokens = self.capacity
+            self._updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Reserva um token e retorna quantos segundos esperar antes de usá-lo
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # Durante uma pausa _updated_at fica no futuro e não há reposição
+            delay = max(0.0, self._updated_at - now)
+            if self._tokens < 0:
+                delay += -self._tokens / self.rate
+            return delay
+
+    def acquire(self):
+        """
+        Bloqueia até haver um token disponível
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """
+        Suspende a emissão de tokens por ``seconds`` segundos
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0)
+            self._updated_at = max(self._updated_at, now + seconds)
+
+
+def _shared_field(index: int) -> property:
+    def getter(self):
+        return self._state[index]
+
+    def setter(self, value):
+        self._state[index] = value
+
+    return property(getter, setter)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket com o estado em memória compartilhada, para que vários
+    processos de importação dividam o mesmo orçamento de requisições.
+
+    Deve ser criado no processo principal e repassado aos processos filhos
+    na criação (ex.: ``initargs`` de um ProcessPoolExecutor).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, context=None):
+        context = context or multiprocessing.get_context()
+        # rate, capacity, tokens, updated_at
+        self._state = context.Array('d', 4)
+        self._lock = self._state.get_lock()
+        self.configure(rate, capacity)
+
+    rate = _shared_field(0)
+    capacity = _shared_field(1)
+    _tokens = _shared_field(2)
+    _updated_at = _shared_field(3)
+
+    def __getstate__(self):
+        return {'_state': self._state}
+
+    def __setstate__(self, state):
+        self._state = state['_state']
+        self._lock = self._state.get_lock()
+
+
+_tmdb_rate_limiter = None
+_tmdb_rate_limiter_lock = threading.Lock()
+
+
+def get_tmdb_rate_limiter() -> TokenBucket:
+    """
+    Retorna o limitador compartilhado por todas as instâncias do TMDBService
+    no processo
+    """
+    global _tmdb_rate_limiter
+    if _tmdb_rate_limiter is None:
+        with _tmdb_rate_limiter_lock:
+            if _tmdb_rate_limiter is None:
+                _tmdb_rate_limiter = TokenBucket(settings.TMDB_RATE_LIMIT, settings.TMDB_RATE_BURST)
+    return _tmdb_rate_limiter
+
+
+def use_tmdb_rate_limiter(limiter: TokenBucket):
+    """
+    Substitui o limitador do processo (ex.: por um SharedTokenBucket recebido
+    do processo principal); chame antes de criar o cliente TMDB
+    """
+    global _tmdb_rate_limiter
+    with _tmdb_rate_limiter_lock:
+        _tmdb_rate_limiter = limiter
@@ -0,0 +1,294 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from services.metrics import get_import_metrics
+from services.rate_limiter import get_tmdb_rate_limiter
+from services.tmdb_cache import cache_key, get_tmdb_response_cache
+from services.tmdb_service import TMDBService
+
+try:
+    import aiohttp
+except ImportError:  # dependência opcional, só necessária para o importador assíncrono
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTMDBService:
+    """
+    Versão assíncrona do TMDBService (mesmos métodos de busca), baseada em
+    aiohttp com pool de conexões e um semáforo limitando as requisições em
+    andamento.
+
+    Deve ser usado como gerenciador de contexto assíncrono::
+
+        async with AsyncTMDBService() as client:
+            movies = await client.get_popular_movies(page=1)
+    """
+
+    CACHE_DEFAULT = TMDBService.CACHE_DEFAULT
+    CACHE_REFRESH = TMDBService.CACHE_REFRESH
+    CACHE_ONLY = TMDBService.CACHE_ONLY
+    DETAILS_APPEND = TMDBService.DETAILS_APPEND
+
+    def __init__(self, concurrency: Optional[int] = None):
+        if aiohttp is None:
+            raise ImproperlyConfigured('O cliente assíncrono da TMDB requer o pacote aiohttp (pip install aiohttp)')
+        self.api_key = settings.TMDB_API_KEY
+        self.base_url = settings.TMDB_BASE_URL
+        self.image_base_url = settings.TMDB_IMAGE_BASE_URL
+        self.default_params = {'api_key': self.api_key, 'language': 'pt-BR'}
+        self.concurrency = concurrency or settings.TMDB_ASYNC_CONCURRENCY
+        self.rate_limiter = get_tmdb_rate_limiter()
+        self.max_retries = settings.TMDB_MAX_RETRIES
+        self.cache = get_tmdb_response_cache()
+        self.cache_mode = self.CACHE_DEFAULT
+        self.metrics = get_import_metrics()
+        self.session = None
+        self._semaphore = None
+        self._inflight = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=settings.TMDB_CONNECT_TIMEOUT,
+            sock_read=settings.TMDB_READ_TIMEOUT,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """
+        Faz requisição para a API do TMDB (mesma política de cache, limite de
+        taxa, novas tentativas e compartilhamento de requisições idênticas em
+        andamento do TMDBService)
+        """
+        key = cache_key(endpoint, params)
+        request = self._inflight.get(key)
+        if request is not None:
+            self.metrics.increment('tmdb_deduplicated')
+            return await asyncio.shield(request)
+        request = self._inflight[key] = asyncio.ensure_future(self._fetch(endpoint, params))
+        request.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(request)
+
+    async def _fetch(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """
+        O cache é um SQLite síncrono: leituras e gravações rodam em threads
+        (``asyncio.to_thread``) para não travar o loop. O semáforo só é
+        mantido durante a requisição; as esperas de backoff ficam fora dele.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        query = {**self.default_params, **{k: str(v) for k, v in (params or {}).items()}}
+        cached = None
+        if self.cache is not None and self.cache_mode != self.CACHE_REFRESH:
+            cached = await asyncio.to_thread(self.cache.get, endpoint, query)
+            if cached is not None and (cached.fresh or self.cache_mode == self.CACHE_ONLY):
+                self.metrics.record_cache_hit(endpoint)
+                return cached.data
+        if self.cache_mode == self.CACHE_ONLY:
+            return None
+        headers = cached.revalidation_headers() if cached is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.metrics.record_retry(endpoint)
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            retry_after = None
+            started = time.monotonic()
+            try:
+                async with self._semaphore:
+                    async with self.session.get(url, params=query, headers=headers) as response:
+                        status = response.status
+                        raw = await response.read() if status < 300 else b''
+                        response_headers = response.headers
+                self.metrics.record_request(endpoint, time.monotonic() - started, status, len(raw))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.metrics.record_request(endpoint, time.monotonic() - started)
+                error = e
+            except aiohttp.ClientError as e:
+                self.metrics.record_request(endpoint, time.monotonic() - started)
+                self.metrics.record_error(endpoint)
+                logger.error(f"Erro na requisição TMDB: {e}")
+                return None
+            else:
+                if status == 429 or status >= 500:
+                    error = f"HTTP {status}"
+                    retry_after = TMDBService._parse_retry_after(response_headers.get('Retry-After'))
+                    if status == 429:
+                        self.rate_limiter.pause(retry_after or TMDBService._backoff(attempt))
+                elif status == 304 and cached is not None:
+                    await asyncio.to_thread(self.cache.touch, cached)
+                    return cached.data
+                elif status >= 400:
+                    self.metrics.record_error(endpoint)
+                    logger.error(f"Erro na requisição TMDB: HTTP {status} em {endpoint}")
+                    return None
+                else:
+                    body = raw.decode('utf-8')
+                    try:
+                        data = json.loads(body)
+                    except ValueError as e:
+                        self.metrics.record_error(endpoint)
+                        logger.error(f"Erro na requisição TMDB: {e}")
+                        return None
+                    if self.cache is not None:
+                        await asyncio.to_thread(
+                            self.cache.store, endpoint, query, body,
+                            etag=response_headers.get('ETag'),
+                            last_modified=response_headers.get('Last-Modified'),
+                        )
+                    return data
+
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else TMDBService._backoff(attempt)
+                logger.warning(f"Erro na requisição TMDB ({endpoint}): {error}; nova tentativa em {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        self.metrics.record_error(endpoint)
+        logger.error(f"Erro na requisição TMDB ({endpoint}): {error} após {self.max_retries + 1} tentativas")
+        return None
+
+    async def search_multi(self, query: str, page: int = 1) -> Optional[Dict]:
+        """
+        Busca por filmes e séries
+        """
+        return await self._make_request('search/multi', {'query': query, 'page': page})
+
+    async def get_popular_movies(self, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém filmes populares
+        """
+        return await self._make_request('movie/popular', {'page': page})
+
+    async def get_popular_tv(self, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém séries populares
+        """
+        return await self._make_request('tv/popular', {'page': page})
+
+    async def get_details(self, media_type: str, tmdb_id: int, append_to_response=None) -> Optional[Dict]:
+        """
+        Obtém detalhes de um filme ou série com os sub-recursos pedidos na
+        mesma requisição
+        """
+        params = {'append_to_response': ','.join(append_to_response)} if append_to_response else None
+        return await self._make_request(f'{media_type}/{tmdb_id}', params)
+
+    async def get_movie_details(self, movie_id: int) -> Optional[Dict]:
+        """
+        Obtém detalhes de um filme
+        """
+        return await self.get_details('movie', movie_id, self.DETAILS_APPEND)
+
+    async def get_tv_details(self, tv_id: int) -> Optional[Dict]:
+        """
+        Obtém detalhes de uma série
+        """
+        return await self.get_details('tv', tv_id, self.DETAILS_APPEND)
+
+    async def get_changes(self, media_type: str = 'movie', start_date: str = None,
+                          end_date: str = None, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém os IDs alterados na TMDB no período (máximo de 14 dias)
+        """
+        return await self._make_request(f'{media_type}/changes', {
+            'start_date': start_date, 'end_date': end_date, 'page': page
+        })
+
+    async def get_genres(self, media_type: str = 'movie') -> Optional[Dict]:
+        """
+        Obtém lista de gêneros
+        """
+        return await self._make_request(f'genre/{media_type}/list')
+
+    async def get_movie_genres(self):
+        """Buscar gêneros de filmes"""
+        data = await self._make_request('genre/movie/list')
+        return data.get('genres', []) if data else []
+
+    async def get_tv_genres(self):
+        """Buscar gêneros de séries"""
+        data = await self._make_request('genre/tv/list')
+        return data.get('genres', []) if data else []
+
+    async def get_now_playing_movies(self, page=1):
+        """Buscar filmes em cartaz"""
+        data = await self._make_request('movie/now_playing', {'page': page})
+        return data.get('results', []) if data else []
+
+    async def get_top_rated_movies(self, page=1):
+        """Buscar filmes bem avaliados"""
+        data = await self._make_request('movie/top_rated', {'page': page})
+        return data.get('results', []) if data else []
+
+    async def get_movie_credits(self, movie_id):
+        """Buscar créditos de um filme"""
+        return await self._make_request(f'movie/{movie_id}/credits')
+
+    async def get_tv_credits(self, tv_id):
+        """Buscar créditos de uma série"""
+        return await self._make_request(f'tv/{tv_id}/credits')
+
+    async def get_top_rated_tv(self, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém séries mais bem avaliadas
+        """
+        return await self._make_request('tv/top_rated', {'page': page})
+
+    async def discover_movies(self, **kwargs) -> Optional[Dict]:
+        """
+        Descobrir filmes com filtros
+        """
+        return await self._make_request('discover/movie', kwargs)
+
+    async def discover_tv(self, **kwargs) -> Optional[Dict]:
+        """
+        Descobrir séries com filtros
+        """
+        return await self._make_request('discover/tv', kwargs)
+
+    async def get_movie_recommendations(self, movie_id: int, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém recomendações de filmes
+        """
+        return await self._make_request(f'movie/{movie_id}/recommendations', {'page': page})
+
+    async def get_tv_recommendations(self, tv_id: int, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém recomendações de séries
+        """
+        return await self._make_request(f'tv/{tv_id}/recommendations', {'page': page})
+
+    def get_full_poster_url(self, poster_path: str, size: str = 'w500') -> str:
+        """
+        Gera URL completa para poster (não faz requisição, por isso síncrono)
+        """
+        if not poster_path:
+            return ''
+        return f"{self.image_base_url}{size}{poster_path}"
+
+    def get_full_backdrop_url(self, backdrop_path: str, size: str = 'w1280') -> str:
+        """
+        Gera URL completa para backdrop
+        """
+        if not backdrop_path:
+            return ''
+        return f"{self.image_base_url}{size}{backdrop_path}"
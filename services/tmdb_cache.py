@@ -0,0 +1,166 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from django.conf import settings
+
+# Parâmetros que não mudam o conteúdo da resposta
+IGNORED_PARAMS = {'api_key'}
+
+
+def normalize_params(params: Optional[Dict]) -> str:
+    """
+    Serializa os parâmetros de forma estável (ordenados, sem a api_key)
+    """
+    params = {
+        str(k): str(v) for k, v in (params or {}).items()
+        if k not in IGNORED_PARAMS and v is not None
+    }
+    return json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+
+def cache_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """
+    Chave de conteúdo de uma requisição: endpoint + parâmetros normalizados
+    """
+    raw = f"{endpoint.strip('/')}?{normalize_params(params)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class CachedResponse:
+    """
+    Resposta armazenada no cache
+    """
+
+    def __init__(self, key, body, etag, last_modified, fetched_at, ttl):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    @property
+    def data(self) -> Dict:
+        return json.loads(self.body)
+
+    def revalidation_headers(self) -> Dict:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class TMDBResponseCache:
+    """
+    Cache persistente (SQLite) das respostas da TMDB API com TTL por endpoint.
+
+    Cada thread usa sua própria conexão; o banco roda em modo WAL para que as
+    threads do importador leiam e gravem ao mesmo tempo.
+    """
+
+    def __init__(self, path, ttls=(), default_ttl: int = 3600):
+        self.path = str(path)
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY,'
+                ' endpoint TEXT NOT NULL,'
+                ' body BLOB NOT NULL,'
+                ' etag TEXT,'
+                ' last_modified TEXT,'
+                ' fetched_at REAL NOT NULL)'
+            )
+            self._local.connection = conn
+        return conn
+
+    def ttl_for(self, endpoint: str) -> int:
+        endpoint = endpoint.strip('/')
+        for pattern, ttl in self.ttls:
+            if pattern.search(endpoint):
+                return ttl
+        return self.default_ttl
+
+    def cacheable(self, endpoint: str) -> bool:
+        return self.ttl_for(endpoint) > 0
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[CachedResponse]:
+        """
+        Retorna a resposta armazenada (fresca ou não) ou None
+        """
+        if not self.cacheable(endpoint):
+            return None
+        key = cache_key(endpoint, params)
+        row = self.connection.execute(
+            'SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(
+            key, zlib.decompress(body).decode('utf-8'), etag, last_modified, fetched_at, self.ttl_for(endpoint)
+        )
+
+    def store(self, endpoint: str, params: Optional[Dict], body: str,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        if not self.cacheable(endpoint):
+            return
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses (key, endpoint, body, etag, last_modified, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (cache_key(endpoint, params), endpoint.strip('/'), zlib.compress(body.encode('utf-8')),
+             etag, last_modified, time.time())
+        )
+
+    def touch(self, entry: CachedResponse):
+        """
+        Renova uma entrada revalidada pela API (304 Not Modified)
+        """
+        entry.fetched_at = time.time()
+        self.connection.execute('UPDATE responses SET fetched_at = ? WHERE key = ?', (entry.fetched_at, entry.key))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM responses')
+
+
+_tmdb_response_cache = None
+_tmdb_response_cache_lock = threading.Lock()
+
+
+def get_tmdb_response_cache() -> Optional[TMDBResponseCache]:
+    """
+    Retorna o cache compartilhado do processo, ou None se estiver desativado
+    """
+    global _tmdb_response_cache
+    if not settings.TMDB_CACHE_ENABLED:
+        return None
+    if _tmdb_response_cache is None:
+        with _tmdb_response_cache_lock:
+            if _tmdb_response_cache is None:
+                _tmdb_response_cache = TMDBResponseCache(
+                    settings.TMDB_CACHE_PATH,
+                    ttls=settings.TMDB_CACHE_TTLS,
+                    default_ttl=settings.TMDB_CACHE_DEFAULT_TTL,
+                )
+    return _tmdb_response_cache
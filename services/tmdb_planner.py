@@ -0,0 +1,57 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+# Sub-recursos (append_to_response) que cada estágio da importação consome;
+# os campos de Media e os gêneros já vêm na resposta base dos detalhes
+STAGE_RESOURCES = {
+    'media': (),
+    'genres': (),
+    'credits': ('credits',),
+    'videos': ('videos',),
+    'similar': ('similar',),
+    'reviews': ('reviews',),
+}
+
+# Estágios gravados pelo MediaBatchWriter
+WRITER_STAGES = ('media', 'genres', 'credits')
+
+
+def plan_resources(stages: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Une os sub-recursos pedidos pelos estágios, em ordem estável
+    """
+    resources = set()
+    for stage in stages:
+        if stage not in STAGE_RESOURCES:
+            raise ValueError(f'Estágio de importação desconhecido: {stage}')
+        resources.update(STAGE_RESOURCES[stage])
+    return tuple(sorted(resources))
+
+
+class FetchPlanner:
+    """
+    Busca os detalhes de um título com uma única requisição: os sub-recursos
+    de todos os estágios vão juntos no ``append_to_response``, em vez de uma
+    chamada extra por sub-recurso (ex.: detalhes + ``/credits``).
+
+    Funciona com o TMDBService e com o AsyncTMDBService (nesse caso ``fetch``
+    retorna a corrotina do cliente). Requisições idênticas em andamento são
+    compartilhadas pelo próprio cliente.
+    """
+
+    def __init__(self, service, stages: Iterable[str] = WRITER_STAGES):
+        self.service = service
+        self.stages = tuple(stages)
+        self.resources = plan_resources(self.stages)
+
+    def fetch(self, media_type: str, tmdb_id: int, **options) -> Optional[Dict]:
+        """
+        ``options`` vão para o ``get_details`` do cliente (ex.:
+        ``raise_not_found=True`` no TMDBService)
+        """
+        return self.service.get_details(media_type, tmdb_id, append_to_response=self.resources, **options)
+
+    def fetcher(self, media_type: str, **options):
+        """
+        Função ``tmdb_id -> detalhes`` para o pipeline de busca
+        """
+        return lambda tmdb_id: self.fetch(media_type, tmdb_id, **options)
@@ -0,0 +1,173 @@
+import gzip
+import json
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from services.tmdb_cache import cache_key
+
+
+def _open(path: str, mode: str):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class ReplayArchive:
+    """
+    Arquivo de respostas gravadas da TMDB: uma linha JSON por requisição
+    (gzip se o caminho terminar em ``.gz``), indexada pela mesma chave do
+    cache de respostas (endpoint + parâmetros normalizados).
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def record(self, endpoint: str, params: Optional[Dict], status: int, body: str):
+        line = json.dumps({
+            'key': cache_key(endpoint, params),
+            'endpoint': endpoint,
+            'status': status,
+            'body': body,
+        }, ensure_ascii=False)
+        with self._lock:
+            with _open(self.path, 'a') as archive:
+                archive.write(line + '\n')
+
+    def load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            entries = {}
+            with _open(self.path, 'r') as archive:
+                for line in archive:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry
+            self._entries = entries
+        return self._entries
+
+    def lookup(self, endpoint: str, params: Optional[Dict]) -> Optional[Dict]:
+        return self.load().get(cache_key(endpoint, params))
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transporte do ``requests`` que responde a partir de um ReplayArchive, sem
+    rede. Simula latência e injeta falhas (429, 503 e timeouts) para medir
+    throughput e o comportamento de novas tentativas de forma repetível.
+    """
+
+    def __init__(self, archive: ReplayArchive, base_url: str, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        super().__init__()
+        self.archive = archive
+        self.base_path = urlsplit(base_url).path.rstrip('/')
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'injected_errors': 0}
+
+    def _roll(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failure = self._random.random() < self.error_rate
+            kind = self._random.choice(['429', '503', 'timeout']) if failure else None
+            if failure:
+                self.stats['injected_errors'] += 1
+        return delay, kind
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay, failure = self._roll()
+        if delay > 0:
+            time.sleep(delay)
+        if failure == 'timeout':
+            raise requests.exceptions.ReadTimeout('Timeout simulado pelo replay da TMDB', request=request)
+        if failure == '429':
+            return self._response(request, 429, '{"status_code": 25}', {'Retry-After': '1'})
+        if failure == '503':
+            return self._response(request, 503, '{"status_code": 11}')
+
+        url = urlsplit(request.url)
+        endpoint = url.path[len(self.base_path):].strip('/')
+        entry = self.archive.lookup(endpoint, dict(parse_qsl(url.query)))
+        with self._lock:
+            self.stats['hits' if entry else 'misses'] += 1
+        if entry is None:
+            return self._response(request, 404, '{"status_code": 34, "status_message": "Não gravado no arquivo de replay"}')
+        return self._response(request, entry['status'], entry['body'])
+
+    def _response(self, request, status: int, body: str, headers: Optional[Dict] = None):
+        response = requests.Response()
+        response.status_code = status
+        response._content = body.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json;charset=utf-8', **(headers or {})})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def add_replay_arguments(parser):
+    """
+    Opções de gravação/replay compartilhadas pelos comandos de importação
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        '--record',
+        metavar='ARQUIVO',
+        help='Gravar as respostas da TMDB (da rede ou do cache local) neste arquivo (.jsonl ou .jsonl.gz)'
+    )
+    group.add_argument(
+        '--replay',
+        metavar='ARQUIVO',
+        help='Responder a partir de um arquivo gravado com --record, sem acessar a rede'
+    )
+    parser.add_argument(
+        '--replay-latency',
+        type=float,
+        default=0.0,
+        help='Latência simulada por requisição no replay, em ms (default: 0)'
+    )
+    parser.add_argument(
+        '--replay-error-rate',
+        type=float,
+        default=0.0,
+        help='Fração das requisições do replay que falham com 429/503/timeout (default: 0)'
+    )
+    parser.add_argument(
+        '--replay-seed',
+        type=int,
+        default=0,
+        help='Semente da latência e das falhas simuladas (default: 0)'
+    )
+
+
+def configure_replay(service, options) -> Optional[ReplayAdapter]:
+    """
+    Aplica as opções de ``add_replay_arguments`` a um TMDBService
+    """
+    if options.get('record'):
+        service.recorder = ReplayArchive(options['record'])
+    if not options.get('replay'):
+        return None
+    latency = options['replay_latency'] / 1000
+    adapter = ReplayAdapter(
+        ReplayArchive(options['replay']), service.base_url,
+        latency=latency, jitter=latency / 2,
+        error_rate=options['replay_error_rate'], seed=options['replay_seed'],
+    )
+    service.use_transport(adapter)
+    return adapter
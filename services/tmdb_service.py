@@ -1,34 +1,247 @@
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
-from catalog.models import Media, Genre, Cast, Crew
+from catalog.models import Media, Genre
+from catalog.services.import_context import ImportContext
+from catalog.services.media_writer import MediaBatchWriter
+from services.metrics import get_import_metrics
+from services.rate_limiter import get_tmdb_rate_limiter
+from services.tmdb_cache import cache_key, get_tmdb_response_cache
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Optional
 import logging
+import random
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Resultado interno de _fetch para um 404 (os métodos públicos retornam None
+# ou, com ``raise_not_found``, levantam TMDBNotFound)
+_NOT_FOUND = object()
+
+
+class TMDBNotFound(Exception):
+    """
+    O recurso não existe na TMDB (HTTP 404), diferente de uma falha
+    temporária (5xx, 429, timeout), em que os métodos retornam None
+    """
+
+
+class _InFlightRequest:
+    """
+    Requisição em andamento compartilhada por chamadas idênticas
+    """
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
 class TMDBService:
     """
     Serviço para integração com The Movie Database (TMDB) API
+    
+    A sessão HTTP (pool de conexões keep-alive) só é criada na primeira
+    requisição; use ``get_tmdb_service()`` para obter a instância do processo.
     """
     
+    # Modos do cache de respostas
+    CACHE_DEFAULT = 'default'  # usa entradas frescas, revalida as expiradas
+    CACHE_REFRESH = 'refresh'  # ignora o cache na leitura, mas grava as respostas
+    CACHE_ONLY = 'cache_only'  # nunca acessa a rede
+    
+    # Sub-recursos pedidos junto com os detalhes por get_movie_details/get_tv_details
+    DETAILS_APPEND = ('credits', 'videos', 'similar', 'reviews')
+    
     def __init__(self):
         self.api_key = settings.TMDB_API_KEY
         self.base_url = settings.TMDB_BASE_URL
         self.image_base_url = settings.TMDB_IMAGE_BASE_URL
-        self.session = requests.Session()
-        self.session.params.update({'api_key': self.api_key, 'language': 'pt-BR'})
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.rate_limiter = get_tmdb_rate_limiter()
+        self.timeout = (settings.TMDB_CONNECT_TIMEOUT, settings.TMDB_READ_TIMEOUT)
+        self.max_retries = settings.TMDB_MAX_RETRIES
+        self.cache = get_tmdb_response_cache()
+        self.cache_mode = self.CACHE_DEFAULT
+        self.recorder = None  # ReplayArchive que grava as respostas (da rede ou do cache)
+        self.metrics = get_import_metrics()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        """
+        Sessão compartilhada pelas threads, criada no primeiro uso
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.params.update({'api_key': self.api_key, 'language': 'pt-BR'})
+                    # Uma conexão por thread de importação, reaproveitada entre requisições
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=settings.TMDB_POOL_MAXSIZE
+                    )
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+    def use_transport(self, adapter):
+        """
+        Substitui a rede por outro transporte (ex.: ReplayAdapter); o cache
+        local é desligado para que todas as requisições passem por ele
+        """
+        self.session.mount(self.base_url, adapter)
+        self.cache = None
+    
+    def _make_request(self, endpoint: str, params: Dict = None, raise_not_found: bool = False) -> Optional[Dict]:
         """
         Faz requisição para a API do TMDB
+        
+        Chamadas idênticas (mesmo endpoint e parâmetros) feitas enquanto uma
+        delas está em andamento esperam e recebem o mesmo resultado, sem uma
+        nova requisição; o dicionário retornado é compartilhado e não deve ser
+        alterado.
+        
+        Retorna None quando não há resposta; com ``raise_not_found``, um 404
+        levanta TMDBNotFound para que o chamador o diferencie de uma falha.
+        """
+        key = cache_key(endpoint, params)
+        with self._inflight_lock:
+            request = self._inflight.get(key)
+            leader = request is None
+            if leader:
+                request = self._inflight[key] = _InFlightRequest()
+        if not leader:
+            request.done.wait()
+            self.metrics.increment('tmdb_deduplicated')
+        else:
+            try:
+                request.result = self._fetch(endpoint, params)
+            finally:
+                with self._inflight_lock:
+                    del self._inflight[key]
+                request.done.set()
+        if request.result is _NOT_FOUND:
+            if raise_not_found:
+                raise TMDBNotFound(endpoint)
+            return None
+        return request.result
+    
+    def _fetch(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """
+        Executa a requisição de _make_request
+        
+        Respeita o limitador de taxa compartilhado e tenta novamente, com
+        backoff exponencial, em 429, erros 5xx, timeouts e falhas de conexão.
+        Respostas ficam no cache local; entradas expiradas são revalidadas com
+        If-None-Match/If-Modified-Since.
+        
+        Cada tentativa é registrada nas métricas do processo (latência,
+        status, bytes recebidos, novas tentativas e erros por endpoint).
         """
         url = f"{self.base_url}/{endpoint}"
+        cache_params = {**self.session.params, **(params or {})}
+        cached = None
+        if self.cache is not None and self.cache_mode != self.CACHE_REFRESH:
+            cached = self.cache.get(endpoint, cache_params)
+            if cached is not None and (cached.fresh or self.cache_mode == self.CACHE_ONLY):
+                self.metrics.record_cache_hit(endpoint)
+                # Com --record, o arquivo tem de cobrir também o que veio do cache
+                if self.recorder is not None:
+                    self.recorder.record(endpoint, cache_params, 200, cached.body)
+                return cached.data
+        if self.cache_mode == self.CACHE_ONLY:
+            return None
+        headers = cached.revalidation_headers() if cached is not None else None
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.metrics.record_retry(endpoint)
+            self.rate_limiter.acquire()
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self.metrics.record_request(endpoint, time.monotonic() - started)
+                error = e
+            except requests.exceptions.RequestException as e:
+                self.metrics.record_request(endpoint, time.monotonic() - started)
+                self.metrics.record_error(endpoint)
+                logger.error(f"Erro na requisição TMDB: {e}")
+                return None
+            else:
+                self.metrics.record_request(
+                    endpoint, time.monotonic() - started, response.status_code, len(response.content)
+                )
+                if response.status_code == 429 or response.status_code >= 500:
+                    error = f"HTTP {response.status_code}"
+                    retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                    if response.status_code == 429:
+                        # Segura todas as threads, não só a que recebeu o 429
+                        self.rate_limiter.pause(retry_after or self._backoff(attempt))
+                elif response.status_code == 304 and cached is not None:
+                    self.cache.touch(cached)
+                    if self.recorder is not None:
+                        self.recorder.record(endpoint, cache_params, 200, cached.body)
+                    return cached.data
+                else:
+                    if self.recorder is not None:
+                        self.recorder.record(endpoint, cache_params, response.status_code, response.text)
+                    if response.status_code == 404:
+                        self.metrics.record_error(endpoint)
+                        logger.warning(f"TMDB: {endpoint} não encontrado (HTTP 404)")
+                        return _NOT_FOUND
+                    try:
+                        response.raise_for_status()
+                        data = response.json()
+                    except (requests.exceptions.RequestException, ValueError) as e:
+                        self.metrics.record_error(endpoint)
+                        logger.error(f"Erro na requisição TMDB: {e}")
+                        return None
+                    if self.cache is not None:
+                        self.cache.store(
+                            endpoint, cache_params, response.text,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified'),
+                        )
+                    return data
+            
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                logger.warning(f"Erro na requisição TMDB ({endpoint}): {error}; nova tentativa em {delay:.1f}s")
+                time.sleep(delay)
+        
+        self.metrics.record_error(endpoint)
+        logger.error(f"Erro na requisição TMDB ({endpoint}): {error} após {self.max_retries + 1} tentativas")
+        return None
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """
+        Backoff exponencial com jitter completo
+        """
+        ceiling = min(settings.TMDB_BACKOFF_MAX, settings.TMDB_BACKOFF_BASE * 2 ** attempt)
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erro na requisição TMDB: {e}")
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
             return None
     
     def search_multi(self, query: str, page: int = 1) -> Optional[Dict]:
@@ -49,20 +262,35 @@ class TMDBService:
         """
         return self._make_request('tv/popular', {'page': page})
     
+    def get_details(self, media_type: str, tmdb_id: int, append_to_response=None,
+                    raise_not_found: bool = False) -> Optional[Dict]:
+        """
+        Obtém detalhes de um filme ou série com os sub-recursos pedidos
+        (ex.: ``('credits',)``) na mesma requisição. Com ``raise_not_found``,
+        um título removido da TMDB levanta TMDBNotFound em vez de retornar None.
+        """
+        params = {'append_to_response': ','.join(append_to_response)} if append_to_response else None
+        return self._make_request(f'{media_type}/{tmdb_id}', params, raise_not_found=raise_not_found)
+    
     def get_movie_details(self, movie_id: int) -> Optional[Dict]:
         """
         Obtém detalhes de um filme
         """
-        return self._make_request(f'movie/{movie_id}', {
-            'append_to_response': 'credits,videos,similar,reviews'
-        })
+        return self.get_details('movie', movie_id, self.DETAILS_APPEND)
     
     def get_tv_details(self, tv_id: int) -> Optional[Dict]:
         """
         Obtém detalhes de uma série
         """
-        return self._make_request(f'tv/{tv_id}', {
-            'append_to_response': 'credits,videos,similar,reviews'
+        return self.get_details('tv', tv_id, self.DETAILS_APPEND)
+    
+    def get_changes(self, media_type: str = 'movie', start_date: str = None,
+                    end_date: str = None, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém os IDs alterados na TMDB no período (máximo de 14 dias)
+        """
+        return self._make_request(f'{media_type}/changes', {
+            'start_date': start_date, 'end_date': end_date, 'page': page
         })
     
     def get_genres(self, media_type: str = 'movie') -> Optional[Dict]:
@@ -93,96 +321,23 @@ class TMDBService:
                     defaults={'name': genre_data['name']}
                 )
     
-    def create_or_update_media(self, tmdb_data: Dict, media_type: str) -> Optional[Media]:
+    def create_or_update_media(self, tmdb_data: Dict, media_type: str, context=None) -> Optional[Media]:
         """
         Cria ou atualiza um objeto Media com dados do TMDB
+        
+        Para muitos títulos, prefira MediaBatchWriter diretamente: ele grava
+        o lote inteiro em uma transação.
         """
         try:
-            media, created = Media.objects.get_or_create(
-                tmdb_id=tmdb_data['id'],
-                defaults={
-                    'title': tmdb_data.get('title') or tmdb_data.get('name', ''),
-                    'original_title': tmdb_data.get('original_title') or tmdb_data.get('original_name', ''),
-                    'overview': tmdb_data.get('overview', ''),
-                    'poster_path': tmdb_data.get('poster_path', ''),
-                    'backdrop_path': tmdb_data.get('backdrop_path', ''),
-                    'media_type': media_type,
-                    'vote_average': tmdb_data.get('vote_average', 0),
-                    'vote_count': tmdb_data.get('vote_count', 0),
-                    'popularity': tmdb_data.get('popularity', 0),
-                    'original_language': tmdb_data.get('original_language', ''),
-                }
-            )
-            
-            # Atualizar campos específicos baseados no tipo
-            if media_type == 'movie':
-                release_date = tmdb_data.get('release_date')
-                if release_date:
-                    from datetime import datetime
-                    media.release_date = datetime.strptime(release_date, '%Y-%m-%d').date()
-                media.runtime = tmdb_data.get('runtime')
-            
-            elif media_type == 'tv':
-                first_air_date = tmdb_data.get('first_air_date')
-                if first_air_date:
-                    from datetime import datetime
-                    media.release_date = datetime.strptime(first_air_date, '%Y-%m-%d').date()
-                media.number_of_seasons = tmdb_data.get('number_of_seasons')
-                media.number_of_episodes = tmdb_data.get('number_of_episodes')
-            
-            # Associar gêneros
-            if 'genres' in tmdb_data:
-                genre_ids = [g['id'] for g in tmdb_data['genres']]
-                genres = Genre.objects.filter(tmdb_id__in=genre_ids)
-                media.genres.set(genres)
-            elif 'genre_ids' in tmdb_data:
-                genres = Genre.objects.filter(tmdb_id__in=tmdb_data['genre_ids'])
-                media.genres.set(genres)
-            
-            media.save()
-            
-            # Importar elenco se disponível
-            if 'credits' in tmdb_data:
-                self._import_credits(media, tmdb_data['credits'])
-            
-            return media
+            writer = MediaBatchWriter(context=context)
+            writer.add(tmdb_data, media_type)
+            result = writer.flush()
+            return Media.objects.get(pk=result.ids[tmdb_data['id']])
             
         except Exception as e:
             logger.error(f"Erro ao criar/atualizar media: {e}")
             return None
     
-    def _import_credits(self, media: Media, credits_data: Dict):
-        """
-        Importa elenco e equipe técnica
-        """
-        # Limpar elenco existente
-        media.cast_members.all().delete()
-        media.crew_members.all().delete()
-        
-        # Importar elenco
-        for cast_member in credits_data.get('cast', [])[:10]:  # Limitar a 10 principais
-            Cast.objects.create(
-                media=media,
-                name=cast_member.get('name', ''),
-                character=cast_member.get('character', ''),
-                profile_path=cast_member.get('profile_path', ''),
-                tmdb_person_id=cast_member.get('id'),
-                order=cast_member.get('order', 0)
-            )
-        
-        # Importar equipe técnica (diretor, roteirista, etc.)
-        important_jobs = ['Director', 'Writer', 'Screenplay', 'Producer']
-        for crew_member in credits_data.get('crew', []):
-            if crew_member.get('job') in important_jobs:
-                Crew.objects.create(
-                    media=media,
-                    name=crew_member.get('name', ''),
-                    job=crew_member.get('job', ''),
-                    department=crew_member.get('department', ''),
-                    profile_path=crew_member.get('profile_path', ''),
-                    tmdb_person_id=crew_member.get('id')
-                )
-    
     def populate_database(self, pages: int = 5):
         """
         Popula o banco com filmes e séries populares do TMDB
@@ -190,6 +345,8 @@ class TMDBService:
         # Primeiro, importar gêneros
         self.import_genres()
         
+        writer = MediaBatchWriter(context=ImportContext())
+        
         # Importar filmes populares
         for page in range(1, pages + 1):
             movies = self.get_popular_movies(page)
@@ -198,7 +355,7 @@ class TMDBService:
                     # Buscar detalhes completos
                     details = self.get_movie_details(movie_data['id'])
                     if details:
-                        self.create_or_update_media(details, 'movie')
+                        writer.add(details, 'movie')
         
         # Importar séries populares
         for page in range(1, pages + 1):
@@ -208,7 +365,9 @@ class TMDBService:
                     # Buscar detalhes completos
                     details = self.get_tv_details(tv_data['id'])
                     if details:
-                        self.create_or_update_media(details, 'tv')
+                        writer.add(details, 'tv')
+        
+        writer.flush()
     
     def get_movie_genres(self):
         """Buscar gêneros de filmes"""
@@ -237,6 +396,66 @@ class TMDBService:
     def get_tv_credits(self, tv_id):
         """Buscar créditos de uma série"""
         return self._make_request(f'tv/{tv_id}/credits')
+    
+    def get_top_rated_tv(self, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém séries mais bem avaliadas
+        """
+        return self._make_request('tv/top_rated', {'page': page})
+    
+    def discover_movies(self, **kwargs) -> Optional[Dict]:
+        """
+        Descobrir filmes com filtros
+        """
+        return self._make_request('discover/movie', kwargs)
+    
+    def discover_tv(self, **kwargs) -> Optional[Dict]:
+        """
+        Descobrir séries com filtros
+        """
+        return self._make_request('discover/tv', kwargs)
+    
+    def get_movie_recommendations(self, movie_id: int, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém recomendações de filmes
+        """
+        return self._make_request(f'movie/{movie_id}/recommendations', {'page': page})
+    
+    def get_tv_recommendations(self, tv_id: int, page: int = 1) -> Optional[Dict]:
+        """
+        Obtém recomendações de séries
+        """
+        return self._make_request(f'tv/{tv_id}/recommendations', {'page': page})
+    
+    def get_full_poster_url(self, poster_path: str, size: str = 'w500') -> str:
+        """
+        Gera URL completa para poster
+        """
+        if not poster_path:
+            return ''
+        return f"{self.image_base_url}{size}{poster_path}"
+    
+    def get_full_backdrop_url(self, backdrop_path: str, size: str = 'w1280') -> str:
+        """
+        Gera URL completa para backdrop
+        """
+        if not backdrop_path:
+            return ''
+        return f"{self.image_base_url}{size}{backdrop_path}"
 
-# Instância global do serviço
-tmdb_service = TMDBService()
\ No newline at end of file
+
+_tmdb_service = None
+_tmdb_service_lock = threading.Lock()
+
+
+def get_tmdb_service() -> TMDBService:
+    """
+    Retorna o cliente TMDB do processo, criado no primeiro uso (nada é
+    construído ao importar este módulo)
+    """
+    global _tmdb_service
+    if _tmdb_service is None:
+        with _tmdb_service_lock:
+            if _tmdb_service is None:
+                _tmdb_service = TMDBService()
+    return _tmdb_service